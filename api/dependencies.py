@@ -1,6 +1,6 @@
 """API dependencies and utilities."""
 from src.core.blueprint_parser import BlueprintParser
-from src.core.memory import MemoryManager
+from src.core.memory import MemoryManager, get_memory_manager as get_shared_memory_manager
 
 
 def get_blueprint_parser() -> BlueprintParser:
@@ -18,6 +18,6 @@ def get_memory_manager() -> MemoryManager:
     Get memory manager instance.
 
     Returns:
-        MemoryManager instance
+        Shared MemoryManager instance
     """
-    return MemoryManager()
+    return get_shared_memory_manager()
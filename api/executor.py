@@ -0,0 +1,236 @@
+"""Bounded executor for API workflow runs."""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from src.core.blueprint_parser import BlueprintParser
+from src.graph.builder import execute_workflow, execute_workflow_async
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+EXECUTOR_MODES = ("async", "thread", "process")
+
+
+def _execute_blueprint(
+    blueprint: str,
+    scenario: Optional[str],
+    submitted_at: float
+) -> Tuple[Dict[str, Any], float]:
+    """
+    Parse and execute a blueprint in a worker thread or process.
+
+    Args:
+        blueprint: Raw blueprint string
+        scenario: Optional scenario hint
+        submitted_at: Wall-clock submission time, for queue wait
+
+    Returns:
+        Tuple of (execution result, seconds spent waiting for a worker)
+
+    Raises:
+        ValueError: If the blueprint is invalid
+    """
+    queue_wait = time.time() - submitted_at
+    workflow = BlueprintParser().parse(blueprint, scenario)
+    return execute_workflow(workflow, blueprint), queue_wait
+
+
+class RunExecutor:
+    """
+    Run workflows off the event loop with a concurrency limit.
+
+    Modes:
+    - async: aparse + execute_workflow_async on the loop, gated by a semaphore
+    - thread: parse + execute_workflow on a thread pool
+    - process: parse + execute_workflow on a process pool (isolates CPU work)
+
+    Runs beyond max_concurrency wait for a slot; the wait and the execution
+    time are tracked separately.
+    """
+
+    def __init__(self, mode: str = "async", max_concurrency: int = 8):
+        """
+        Initialize executor.
+
+        Args:
+            mode: One of "async", "thread", "process"
+            max_concurrency: Maximum runs executing at once
+        """
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown executor mode {mode!r}, expected one of {EXECUTOR_MODES}")
+
+        self.mode = mode
+        self.max_concurrency = max(1, max_concurrency)
+        self._pool: Optional[Executor] = None
+        # asyncio.Semaphore binds to one loop, so keep one per loop
+        self._semaphores: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.in_flight = 0
+        self.completed = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self.total_execution = 0.0
+        self.max_execution = 0.0
+
+        if mode == "thread":
+            self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="run")
+        elif mode == "process":
+            # spawn: forking a process that already runs threads is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_concurrency,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+
+        logger.info(f"Run executor: mode={mode}, max_concurrency={self.max_concurrency}")
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore for the running loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._semaphores[loop] = semaphore
+            return semaphore
+
+    async def run(
+        self,
+        blueprint: str,
+        scenario: Optional[str] = None,
+        parser: Optional[BlueprintParser] = None
+    ) -> Dict[str, Any]:
+        """
+        Parse and execute a blueprint without blocking the event loop.
+
+        Args:
+            blueprint: Raw blueprint string
+            scenario: Optional scenario hint
+            parser: Blueprint parser for async mode
+
+        Returns:
+            Execution result dictionary
+
+        Raises:
+            ValueError: If the blueprint is invalid
+            RuntimeError: If the executor has been shut down
+        """
+        if self._closed:
+            raise RuntimeError("Run executor is shut down")
+
+        submitted_at = time.time()
+        with self._lock:
+            self.in_flight += 1
+
+        try:
+            if self._pool is None:
+                async with self._semaphore():
+                    queue_wait = time.time() - submitted_at
+                    workflow = await (parser or BlueprintParser()).aparse(blueprint, scenario)
+                    result = await execute_workflow_async(workflow, blueprint)
+            else:
+                loop = asyncio.get_running_loop()
+                result, queue_wait = await loop.run_in_executor(
+                    self._pool, _execute_blueprint, blueprint, scenario, submitted_at
+                )
+
+            self._record(queue_wait, time.time() - submitted_at - queue_wait)
+            return result
+
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _record(self, queue_wait: float, execution: float):
+        """Update timing metrics for a finished run."""
+        with self._lock:
+            self.completed += 1
+            self.total_queue_wait += queue_wait
+            self.max_queue_wait = max(self.max_queue_wait, queue_wait)
+            self.total_execution += execution
+            self.max_execution = max(self.max_execution, execution)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get executor statistics.
+
+        Returns:
+            Dictionary with in-flight runs, queue wait and execution times
+        """
+        with self._lock:
+            completed = self.completed
+            return {
+                "mode": self.mode,
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self.in_flight,
+                "queued": max(0, self.in_flight - self.max_concurrency),
+                "completed": completed,
+                "avg_queue_wait_seconds": (self.total_queue_wait / completed) if completed else 0.0,
+                "max_queue_wait_seconds": self.max_queue_wait,
+                "avg_execution_seconds": (self.total_execution / completed) if completed else 0.0,
+                "max_execution_seconds": self.max_execution
+            }
+
+    async def drain(self, timeout: float = 30.0) -> bool:
+        """
+        Stop accepting runs and wait for in-flight runs to finish.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if all runs finished within the timeout
+        """
+        self._closed = True
+        deadline = time.monotonic() + timeout
+        while self.in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+        drained = self.in_flight == 0
+        if not drained:
+            logger.warning(f"Run executor shut down with {self.in_flight} runs in flight")
+        if self._pool is not None:
+            self._pool.shutdown(wait=drained, cancel_futures=not drained)
+        return drained
+
+
+_executor: Optional[RunExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_run_executor() -> RunExecutor:
+    """
+    Get the process-wide run executor configured by RUN_EXECUTOR / RUN_MAX_CONCURRENCY.
+
+    Returns:
+        Shared RunExecutor
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = RunExecutor(
+                    mode=os.getenv("RUN_EXECUTOR", "async"),
+                    max_concurrency=int(os.getenv("RUN_MAX_CONCURRENCY", "8"))
+                )
+    return _executor
+
+
+async def shutdown_run_executor(timeout: float = 30.0):
+    """
+    Drain and forget the process-wide executor.
+
+    Args:
+        timeout: Maximum seconds to wait for in-flight runs
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        await executor.drain(timeout)
@@ -1,13 +1,30 @@
 """FastAPI REST API for agent maker system."""
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, WebSocket
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, Any
-
-from api.models import RunRequest, RunResponse, HealthResponse, StatsResponse
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from typing import Dict, Any, Optional
+import asyncio
+import json
+import os
+import time
+
+from api.models import (
+    RunRequest, RunResponse, HealthResponse, StatsResponse, GraphResponse,
+    JobRequest, JobResponse, RunStatusResponse, BatchRequest, BatchResponse, RunHistoryResponse,
+    SearchResponse
+)
 from api.dependencies import get_blueprint_parser, get_memory_manager
+from api.executor import get_run_executor, shutdown_run_executor
 from src.core.blueprint_parser import BlueprintParser
-from src.core.memory import MemoryManager
-from src.graph.builder import execute_workflow
+from src.core.memory import MAX_PAGE_SIZE, MemoryManager, shutdown_memory_managers
+from src.core.retention import get_retention_scheduler, shutdown_retention_scheduler, start_retention_scheduler
+from src.core.sketch import WINDOWS
+from src.core.jobs import QueueFullError, get_job_queue, reset_job_queue
+from src.batch import aexecute_workflows_batch
+from src.graph.builder import astream_workflow, render_mermaid, get_graph_cache_stats
+from src.llm.client import get_llm_metrics
 from adk_app.manager_tool import ADK_AVAILABLE
 from src.utils.logging import setup_logger
 
@@ -62,6 +79,25 @@ async def health() -> HealthResponse:
     )
 
 
+@app.get("/metrics")
+async def metrics() -> Dict[str, Any]:
+    """
+    Get process-wide performance metrics.
+
+    Returns:
+        Cache and LLM client counters
+    """
+    retention = get_retention_scheduler()
+    return {
+        "graph_cache": get_graph_cache_stats(),
+        "llm": get_llm_metrics(),
+        "jobs": get_job_queue().stats(),
+        "executor": get_run_executor().stats(),
+        "memory": get_memory_manager().stats(),
+        "retention": retention.stats() if retention else None
+    }
+
+
 @app.post("/run", response_model=RunResponse)
 async def run_workflow(
     request: RunRequest,
@@ -83,38 +119,10 @@ async def run_workflow(
     logger.info(f"Received run request for scenario: {request.scenario}")
 
     try:
-        # Parse blueprint
-        workflow = parser.parse(request.blueprint, request.scenario)
-        logger.info(f"Parsed workflow: {workflow.name}")
-
-        # Execute workflow
-        result = execute_workflow(workflow, request.blueprint)
-
-        # Build response
-        if result["success"]:
-            return RunResponse(
-                run_id=result["execution_id"],
-                status=result["status"],
-                result={
-                    "final_output": result.get("final_output"),
-                    "validation_passed": result.get("validation_passed"),
-                    "retry_count": result.get("retry_count"),
-                    "execution_time": result.get("duration_seconds"),
-                    "agent_outputs": result.get("agent_outputs", {})
-                }
-            )
-        else:
-            return RunResponse(
-                run_id=result["execution_id"],
-                status=result["status"],
-                result={
-                    "validation_passed": False,
-                    "validation_feedback": result.get("validation_feedback"),
-                    "retry_count": result.get("retry_count"),
-                    "execution_time": result.get("duration_seconds")
-                },
-                error=result.get("error", "Execution failed")
-            )
+        # Parse and execute off the event loop, within the concurrency limit
+        result = await get_run_executor().run(request.blueprint, request.scenario, parser)
+
+        return _run_response(result)
 
     except ValueError as e:
         logger.error(f"Blueprint parsing error: {e}")
@@ -125,9 +133,383 @@ async def run_workflow(
         raise HTTPException(status_code=500, detail=f"Execution error: {str(e)}")
 
 
+@app.post("/run/batch", response_model=BatchResponse)
+async def run_workflow_batch(request: BatchRequest) -> BatchResponse:
+    """
+    Execute several workflows with bounded parallelism.
+
+    Invalid blueprints (status "invalid") and items that raise while parsing
+    or executing (status "error") are reported per item rather than failing
+    the whole batch.
+
+    Args:
+        request: BatchRequest with items and concurrency
+
+    Returns:
+        BatchResponse with per-item results in input order
+    """
+    logger.info(f"Received batch run request: {len(request.items)} items, concurrency {request.concurrency}")
+
+    start = time.time()
+    results = await aexecute_workflows_batch(
+        [{"id": item.id, "blueprint": item.blueprint, "scenario": item.scenario} for item in request.items],
+        concurrency=request.concurrency
+    )
+    elapsed = time.time() - start
+
+    return BatchResponse(
+        results=results,
+        runs=len(results),
+        succeeded=sum(1 for result in results if result["success"]),
+        elapsed_seconds=elapsed,
+        runs_per_second=len(results) / elapsed if elapsed > 0 else 0.0
+    )
+
+
+def _run_response(result: Dict[str, Any]) -> RunResponse:
+    """
+    Build the API response for an execution result.
+
+    Args:
+        result: Result dictionary from execute_workflow
+
+    Returns:
+        RunResponse for the run
+    """
+    if result["success"]:
+        return RunResponse(
+            run_id=result["execution_id"],
+            status=result["status"],
+            result={
+                "final_output": result.get("final_output"),
+                "validation_passed": result.get("validation_passed"),
+                "retry_count": result.get("retry_count"),
+                "execution_time": result.get("duration_seconds"),
+                "agent_outputs": result.get("agent_outputs", {})
+            }
+        )
+
+    return RunResponse(
+        run_id=result["execution_id"],
+        status=result["status"],
+        result={
+            "validation_passed": False,
+            "validation_feedback": result.get("validation_feedback"),
+            "retry_count": result.get("retry_count"),
+            "execution_time": result.get("duration_seconds")
+        },
+        error=result.get("error", "Execution failed")
+    )
+
+
+def _stream_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a workflow stream event into a JSON-safe client event.
+
+    Args:
+        event: Event from astream_workflow
+
+    Returns:
+        JSON-serializable event; the final result is shaped like RunResponse
+    """
+    if event["type"] == "result":
+        return {"type": "result", **jsonable_encoder(_run_response(event["result"]))}
+    return jsonable_encoder(event)
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    """Format one event as a Server-Sent Events message."""
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+@app.post("/run/stream")
+async def run_workflow_stream(
+    request: RunRequest,
+    parser: BlueprintParser = Depends(get_blueprint_parser)
+) -> StreamingResponse:
+    """
+    Execute a workflow, streaming progress as Server-Sent Events.
+
+    Emits node_start/node_end events (with timings and QA verdicts), writer
+    token events as the draft is generated, and a final result event.
+    Disconnecting cancels the run.
+
+    Args:
+        request: RunRequest with blueprint and optional scenario
+        parser: Blueprint parser dependency
+
+    Returns:
+        text/event-stream response
+
+    Raises:
+        HTTPException: If the blueprint is invalid
+    """
+    logger.info(f"Received streaming run request for scenario: {request.scenario}")
+
+    try:
+        workflow = await parser.aparse(request.blueprint, request.scenario)
+    except ValueError as e:
+        logger.error(f"Blueprint parsing error: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid blueprint: {str(e)}")
+
+    async def events():
+        async for event in astream_workflow(workflow, request.blueprint):
+            yield _sse(_stream_event(event))
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.websocket("/ws/run")
+async def run_workflow_ws(
+    websocket: WebSocket,
+    parser: BlueprintParser = Depends(get_blueprint_parser)
+):
+    """
+    Execute a workflow over a WebSocket.
+
+    The client sends one RunRequest JSON message and receives the same events
+    as /run/stream, one JSON message each. Sending {"type": "cancel"} or
+    disconnecting cancels the run.
+
+    Args:
+        websocket: Client connection
+        parser: Blueprint parser dependency
+    """
+    await websocket.accept()
+
+    try:
+        request = RunRequest(**await websocket.receive_json())
+        workflow = await parser.aparse(request.blueprint, request.scenario)
+    except (ValidationError, ValueError) as e:
+        logger.error(f"Invalid WebSocket run request: {e}")
+        await websocket.send_json({"type": "error", "error": f"Invalid blueprint: {str(e)}"})
+        await websocket.close(code=1003)
+        return
+
+    logger.info(f"Received WebSocket run request for scenario: {request.scenario}")
+
+    async def pump():
+        async for event in astream_workflow(workflow, request.blueprint):
+            await websocket.send_json(_stream_event(event))
+
+    run_task = asyncio.create_task(pump())
+    # Any client message (or a disconnect) while running cancels the run
+    listen_task = asyncio.create_task(websocket.receive())
+
+    done, _ = await asyncio.wait({run_task, listen_task}, return_when=asyncio.FIRST_COMPLETED)
+
+    if run_task in done:
+        listen_task.cancel()
+        if run_task.exception() is not None:
+            logger.warning(f"WebSocket run stream ended early: {run_task.exception()}")
+            return
+        await websocket.close()
+        return
+
+    run_task.cancel()
+    try:
+        await run_task
+    except asyncio.CancelledError:
+        pass
+
+    message = listen_task.result()
+    if message["type"] != "websocket.disconnect":
+        logger.info("WebSocket run cancelled by client")
+        await websocket.send_json({"type": "cancelled"})
+        await websocket.close()
+
+
+@app.post("/runs", response_model=JobResponse, status_code=202)
+async def submit_run(
+    request: JobRequest,
+    parser: BlueprintParser = Depends(get_blueprint_parser)
+) -> JobResponse:
+    """
+    Queue a workflow for background execution.
+
+    Args:
+        request: JobRequest with blueprint, optional scenario and priority
+        parser: Blueprint parser dependency
+
+    Returns:
+        JobResponse with the run ID to poll
+
+    Raises:
+        HTTPException: 400 for an invalid blueprint, 429 when the queue is full
+    """
+    logger.info(f"Received queued run request for scenario: {request.scenario}")
+
+    try:
+        workflow = await parser.aparse(request.blueprint, request.scenario)
+    except ValueError as e:
+        logger.error(f"Blueprint parsing error: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid blueprint: {str(e)}")
+
+    try:
+        run_id = get_job_queue().submit(workflow, request.blueprint, priority=request.priority)
+    except QueueFullError as e:
+        logger.warning(f"Rejected run: {e}")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+
+    return JobResponse(run_id=run_id, status="queued")
+
+
+@app.get("/runs", response_model=RunHistoryResponse)
+def list_runs(
+    workflow: Optional[str] = None,
+    success: Optional[bool] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    memory: MemoryManager = Depends(get_memory_manager)
+) -> RunHistoryResponse:
+    """
+    List recorded executions, newest first.
+
+    Args:
+        workflow: Only this workflow's executions
+        success: Only successful or failed executions
+        since: Earliest ISO timestamp, inclusive
+        until: Latest ISO timestamp, exclusive
+        cursor: next_cursor from the previous page
+        limit: Page size
+        memory: Memory manager dependency
+
+    Returns:
+        One page of executions and the cursor for the next
+
+    Raises:
+        HTTPException: 400 for a malformed timestamp or cursor
+    """
+    try:
+        page = memory.list_executions(
+            workflow_name=workflow, success=success, since=since, until=until, cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return RunHistoryResponse(**page)
+
+
+@app.get("/runs/export")
+def export_runs(
+    workflow: Optional[str] = None,
+    success: Optional[bool] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    memory: MemoryManager = Depends(get_memory_manager)
+) -> StreamingResponse:
+    """
+    Stream every matching execution as NDJSON, newest first.
+
+    Declared before /runs/{run_id} so "export" is not taken for a run ID.
+    Plain def, like /runs: the validation query runs in the threadpool and
+    the sync generator is iterated there too.
+
+    Args:
+        workflow: Only this workflow's executions
+        success: Only successful or failed executions
+        since: Earliest ISO timestamp, inclusive
+        until: Latest ISO timestamp, exclusive
+        memory: Memory manager dependency
+
+    Returns:
+        application/x-ndjson stream, one execution per line
+
+    Raises:
+        HTTPException: 400 for a malformed timestamp
+    """
+    filters = {"workflow_name": workflow, "success": success, "since": since, "until": until}
+    try:
+        # Validate the filters before the response starts
+        memory.list_executions(limit=1, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def lines():
+        for item in memory.iter_executions(**filters):
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.get("/runs/{run_id}", response_model=RunStatusResponse)
+def get_run(run_id: str, memory: MemoryManager = Depends(get_memory_manager)) -> RunStatusResponse:
+    """
+    Get the status and result of a queued run.
+
+    Reads the runs table directly, so polling never starts a job queue.
+
+    Args:
+        run_id: Run ID from POST /runs
+        memory: Memory manager dependency
+
+    Returns:
+        Run status, with results once finished
+
+    Raises:
+        HTTPException: 404 if the run is unknown
+    """
+    run = memory.get_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Run not found: {run_id}")
+
+    result = run["result"]
+    if result is not None:
+        result = _run_response(result).result
+
+    return RunStatusResponse(
+        run_id=run["id"],
+        workflow_name=run["workflow_name"],
+        status=run["status"],
+        priority=run["priority"],
+        submitted_at=run["submitted_at"],
+        started_at=run["started_at"],
+        finished_at=run["finished_at"],
+        result=result,
+        error=run["error"]
+    )
+
+
+@app.on_event("startup")
+def schedule_retention():
+    """Prune old execution history in the background when RETENTION_INTERVAL_HOURS is set."""
+    start_retention_scheduler(get_memory_manager().db_path)
+
+
+@app.on_event("shutdown")
+def stop_retention():
+    """Stop the retention scheduler after its current chunk."""
+    shutdown_retention_scheduler(timeout=30)
+
+
+@app.on_event("shutdown")
+def shutdown_job_queue():
+    """Let queued runs finish before the process exits."""
+    reset_job_queue(wait=True)
+
+
+@app.on_event("shutdown")
+async def drain_run_executor():
+    """Let in-flight /run requests finish before the process exits."""
+    await shutdown_run_executor(timeout=float(os.getenv("RUN_DRAIN_TIMEOUT", "30")))
+
+
+@app.on_event("shutdown")
+def flush_memory():
+    """Commit buffered execution records after the last runs have finished."""
+    shutdown_memory_managers()
+
+
 @app.get("/stats/{workflow_name}", response_model=StatsResponse)
 async def get_stats(
     workflow_name: str,
+    window: Optional[str] = None,
     memory: MemoryManager = Depends(get_memory_manager)
 ) -> StatsResponse:
     """
@@ -135,6 +517,7 @@ async def get_stats(
 
     Args:
         workflow_name: Name of the workflow
+        window: Limit percentiles and retry histogram to the last hour, day or week
         memory: Memory manager dependency
 
     Returns:
@@ -142,8 +525,12 @@ async def get_stats(
     """
     logger.info(f"Fetching stats for workflow: {workflow_name}")
 
+    if window is not None and window not in WINDOWS:
+        raise HTTPException(status_code=400, detail=f"Unknown window {window!r}, expected one of {list(WINDOWS)}")
+
     try:
         stats = memory.get_execution_stats(workflow_name)
+        distribution = memory.get_distribution(workflow_name, window)
 
         return StatsResponse(
             workflow_name=workflow_name,
@@ -151,7 +538,14 @@ async def get_stats(
             successful=stats["successful"],
             success_rate=stats["success_rate"],
             avg_duration=stats["avg_duration"],
-            avg_retries=stats["avg_retries"]
+            duration_stddev=stats["duration_stddev"],
+            avg_retries=stats["avg_retries"],
+            window=window,
+            window_executions=distribution["executions"],
+            p50_duration=distribution["p50_duration"],
+            p90_duration=distribution["p90_duration"],
+            p99_duration=distribution["p99_duration"],
+            retry_histogram=distribution["retry_histogram"]
         )
 
     except Exception as e:
@@ -159,6 +553,70 @@ async def get_stats(
         raise HTTPException(status_code=500, detail=f"Stats error: {str(e)}")
 
 
+@app.get("/search", response_model=SearchResponse)
+def search_executions(
+    q: str,
+    workflow: Optional[str] = None,
+    success: Optional[bool] = None,
+    order: str = "recent",
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    memory: MemoryManager = Depends(get_memory_manager)
+) -> SearchResponse:
+    """
+    Search failure messages, validation feedback and final outputs.
+
+    Args:
+        q: Search text; every term must match (CJK substrings included)
+        workflow: Only this workflow's executions
+        success: Only successful or failed executions
+        order: "recent" (newest first) or "relevance" (BM25)
+        limit: Maximum results
+        memory: Memory manager dependency
+
+    Returns:
+        Matching executions with snippets
+
+    Raises:
+        HTTPException: 400 for an empty query or unknown order
+    """
+    try:
+        results = memory.search_executions(q, workflow_name=workflow, success=success, order=order, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return SearchResponse(query=q, results=results)
+
+
+@app.get("/graph/{workflow_name}", response_model=GraphResponse)
+def get_graph_diagram(
+    workflow_name: str,
+    parser: BlueprintParser = Depends(get_blueprint_parser)
+) -> GraphResponse:
+    """
+    Get the Mermaid diagram of a workflow's execution graph.
+
+    Args:
+        workflow_name: Name of the workflow
+        parser: Blueprint parser dependency
+
+    Returns:
+        Mermaid diagram for the workflow's default steps
+    """
+    logger.info(f"Rendering graph for workflow: {workflow_name}")
+
+    try:
+        workflow = parser.parse(json.dumps({"workflow_name": workflow_name}))
+
+        return GraphResponse(
+            workflow_name=workflow_name,
+            mermaid=render_mermaid(workflow)
+        )
+
+    except Exception as e:
+        logger.error(f"Graph rendering error: {e}")
+        raise HTTPException(status_code=500, detail=f"Graph rendering error: {str(e)}")
+
+
 @app.get("/learning/{workflow_name}")
 async def get_learning_context(
     workflow_name: str,
@@ -52,4 +52,96 @@ class StatsResponse(BaseModel):
     successful: int
     success_rate: float
     avg_duration: float
+    duration_stddev: float = 0.0
     avg_retries: float
+    window: Optional[str] = Field(None, description="Window of the distribution fields (hour, day, week), or all time")
+    window_executions: int = Field(0, description="Executions in the window")
+    p50_duration: float = 0.0
+    p90_duration: float = 0.0
+    p99_duration: float = 0.0
+    retry_histogram: Dict[str, int] = Field(default_factory=dict, description="Executions by retry count")
+
+
+class GraphResponse(BaseModel):
+    """Workflow graph diagram response."""
+    workflow_name: str
+    mermaid: str = Field(..., description="Mermaid diagram source")
+
+
+class JobRequest(RunRequest):
+    """Request model for queued workflow execution."""
+    priority: int = Field(0, description="Queue priority; higher runs sooner")
+
+
+class JobResponse(BaseModel):
+    """Response for an accepted queued run."""
+    run_id: str = Field(..., description="Run ID to poll at GET /runs/{run_id}")
+    status: str = Field(..., description="Run status: queued")
+
+
+class RunStatusResponse(BaseModel):
+    """Status of a queued run."""
+    run_id: str
+    workflow_name: str
+    status: str = Field(..., description="queued, running, completed, failed or error")
+    priority: int
+    submitted_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    result: Optional[Dict[str, Any]] = Field(None, description="Execution results once finished")
+    error: Optional[str] = None
+
+
+class ExecutionSummary(BaseModel):
+    """One recorded execution."""
+    id: str
+    workflow_name: Optional[str] = None
+    success: bool
+    error_type: Optional[str] = None
+    error_message: Optional[str] = None
+    retry_count: Optional[int] = None
+    duration_seconds: Optional[float] = None
+    timestamp: str
+    blueprint_hash: Optional[str] = None
+
+
+class RunHistoryResponse(BaseModel):
+    """One page of execution history, newest first."""
+    items: List[ExecutionSummary]
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor for the next page; null on the last page")
+
+
+class SearchHit(BaseModel):
+    """One execution matching a search."""
+    id: str
+    workflow_name: Optional[str] = None
+    success: bool
+    timestamp: Optional[str] = None
+    error_type: Optional[str] = None
+    snippet: str = Field(..., description="Excerpt around the first match")
+
+
+class SearchResponse(BaseModel):
+    """Full-text search results."""
+    query: str
+    results: List[SearchHit]
+
+
+class BatchItem(RunRequest):
+    """One workflow in a batch request."""
+    id: Optional[str] = Field(None, description="Caller-supplied item ID (defaults to item-<index>)")
+
+
+class BatchRequest(BaseModel):
+    """Request model for batch workflow execution."""
+    items: List[BatchItem] = Field(..., min_length=1, description="Workflows to execute")
+    concurrency: int = Field(4, ge=1, le=32, description="Maximum concurrent runs")
+
+
+class BatchResponse(BaseModel):
+    """Batch execution results."""
+    results: List[Dict[str, Any]] = Field(..., description="Per-item results in input order")
+    runs: int
+    succeeded: int
+    elapsed_seconds: float
+    runs_per_second: float
@@ -0,0 +1,57 @@
+"""Benchmark per-node agent setup cost: fresh construction vs shared registry.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_agent_setup.py [iterations]
+
+Runs with a placeholder API key (no requests are sent) so the measured cost
+includes OpenAI client creation, as in production.
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark-placeholder")
+os.environ["MOCK"] = "0"
+
+from src.agents import ManagerAgent, ResearcherAgent, WriterAgent, QAAgent  # noqa: E402
+from src.agents.registry import get_agent, reset_agents  # noqa: E402
+
+NODES = [
+    ("manager", ManagerAgent),
+    ("researcher", ResearcherAgent),
+    ("writer", WriterAgent),
+    ("qa", QAAgent),
+]
+
+
+def bench(label: str, factory, iterations: int) -> float:
+    """Time factory() over iterations and print the per-call cost."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        factory()
+    elapsed = time.perf_counter() - start
+    per_call_us = elapsed / iterations * 1e6
+    print(f"  {label:<28} {per_call_us:>10.1f} us/call")
+    return per_call_us
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        print(f"Per-node agent setup ({iterations} iterations)")
+        for role, cls in NODES:
+            print(f"{role}:")
+            before = bench("construct per invocation", cls, iterations)
+            reset_agents()
+            get_agent(role)
+            after = bench("registry lookup", lambda: get_agent(role), iterations)
+            print(f"  {'speedup':<28} {before / after:>10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Benchmark database size with inline vs content-addressed blueprints.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_blueprint_storage.py [records] [distinct_blueprints]
+
+Writes the same history through the previous schema (full blueprint text in
+every execution_history row) and through MemoryManager (blueprints stored
+once by hash, compressed), then compares file sizes and write time.
+"""
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from src.core.memory import MemoryManager
+from src.core.schemas import ExecutionRecord
+
+SCHEMA = """
+    CREATE TABLE execution_history (
+        id TEXT PRIMARY KEY, workflow_name TEXT, blueprint TEXT, success BOOLEAN,
+        error_type TEXT, error_message TEXT, retry_count INTEGER,
+        duration_seconds REAL, timestamp DATETIME, learned_adjustments TEXT
+    )
+"""
+
+
+def make_blueprints(count: int):
+    """Build realistic multi-kilobyte blueprints."""
+    return [
+        json.dumps({
+            "name": f"workflow_{n}",
+            "description": "Assess the counterparty against sanctions, adverse media and ownership records. " * 8,
+            "steps": [
+                {"id": f"step_{i}", "agent_role": role, "instructions": f"Step {i}: " + "Follow the policy. " * 12}
+                for i, role in enumerate(["researcher", "writer", "qa"])
+            ]
+        })
+        for n in range(count)
+    ]
+
+
+def size_of(path: str) -> int:
+    """Checkpoint WAL and return the database size."""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    return os.path.getsize(path)
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    distinct = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    logging.disable(logging.INFO)
+    blueprints = make_blueprints(distinct)
+    rows = [
+        ExecutionRecord(
+            id=str(i), workflow_name=f"workflow_{i % distinct}", blueprint=blueprints[i % distinct],
+            success=True, duration_seconds=1.0, timestamp=datetime.now()
+        )
+        for i in range(records)
+    ]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        inline_path = os.path.join(workdir, "inline.db")
+        conn = sqlite3.connect(inline_path)
+        # Same journaling as the pool, so only the schema differs
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(SCHEMA)
+        start = time.perf_counter()
+        for r in rows:
+            conn.execute("INSERT INTO execution_history VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+                r.id, r.workflow_name, r.blueprint, r.success, r.error_type, r.error_message,
+                r.retry_count, r.duration_seconds, r.timestamp.isoformat(), r.learned_adjustments
+            ))
+            conn.commit()
+        inline_time = time.perf_counter() - start
+        conn.close()
+
+        stored_path = os.path.join(workdir, "stored.db")
+        memory = MemoryManager(stored_path)
+        start = time.perf_counter()
+        for r in rows:
+            memory.record_execution(r)
+        stored_time = time.perf_counter() - start
+
+        inline_size, stored_size = size_of(inline_path), size_of(stored_path)
+        print(f"{records} records, {distinct} distinct blueprints of ~{len(blueprints[0]) // 1024} KiB "
+              f"(codec {memory.blueprint_codec})")
+        print(f"  inline blueprint text   {inline_size / 1e6:>8.2f} MB  {records / inline_time:>8.0f} records/s")
+        print(f"  content-addressed       {stored_size / 1e6:>8.2f} MB  {records / stored_time:>8.0f} records/s"
+              "  (includes aggregates, sketches, indexes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark execution-history inserts under concurrent writers.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_memory_writes.py [writers] [records_per_writer]
+
+Compares the previous pattern (a new connection per operation, rollback
+journal) with the pooled MemoryManager (thread-local connections, WAL,
+synchronous=NORMAL, busy_timeout), synchronous and in write-behind mode.
+Write-behind throughput includes the final flush, so it counts committed
+rows, not just enqueued ones.
+"""
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from src.core.memory import MemoryManager
+from src.core.schemas import ExecutionRecord
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS execution_history (
+        id TEXT PRIMARY KEY, workflow_name TEXT, blueprint TEXT, success BOOLEAN,
+        error_type TEXT, error_message TEXT, retry_count INTEGER,
+        duration_seconds REAL, timestamp DATETIME, learned_adjustments TEXT
+    )
+"""
+
+
+def make_record(writer: int, i: int) -> ExecutionRecord:
+    """Build a successful execution record."""
+    return ExecutionRecord(
+        id=f"{writer}-{i}",
+        workflow_name="bench",
+        blueprint="{}",
+        success=True,
+        duration_seconds=1.0,
+        timestamp=datetime.now()
+    )
+
+
+def connect_per_operation(db_path: str):
+    """Return an insert function reproducing the unpooled implementation."""
+    conn = sqlite3.connect(db_path)
+    conn.execute(SCHEMA)
+    conn.commit()
+    conn.close()
+
+    def insert(record: ExecutionRecord):
+        conn = sqlite3.connect(db_path)
+        conn.execute("INSERT INTO execution_history VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+            record.id, record.workflow_name, record.blueprint, record.success,
+            record.error_type, record.error_message, record.retry_count,
+            record.duration_seconds, record.timestamp.isoformat(), record.learned_adjustments
+        ))
+        conn.commit()
+        conn.close()
+
+    return insert
+
+
+def pooled(db_path: str):
+    """Return an insert function using the pooled MemoryManager."""
+    return MemoryManager(db_path).record_execution
+
+
+def write_behind(db_path: str):
+    """Return an insert function and a flush function for write-behind mode."""
+    manager = MemoryManager(db_path, write_behind=True)
+    return manager.record_execution, manager.close
+
+
+def bench(label: str, insert, writers: int, per_writer: int, flush=None):
+    """Run concurrent writers and print throughput and lock errors."""
+    errors = []
+
+    def writer(n: int):
+        for i in range(per_writer):
+            try:
+                insert(make_record(n, i))
+            except sqlite3.OperationalError as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    enqueued = time.perf_counter() - start
+    if flush is not None:
+        flush()
+    elapsed = time.perf_counter() - start
+
+    ok = writers * per_writer - len(errors)
+    print(
+        f"  {label:<26} {ok / elapsed:>10.0f} inserts/s  ({len(errors)} lock errors, "
+        f"writers blocked {enqueued * 1000 / (writers * per_writer):.3f} ms/record)"
+    )
+
+
+def main():
+    writers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    per_writer = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"{writers} writers x {per_writer} inserts")
+        bench("connect per operation", connect_per_operation(os.path.join(workdir, "a.db")), writers, per_writer)
+        bench("pooled WAL", pooled(os.path.join(workdir, "b.db")), writers, per_writer)
+        insert, flush = write_behind(os.path.join(workdir, "c.db"))
+        bench("pooled WAL, write-behind", insert, writers, per_writer, flush)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark run history pages as the listing goes deeper.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_run_history.py [rows] [page_size]
+
+Compares LIMIT/OFFSET paging, whose cost grows with the offset, with the
+keyset pagination used by MemoryManager.list_executions.
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from src.core.memory import MemoryManager, encode_cursor
+
+OFFSET_SQL = """
+    SELECT id, workflow_name, success, error_type, error_message,
+           retry_count, duration_seconds, timestamp, blueprint_hash
+    FROM execution_history
+    WHERE workflow_name = ? AND timestamp IS NOT NULL
+    ORDER BY timestamp DESC, id DESC
+    LIMIT ? OFFSET ?
+"""
+
+
+def populate(memory: MemoryManager, rows: int) -> list:
+    """Bulk-insert synthetic history; returns (timestamp, id) of every wf0 row, newest first."""
+    start = datetime(2024, 1, 1)
+    data = [
+        (f"r{i:07d}", f"wf{i % 5}", i % 4 != 0, i % 3, float(i % 60), (start + timedelta(seconds=i)).isoformat())
+        for i in range(rows)
+    ]
+    with memory._pool.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO execution_history (id, workflow_name, success, retry_count, duration_seconds, timestamp) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            data
+        )
+    return sorted(((row[5], row[0]) for row in data if row[1] == "wf0"), reverse=True)
+
+
+def timed(label: str, fn, repeat: int = 50):
+    """Print the mean latency of fn over repeat calls."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<28} {elapsed * 1e3:>8.2f} ms/page")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        memory = MemoryManager(os.path.join(workdir, "history.db"))
+        keys = populate(memory, rows)
+        conn = memory._pool.connection()
+
+        print(f"{rows} rows, {len(keys)} in the listed workflow, {page_size} per page")
+        for depth in (0, len(keys) // 2, len(keys) - page_size - 1):
+            cursor = encode_cursor(*keys[depth - 1]) if depth else None
+            timed(f"offset {depth}", lambda: conn.execute(OFFSET_SQL, ("wf0", page_size, depth)).fetchall())
+            timed(f"keyset at {depth}", lambda: memory.list_executions("wf0", cursor=cursor, limit=page_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark full-text search over execution history.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_search.py [rows]
+
+Compares a LIKE scan over error_message/validation_feedback/final_output
+with the FTS5 index queried by MemoryManager.search_executions.
+"""
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from src.core.memory import MemoryManager
+from src.core.schemas import ExecutionRecord
+
+LIKE_SQL = """
+    SELECT id FROM execution_history
+    WHERE error_message LIKE ?1 OR validation_feedback LIKE ?1 OR final_output LIKE ?1
+    ORDER BY timestamp DESC LIMIT 20
+"""
+
+# Appears in one execution, so a LIKE scan cannot stop early
+NEEDLE = "區塊鏈"
+
+KEYWORDS = ["財務", "法律", "市場", "風險", "合規", "營運", "risk", "compliance", "revenue", "sources"]
+
+
+def populate(memory: MemoryManager, rows: int):
+    """Record synthetic executions in large batches."""
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1)
+    batch = []
+    for i in range(rows):
+        missing = NEEDLE if i == rows // 3 else rng.choice(KEYWORDS)
+        success = i % 4 != 0 and missing != NEEDLE
+        batch.append(ExecutionRecord(
+            id=f"r{i}",
+            workflow_name=f"wf{i % 5}",
+            blueprint="",
+            success=success,
+            error_type=None if success else "validation_failed",
+            error_message=None if success else f"Missing required keyword: {missing}",
+            validation_feedback=None if success else f"Validation failed. Missing required keyword: {missing}",
+            final_output=" ".join(rng.sample(KEYWORDS, 4)) + f" report {i}",
+            duration_seconds=1.0,
+            timestamp=start + timedelta(seconds=i)
+        ))
+        if len(batch) == 5000:
+            memory._write_records(batch)
+            batch = []
+    if batch:
+        memory._write_records(batch)
+
+
+def timed(label: str, fn, repeat: int = 20):
+    """Print the mean latency of fn over repeat calls."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<36} {elapsed * 1e3:>9.2f} ms/query")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        memory = MemoryManager(os.path.join(workdir, "search.db"))
+        start = time.perf_counter()
+        populate(memory, rows)
+        print(f"{rows} rows indexed in {time.perf_counter() - start:.1f}s")
+        conn = memory._pool.connection()
+
+        print("common term (about 1 in 40 executions)")
+        timed("LIKE", lambda: conn.execute(LIKE_SQL, ("%Missing required keyword: 市場%",)).fetchall(), 3)
+        timed("FTS recent", lambda: memory.search_executions("Missing required keyword: 市場"))
+        timed("FTS recent, failures only",
+              lambda: memory.search_executions("Missing required keyword: 市場", success=False))
+        timed("FTS relevance",
+              lambda: memory.search_executions("Missing required keyword: 市場", order="relevance"), 3)
+        print("rare term (one execution)")
+        timed("LIKE", lambda: conn.execute(LIKE_SQL, (f"%{NEEDLE}%",)).fetchall(), 3)
+        timed("FTS recent", lambda: memory.search_executions(NEEDLE))
+        timed("FTS relevance", lambda: memory.search_executions(NEEDLE, order="relevance"))
+
+
+if __name__ == "__main__":
+    main()
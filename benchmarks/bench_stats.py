@@ -0,0 +1,61 @@
+"""Benchmark workflow stats lookups as history grows.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_stats.py [rows] [workflows]
+
+Compares the previous COUNT/SUM/AVG scan over execution_history with the
+maintained workflow_aggregates row read by MemoryManager.get_execution_stats.
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from src.core.memory import MemoryManager
+
+SCAN_SQL = """
+    SELECT
+        COUNT(*), SUM(CASE WHEN success THEN 1 ELSE 0 END),
+        AVG(duration_seconds), AVG(retry_count)
+    FROM execution_history
+    WHERE workflow_name = ?
+"""
+
+
+def populate(memory: MemoryManager, rows: int, workflows: int):
+    """Bulk-insert synthetic history through the aggregate triggers."""
+    with memory._pool.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO execution_history (id, workflow_name, success, retry_count, duration_seconds, timestamp) "
+            "VALUES (?, ?, ?, ?, ?, '2024-01-01T00:00:00')",
+            ((f"r{i}", f"wf{i % workflows}", i % 4 != 0, i % 3, float(i % 60)) for i in range(rows))
+        )
+
+
+def timed(label: str, fn, repeat: int = 200):
+    """Print the mean latency of fn over repeat calls."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<22} {elapsed * 1e6:>10.1f} us/lookup")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    workflows = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        memory = MemoryManager(os.path.join(workdir, "stats.db"))
+        populate(memory, rows, workflows)
+        conn = memory._pool.connection()
+
+        print(f"{rows} rows across {workflows} workflows")
+        timed("indexed scan", lambda: conn.execute(SCAN_SQL, ("wf0",)).fetchone(), repeat=20)
+        timed("aggregates row", lambda: memory.get_execution_stats("wf0"))
+
+
+if __name__ == "__main__":
+    main()
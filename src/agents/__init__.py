@@ -4,6 +4,7 @@ from src.agents.manager import ManagerAgent
 from src.agents.researcher import ResearcherAgent
 from src.agents.writer import WriterAgent
 from src.agents.qa import QAAgent
+from src.agents.registry import AgentRegistry, get_agent, reset_agents
 
 __all__ = [
     "BaseAgent",
@@ -11,4 +12,7 @@ __all__ = [
     "ResearcherAgent",
     "WriterAgent",
     "QAAgent",
+    "AgentRegistry",
+    "get_agent",
+    "reset_agents",
 ]
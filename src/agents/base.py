@@ -1,7 +1,8 @@
 """Base agent class for all specialized agents."""
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Iterator, AsyncIterator
 from src.llm.client import get_llm_client, LLMClient
+from src.llm.cache import cached_agent_roles
 from src.utils.logging import setup_logger
 
 logger = setup_logger(__name__)
@@ -10,17 +11,20 @@ logger = setup_logger(__name__)
 class BaseAgent(ABC):
     """Abstract base class for all agents."""
 
-    def __init__(self, role: str, system_prompt: str):
+    def __init__(self, role: str, system_prompt: str, llm: Optional[LLMClient] = None):
         """
         Initialize base agent.
 
         Args:
             role: Agent role identifier
             system_prompt: System prompt for this agent
+            llm: Optional shared LLM client (a new one is created if omitted)
         """
         self.role = role
         self.system_prompt = system_prompt
-        self.llm: LLMClient = get_llm_client()
+        self.llm: LLMClient = llm or get_llm_client()
+        # Per-agent opt-in to the response cache (LLM_CACHE_AGENTS)
+        self.cache_responses = role in cached_agent_roles()
         logger.info(f"Initialized {role} agent")
 
     @abstractmethod
@@ -37,11 +41,26 @@ class BaseAgent(ABC):
         """
         pass
 
+    @abstractmethod
+    async def aprocess(self, state: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """
+        Async variant of process for the non-blocking execution path.
+
+        Args:
+            state: Current workflow state
+            **kwargs: Additional arguments
+
+        Returns:
+            Dictionary with processing results
+        """
+        pass
+
     def _generate_response(
         self,
         prompt: str,
         json_mode: bool = False,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        use_cache: Optional[bool] = None
     ) -> str:
         """
         Generate response using LLM.
@@ -50,6 +69,7 @@ class BaseAgent(ABC):
             prompt: User prompt
             json_mode: Whether to enforce JSON output
             temperature: Sampling temperature
+            use_cache: Override the agent's cache setting for this call
 
         Returns:
             Generated response
@@ -58,5 +78,81 @@ class BaseAgent(ABC):
             prompt=prompt,
             system_prompt=self.system_prompt,
             json_mode=json_mode,
-            temperature=temperature
+            temperature=temperature,
+            use_cache=self.cache_responses if use_cache is None else use_cache
+        )
+
+    async def _agenerate_response(
+        self,
+        prompt: str,
+        json_mode: bool = False,
+        temperature: float = 0.7,
+        use_cache: Optional[bool] = None
+    ) -> str:
+        """
+        Generate response using LLM without blocking the event loop.
+
+        Args:
+            prompt: User prompt
+            json_mode: Whether to enforce JSON output
+            temperature: Sampling temperature
+            use_cache: Override the agent's cache setting for this call
+
+        Returns:
+            Generated response
+        """
+        return await self.llm.agenerate(
+            prompt=prompt,
+            system_prompt=self.system_prompt,
+            json_mode=json_mode,
+            temperature=temperature,
+            use_cache=self.cache_responses if use_cache is None else use_cache
+        )
+
+    def _stream_response(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        use_cache: Optional[bool] = None
+    ) -> Iterator[str]:
+        """
+        Generate a text response incrementally.
+
+        Args:
+            prompt: User prompt
+            temperature: Sampling temperature
+            use_cache: Override the agent's cache setting for this call
+
+        Returns:
+            Iterator over text chunks
+        """
+        return self.llm.generate_stream(
+            prompt=prompt,
+            system_prompt=self.system_prompt,
+            temperature=temperature,
+            use_cache=self.cache_responses if use_cache is None else use_cache
+        )
+
+    def _astream_response(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        use_cache: Optional[bool] = None
+    ) -> AsyncIterator[str]:
+        """
+        Async variant of _stream_response.
+
+        Args:
+            prompt: User prompt
+            temperature: Sampling temperature
+            use_cache: Override the agent's cache setting for this call
+
+        Returns:
+            Async iterator over text chunks
+        """
+        return self.llm.agenerate_stream(
+            prompt=prompt,
+            system_prompt=self.system_prompt,
+            temperature=temperature,
+            use_cache=self.cache_responses if use_cache is None else use_cache
         )
@@ -1,8 +1,10 @@
 """Manager Agent: orchestrates workflow and applies meta-learning."""
+import asyncio
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from src.agents.base import BaseAgent
-from src.core.memory import MemoryManager
+from src.llm.client import LLMClient
+from src.core.memory import get_memory_manager
 from src.utils.logging import setup_logger
 
 logger = setup_logger(__name__)
@@ -19,8 +21,13 @@ class ManagerAgent(BaseAgent):
     4. Make go/no-go decisions
     """
 
-    def __init__(self):
-        """Initialize Manager agent."""
+    def __init__(self, llm: Optional[LLMClient] = None):
+        """
+        Initialize Manager agent.
+
+        Args:
+            llm: Optional shared LLM client
+        """
         super().__init__(
             role="manager",
             system_prompt="""You are a workflow manager coordinating AI agents.
@@ -32,9 +39,10 @@ Your responsibilities:
 4. Make strategic decisions about workflow execution
 5. Provide clear guidance to other agents
 
-Be strategic, adaptive, and proactive in preventing issues based on historical patterns."""
+Be strategic, adaptive, and proactive in preventing issues based on historical patterns.""",
+            llm=llm
         )
-        self.memory = MemoryManager()
+        self.memory = get_memory_manager()
 
     def process(self, state: Dict[str, Any], **kwargs) -> Dict[str, Any]:
         """
@@ -51,6 +59,51 @@ Be strategic, adaptive, and proactive in preventing issues based on historical p
             logger.error("No workflow found in state")
             return {"error": "No workflow provided"}
 
+        learning_context, stats, prompt = self._build_decision_request(state, workflow)
+
+        try:
+            response = self._generate_response(prompt, json_mode=True, temperature=0.5)
+            return self._decision_result(response, learning_context, stats)
+
+        except Exception as e:
+            return self._fallback_decision(e)
+
+    async def aprocess(self, state: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """
+        Async variant of process.
+
+        Args:
+            state: Current workflow state
+
+        Returns:
+            Dictionary with manager decisions and adjusted prompts
+        """
+        workflow = state.get("workflow")
+        if not workflow:
+            logger.error("No workflow found in state")
+            return {"error": "No workflow provided"}
+
+        # Meta-learning reads may hit SQLite; keep them off the event loop
+        learning_context, stats, prompt = await asyncio.to_thread(self._build_decision_request, state, workflow)
+
+        try:
+            response = await self._agenerate_response(prompt, json_mode=True, temperature=0.5)
+            return self._decision_result(response, learning_context, stats)
+
+        except Exception as e:
+            return self._fallback_decision(e)
+
+    def _build_decision_request(self, state: Dict[str, Any], workflow) -> Tuple[str, Dict[str, Any], str]:
+        """
+        Gather meta-learning inputs and build the decision prompt.
+
+        Args:
+            state: Current workflow state
+            workflow: Workflow being executed
+
+        Returns:
+            Tuple of (learning context, execution stats, prompt)
+        """
         # Get meta-learning context
         learning_context = self.memory.get_learning_context(workflow.name)
         current_step = state.get("current_step", 0)
@@ -88,31 +141,38 @@ Output JSON with:
   "notes": "strategic guidance"
 }}"""
 
-        try:
-            response = self._generate_response(prompt, json_mode=True, temperature=0.5)
-            decision = json.loads(response)
-
-            logger.info(f"Manager decision: next agent = {decision.get('next_agent')}")
-
-            return {
-                "manager_decision": decision,
-                "learning_applied": learning_context != "No historical failures for this workflow type.",
-                "execution_stats": stats
-            }
-
-        except Exception as e:
-            logger.error(f"Manager processing error: {e}")
-            # Provide fallback decision
-            return {
-                "manager_decision": {
-                    "next_agent": "researcher",
-                    "adjusted_prompts": {},
-                    "validation_requirements": [],
-                    "notes": "Fallback decision due to processing error"
-                },
-                "learning_applied": False,
-                "error": str(e)
-            }
+        return learning_context, stats, prompt
+
+    def _decision_result(
+        self,
+        response: str,
+        learning_context: str,
+        stats: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Parse the LLM decision into the manager output."""
+        decision = json.loads(response)
+
+        logger.info(f"Manager decision: next agent = {decision.get('next_agent')}")
+
+        return {
+            "manager_decision": decision,
+            "learning_applied": learning_context != "No historical failures for this workflow type.",
+            "execution_stats": stats
+        }
+
+    def _fallback_decision(self, error: Exception) -> Dict[str, Any]:
+        """Provide fallback decision after a processing error."""
+        logger.error(f"Manager processing error: {error}")
+        return {
+            "manager_decision": {
+                "next_agent": "researcher",
+                "adjusted_prompts": {},
+                "validation_requirements": [],
+                "notes": "Fallback decision due to processing error"
+            },
+            "learning_applied": False,
+            "error": str(error)
+        }
 
     def design_strategy(self, workflow_name: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
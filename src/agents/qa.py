@@ -1,6 +1,8 @@
 """QA Agent: validates output quality and completeness."""
-from typing import Dict, Any
+import json
+from typing import Dict, Any, Optional
 from src.agents.base import BaseAgent
+from src.llm.client import LLMClient
 from src.core.validators import OutputValidator
 from src.core.schemas import ValidationResult
 from src.utils.logging import setup_logger
@@ -20,8 +22,13 @@ class QAAgent(BaseAgent):
     5. Make pass/fail decisions
     """
 
-    def __init__(self):
-        """Initialize QA agent."""
+    def __init__(self, llm: Optional[LLMClient] = None):
+        """
+        Initialize QA agent.
+
+        Args:
+            llm: Optional shared LLM client
+        """
         super().__init__(
             role="qa",
             system_prompt="""You are a quality assurance specialist ensuring output excellence.
@@ -33,7 +40,8 @@ Your responsibilities:
 4. Identify any gaps or issues
 5. Provide specific, actionable feedback
 
-Be thorough and constructive. Your feedback should help improve the output."""
+Be thorough and constructive. Your feedback should help improve the output.""",
+            llm=llm
         )
         self.validator = OutputValidator()
 
@@ -52,39 +60,78 @@ Be thorough and constructive. Your feedback should help improve the output."""
             logger.error("No workflow found in state")
             return {"error": "No workflow provided"}
 
-        # Get writer output
-        writer_output = state.get("agent_outputs", {}).get("writer", {})
-        draft = writer_output.get("draft", "")
-
+        draft = self._find_draft(state)
         if not draft:
-            draft = state.get("writer_draft", "")
-
-        if not draft:
-            logger.error("No draft found for validation")
-            return {
-                "passed": False,
-                "feedback": "No output to validate",
-                "failed_checks": ["missing_output"]
-            }
-
-        workflow_name = workflow.name
-        expected_output = workflow.expected_output
-
-        # Get validation rules from workflow steps
-        validation_rules = self._extract_validation_rules(workflow)
+            return self._missing_draft_result()
 
         # Run automated validation
-        auto_validation = self.validator.validate_workflow_output(draft, workflow_name)
+        auto_validation = self.validator.validate_workflow_output(draft, workflow.name)
 
         # Get LLM-based qualitative validation
         qualitative_validation = self._qualitative_validation(
             draft,
-            workflow_name,
-            expected_output,
-            validation_rules
+            workflow.name,
+            workflow.expected_output,
+            self._extract_validation_rules(workflow)
+        )
+
+        return self._combine_validations(auto_validation, qualitative_validation)
+
+    async def aprocess(self, state: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """
+        Async variant of process.
+
+        Args:
+            state: Current workflow state
+
+        Returns:
+            Dictionary with validation results and feedback
+        """
+        workflow = state.get("workflow")
+        if not workflow:
+            logger.error("No workflow found in state")
+            return {"error": "No workflow provided"}
+
+        draft = self._find_draft(state)
+        if not draft:
+            return self._missing_draft_result()
+
+        auto_validation = self.validator.validate_workflow_output(draft, workflow.name)
+
+        qualitative_validation = await self._aqualitative_validation(
+            draft,
+            workflow.name,
+            workflow.expected_output,
+            self._extract_validation_rules(workflow)
         )
 
-        # Combine validations
+        return self._combine_validations(auto_validation, qualitative_validation)
+
+    def _find_draft(self, state: Dict[str, Any]) -> str:
+        """Get the writer draft from agent outputs or state."""
+        writer_output = state.get("agent_outputs", {}).get("writer", {})
+        draft = writer_output.get("draft", "")
+
+        if not draft:
+            draft = state.get("writer_draft", "")
+
+        return draft
+
+    def _missing_draft_result(self) -> Dict[str, Any]:
+        """Result returned when there is nothing to validate."""
+        logger.error("No draft found for validation")
+        return {
+            "passed": False,
+            "feedback": "No output to validate",
+            "failed_checks": ["missing_output"]
+        }
+
+    def _combine_validations(
+        self,
+        auto_validation: ValidationResult,
+        qualitative_validation: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Combine automated and qualitative validation into the QA result."""
         passed = auto_validation.passed and qualitative_validation.get("passed", True)
 
         feedback_parts = []
@@ -138,7 +185,58 @@ Be thorough and constructive. Your feedback should help improve the output."""
         Returns:
             Validation result dictionary
         """
-        prompt = f"""Perform quality review of this output for workflow: {workflow_name}
+        prompt = self._build_qualitative_prompt(output, workflow_name, expected_output, validation_rules)
+
+        try:
+            response = self._generate_response(prompt, json_mode=True, temperature=0.3)
+            return json.loads(response)
+
+        except json.JSONDecodeError as e:
+            return self._unparseable_qualitative(e)
+
+        except Exception as e:
+            return self._fallback_qualitative(e)
+
+    async def _aqualitative_validation(
+        self,
+        output: str,
+        workflow_name: str,
+        expected_output: Dict[str, Any],
+        validation_rules: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Async variant of _qualitative_validation.
+
+        Args:
+            output: Output to validate
+            workflow_name: Workflow name
+            expected_output: Expected output specification
+            validation_rules: Validation rules
+
+        Returns:
+            Validation result dictionary
+        """
+        prompt = self._build_qualitative_prompt(output, workflow_name, expected_output, validation_rules)
+
+        try:
+            response = await self._agenerate_response(prompt, json_mode=True, temperature=0.3)
+            return json.loads(response)
+
+        except json.JSONDecodeError as e:
+            return self._unparseable_qualitative(e)
+
+        except Exception as e:
+            return self._fallback_qualitative(e)
+
+    def _build_qualitative_prompt(
+        self,
+        output: str,
+        workflow_name: str,
+        expected_output: Dict[str, Any],
+        validation_rules: Dict[str, Any]
+    ) -> str:
+        """Build the qualitative review prompt."""
+        return f"""Perform quality review of this output for workflow: {workflow_name}
 
 OUTPUT TO REVIEW:
 {output}
@@ -168,18 +266,25 @@ Output JSON:
   "strengths": ["strength1", "strength2"]
 }}"""
 
-        try:
-            import json
-            response = self._generate_response(prompt, json_mode=True, temperature=0.3)
-            result = json.loads(response)
-            return result
+    def _unparseable_qualitative(self, error: Exception) -> Dict[str, Any]:
+        """Fail validation when the qualitative review is not valid JSON."""
+        logger.error(f"Qualitative validation returned invalid JSON: {error}")
+        return {
+            "passed": False,
+            "feedback": "Quality review response could not be parsed",
+            "issues": ["qualitative_validation_unparseable"],
+            "error": str(error)
+        }
 
-        except Exception as e:
-            logger.error(f"Qualitative validation error: {e}")
-            # Provide safe fallback
-            return {
-                "passed": True,
-                "feedback": "Qualitative validation unavailable, proceeding with automated checks only",
-                "issues": [],
-                "error": str(e)
-            }
+    def _fallback_qualitative(self, error: Exception) -> Dict[str, Any]:
+        """Fail validation when the qualitative review errors, only with LLM_MOCK_FALLBACK=1."""
+        logger.error(f"Qualitative validation error: {error}")
+        if not self.llm.mock_fallback:
+            raise error
+        # An unreviewed draft must not pass
+        return {
+            "passed": False,
+            "feedback": "Qualitative validation unavailable, output could not be reviewed",
+            "issues": ["qualitative_validation_unavailable"],
+            "error": str(error)
+        }
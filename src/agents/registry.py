@@ -0,0 +1,92 @@
+"""Process-wide registry of long-lived agent instances."""
+import threading
+from typing import Dict, Optional, Type
+from src.agents.base import BaseAgent
+from src.agents.manager import ManagerAgent
+from src.agents.researcher import ResearcherAgent
+from src.agents.writer import WriterAgent
+from src.agents.qa import QAAgent
+from src.llm.client import get_llm_client, LLMClient
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+AGENT_CLASSES: Dict[str, Type[BaseAgent]] = {
+    "manager": ManagerAgent,
+    "researcher": ResearcherAgent,
+    "writer": WriterAgent,
+    "qa": QAAgent,
+}
+
+
+class AgentRegistry:
+    """
+    Thread-safe registry of stateless agents.
+
+    Agents keep no per-run state (everything flows through the graph state),
+    so one instance per role can serve every node invocation. All agents
+    created by a registry share a single LLM client.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._agents: Dict[str, BaseAgent] = {}
+        self._llm: Optional[LLMClient] = None
+        self._lock = threading.Lock()
+
+    def get(self, role: str) -> BaseAgent:
+        """
+        Get the agent for a role, creating it on first use.
+
+        Args:
+            role: Agent role (manager, researcher, writer, qa)
+
+        Returns:
+            Shared agent instance
+
+        Raises:
+            ValueError: If role is unknown
+        """
+        agent = self._agents.get(role)
+        if agent is not None:
+            return agent
+
+        if role not in AGENT_CLASSES:
+            raise ValueError(f"Unknown agent role: {role}")
+
+        with self._lock:
+            agent = self._agents.get(role)
+            if agent is None:
+                if self._llm is None:
+                    self._llm = get_llm_client()
+                agent = AGENT_CLASSES[role](llm=self._llm)
+                self._agents[role] = agent
+                logger.info(f"Registered shared {role} agent")
+            return agent
+
+    def reset(self):
+        """Drop all agents so the next lookup re-reads configuration."""
+        with self._lock:
+            self._agents = {}
+            self._llm = None
+
+
+_registry = AgentRegistry()
+
+
+def get_agent(role: str) -> BaseAgent:
+    """
+    Get the process-wide agent for a role.
+
+    Args:
+        role: Agent role
+
+    Returns:
+        Shared agent instance
+    """
+    return _registry.get(role)
+
+
+def reset_agents():
+    """Reset the process-wide agent registry."""
+    _registry.reset()
@@ -1,6 +1,7 @@
 """Researcher Agent: gathers information and conducts analysis."""
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from src.agents.base import BaseAgent
+from src.llm.client import LLMClient
 from src.llm.mock_provider import MockLLMProvider
 from src.utils.logging import setup_logger
 
@@ -18,8 +19,13 @@ class ResearcherAgent(BaseAgent):
     4. Support various research scenarios
     """
 
-    def __init__(self):
-        """Initialize Researcher agent."""
+    def __init__(self, llm: Optional[LLMClient] = None):
+        """
+        Initialize Researcher agent.
+
+        Args:
+            llm: Optional shared LLM client
+        """
         super().__init__(
             role="researcher",
             system_prompt="""You are a research specialist conducting thorough analysis.
@@ -31,7 +37,8 @@ Your responsibilities:
 4. Identify key insights and patterns
 5. Flag any data gaps or concerns
 
-Be thorough, objective, and detail-oriented. Organize findings clearly."""
+Be thorough, objective, and detail-oriented. Organize findings clearly.""",
+            llm=llm
         )
         self.mock_provider = MockLLMProvider()
 
@@ -50,6 +57,42 @@ Be thorough, objective, and detail-oriented. Organize findings clearly."""
             logger.error("No workflow found in state")
             return {"error": "No workflow provided"}
 
+        prompt = self._build_research_prompt(state, workflow)
+
+        try:
+            # Generate research findings
+            findings = self._generate_response(prompt, temperature=0.5)
+            return self._research_result(workflow, findings)
+
+        except Exception as e:
+            return self._fallback_research(workflow, e)
+
+    async def aprocess(self, state: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """
+        Async variant of process.
+
+        Args:
+            state: Current workflow state
+
+        Returns:
+            Dictionary with research findings
+        """
+        workflow = state.get("workflow")
+        if not workflow:
+            logger.error("No workflow found in state")
+            return {"error": "No workflow provided"}
+
+        prompt = self._build_research_prompt(state, workflow)
+
+        try:
+            findings = await self._agenerate_response(prompt, temperature=0.5)
+            return self._research_result(workflow, findings)
+
+        except Exception as e:
+            return self._fallback_research(workflow, e)
+
+    def _build_research_prompt(self, state: Dict[str, Any], workflow) -> str:
+        """Build the research prompt for the workflow, including manager guidance."""
         input_data = workflow.input_data
         workflow_name = workflow.name
 
@@ -72,32 +115,41 @@ Be thorough, objective, and detail-oriented. Organize findings clearly."""
         if adjusted_prompt:
             prompt += f"\n\nAdditional guidance from manager:\n{adjusted_prompt}"
 
-        try:
-            # Generate research findings
-            findings = self._generate_response(prompt, temperature=0.5)
+        return prompt
 
-            logger.info(f"Research completed for {workflow_name}")
+    def _research_result(self, workflow, findings: str) -> Dict[str, Any]:
+        """Package generated findings."""
+        input_data = workflow.input_data
+        company_name = input_data.get("company_name", "ACME Corp")
+        job_description = input_data.get("job_description", "")
 
-            return {
-                "findings": findings,
-                "research_target": company_name or job_description[:50],
-                "status": "completed"
-            }
+        logger.info(f"Research completed for {workflow.name}")
 
-        except Exception as e:
-            logger.error(f"Research error: {e}")
-            # Use mock fallback
-            if "due_diligence" in workflow_name.lower():
-                findings = self.mock_provider.get_mock_research(company_name)
-            else:
-                findings = "Mock research findings: Analysis completed with standard methodology."
-
-            return {
-                "findings": findings,
-                "research_target": company_name,
-                "status": "completed_with_mock",
-                "error": str(e)
-            }
+        return {
+            "findings": findings,
+            "research_target": company_name or job_description[:50],
+            "status": "completed"
+        }
+
+    def _fallback_research(self, workflow, error: Exception) -> Dict[str, Any]:
+        """Use mock findings after a research error, only with LLM_MOCK_FALLBACK=1."""
+        logger.error(f"Research error: {error}")
+        if not self.llm.mock_fallback:
+            raise error
+        company_name = workflow.input_data.get("company_name", "ACME Corp")
+
+        # Use mock fallback
+        if "due_diligence" in workflow.name.lower():
+            findings = self.mock_provider.get_mock_research(company_name)
+        else:
+            findings = "Mock research findings: Analysis completed with standard methodology."
+
+        return {
+            "findings": findings,
+            "research_target": company_name,
+            "status": "completed_with_mock",
+            "error": str(error)
+        }
 
     def _build_due_diligence_prompt(self, company_name: str) -> str:
         """Build prompt for due diligence research."""
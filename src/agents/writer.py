@@ -1,6 +1,7 @@
 """Writer Agent: creates structured content and reports."""
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 from src.agents.base import BaseAgent
+from src.llm.client import LLMClient
 from src.llm.mock_provider import MockLLMProvider
 from src.utils.logging import setup_logger
 
@@ -18,8 +19,13 @@ class WriterAgent(BaseAgent):
     4. Adapt to different output formats
     """
 
-    def __init__(self):
-        """Initialize Writer agent."""
+    def __init__(self, llm: Optional[LLMClient] = None):
+        """
+        Initialize Writer agent.
+
+        Args:
+            llm: Optional shared LLM client
+        """
         super().__init__(
             role="writer",
             system_prompt="""You are a professional content writer creating high-quality deliverables.
@@ -31,7 +37,8 @@ Your responsibilities:
 4. Adapt tone and structure to the target audience
 5. Include all required sections and elements
 
-Be concise yet comprehensive. Use clear markdown formatting."""
+Be concise yet comprehensive. Use clear markdown formatting.""",
+            llm=llm
         )
         self.mock_provider = MockLLMProvider()
 
@@ -56,6 +63,139 @@ Be concise yet comprehensive. Use clear markdown formatting."""
             logger.error("No workflow found in state")
             return {"error": "No workflow provided"}
 
+        prompt = self._build_writing_prompt(state, workflow, custom_prompt)
+        retry_count = state.get("retry_count", 0)
+
+        try:
+            # Generate written output
+            # Retries must produce a fresh draft, never a cached one
+            draft = self._generate_response(prompt, temperature=0.7, use_cache=self._may_cache(retry_count))
+            return self._draft_result(workflow, draft, retry_count)
+
+        except Exception as e:
+            return self._fallback_draft(workflow, e, retry_count)
+
+    async def aprocess(
+        self,
+        state: Dict[str, Any],
+        custom_prompt: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Async variant of process.
+
+        Args:
+            state: Current workflow state
+            custom_prompt: Optional custom prompt from manager
+
+        Returns:
+            Dictionary with written draft
+        """
+        workflow = state.get("workflow")
+        if not workflow:
+            logger.error("No workflow found in state")
+            return {"error": "No workflow provided"}
+
+        prompt = self._build_writing_prompt(state, workflow, custom_prompt)
+        retry_count = state.get("retry_count", 0)
+
+        try:
+            draft = await self._agenerate_response(prompt, temperature=0.7, use_cache=self._may_cache(retry_count))
+            return self._draft_result(workflow, draft, retry_count)
+
+        except Exception as e:
+            return self._fallback_draft(workflow, e, retry_count)
+
+    def process_stream(
+        self,
+        state: Dict[str, Any],
+        on_chunk: Callable[[str], None],
+        custom_prompt: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Variant of process that reports the draft as it is generated.
+
+        Args:
+            state: Current workflow state
+            on_chunk: Called with each text chunk as it arrives
+            custom_prompt: Optional custom prompt from manager
+
+        Returns:
+            Dictionary with the complete written draft
+
+        Raises:
+            Exception: If generation fails after chunks were reported
+        """
+        workflow = state.get("workflow")
+        if not workflow:
+            logger.error("No workflow found in state")
+            return {"error": "No workflow provided"}
+
+        prompt = self._build_writing_prompt(state, workflow, custom_prompt)
+        retry_count = state.get("retry_count", 0)
+
+        chunks = []
+        try:
+            for chunk in self._stream_response(prompt, temperature=0.7, use_cache=self._may_cache(retry_count)):
+                chunks.append(chunk)
+                on_chunk(chunk)
+            return self._draft_result(workflow, "".join(chunks), retry_count)
+
+        except Exception as e:
+            # Part of a real draft already reached the client; a mock ending would misrepresent it
+            if chunks:
+                raise
+            return self._fallback_draft(workflow, e, retry_count)
+
+    async def aprocess_stream(
+        self,
+        state: Dict[str, Any],
+        on_chunk: Callable[[str], None],
+        custom_prompt: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Async variant of process_stream.
+
+        Args:
+            state: Current workflow state
+            on_chunk: Called with each text chunk as it arrives
+            custom_prompt: Optional custom prompt from manager
+
+        Returns:
+            Dictionary with the complete written draft
+
+        Raises:
+            Exception: If generation fails after chunks were reported
+        """
+        workflow = state.get("workflow")
+        if not workflow:
+            logger.error("No workflow found in state")
+            return {"error": "No workflow provided"}
+
+        prompt = self._build_writing_prompt(state, workflow, custom_prompt)
+        retry_count = state.get("retry_count", 0)
+
+        chunks = []
+        try:
+            async for chunk in self._astream_response(prompt, temperature=0.7, use_cache=self._may_cache(retry_count)):
+                chunks.append(chunk)
+                on_chunk(chunk)
+            return self._draft_result(workflow, "".join(chunks), retry_count)
+
+        except Exception as e:
+            if chunks:
+                raise
+            return self._fallback_draft(workflow, e, retry_count)
+
+    def _build_writing_prompt(
+        self,
+        state: Dict[str, Any],
+        workflow,
+        custom_prompt: Optional[str] = None
+    ) -> str:
+        """Build the writing prompt from findings, feedback and manager guidance."""
         # Get research findings
         researcher_output = state.get("agent_outputs", {}).get("researcher", {})
         research_findings = researcher_output.get("findings", "")
@@ -94,34 +234,44 @@ Be concise yet comprehensive. Use clear markdown formatting."""
         if retry_count > 0:
             prompt += f"\n\nNote: This is retry #{retry_count}. Previous feedback:\n{validation_feedback}"
 
-        try:
-            # Generate written output
-            draft = self._generate_response(prompt, temperature=0.7)
-
-            logger.info(f"Writing completed for {workflow_name} (retry: {retry_count})")
+        return prompt
 
-            return {
-                "draft": draft,
-                "status": "completed",
-                "retry_count": retry_count
-            }
+    def _may_cache(self, retry_count: int) -> bool:
+        """Whether a draft may come from the response cache."""
+        return self.cache_responses and retry_count == 0
+
+    def _draft_result(self, workflow, draft: str, retry_count: int) -> Dict[str, Any]:
+        """Package a generated draft."""
+        logger.info(f"Writing completed for {workflow.name} (retry: {retry_count})")
+
+        return {
+            "draft": draft,
+            "status": "completed",
+            "retry_count": retry_count
+        }
+
+    def _fallback_draft(self, workflow, error: Exception, retry_count: int) -> Dict[str, Any]:
+        """Use a mock draft after a writing error, only with LLM_MOCK_FALLBACK=1."""
+        logger.error(f"Writing error: {error}")
+        if not self.llm.mock_fallback:
+            raise error
+        workflow_name = workflow.name
+        input_data = workflow.input_data
 
-        except Exception as e:
-            logger.error(f"Writing error: {e}")
-            # Use mock fallback
-            if "due_diligence" in workflow_name.lower() or "diligence" in workflow_name.lower():
-                draft = self.mock_provider.get_mock_report(input_data.get("company_name", "ACME Corp"))
-            elif "recruiting" in workflow_name.lower() or "jd" in workflow_name.lower() or "sourcing" in workflow_name.lower():
-                draft = self.mock_provider.get_mock_recruiting_output()
-            else:
-                draft = "Mock output: Professional analysis and recommendations based on research findings."
-
-            return {
-                "draft": draft,
-                "status": "completed_with_mock",
-                "error": str(e),
-                "retry_count": retry_count
-            }
+        # Use mock fallback
+        if "due_diligence" in workflow_name.lower() or "diligence" in workflow_name.lower():
+            draft = self.mock_provider.get_mock_report(input_data.get("company_name", "ACME Corp"))
+        elif "recruiting" in workflow_name.lower() or "jd" in workflow_name.lower() or "sourcing" in workflow_name.lower():
+            draft = self.mock_provider.get_mock_recruiting_output()
+        else:
+            draft = "Mock output: Professional analysis and recommendations based on research findings."
+
+        return {
+            "draft": draft,
+            "status": "completed_with_mock",
+            "error": str(error),
+            "retry_count": retry_count
+        }
 
     def _build_due_diligence_report_prompt(
         self,
@@ -0,0 +1,395 @@
+"""Batch execution of many blueprints, as a library, API helper and CLI.
+
+Usage:
+    python -m src.batch blueprints.jsonl -o results.jsonl --concurrency 4
+
+Each input line is either a blueprint object, or a wrapper
+{"id": ..., "blueprint": <object or string>, "scenario": ...}. Results are
+appended to the output file as they finish; re-running with the same output
+skips ids already present, so an interrupted batch resumes where it stopped.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from src.core.blueprint_parser import BlueprintParser
+from src.graph.builder import execute_workflow, execute_workflow_async
+from src.llm.usage import get_usage_counter
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+BatchInput = Union[Dict[str, Any], str]
+
+
+def normalize_item(raw: BatchInput, index: int) -> Dict[str, Any]:
+    """
+    Normalize one batch input into {"id", "blueprint", "scenario"}.
+
+    Args:
+        raw: Blueprint object, blueprint string, or wrapper with a "blueprint" key
+        index: Position in the batch, used for the default id
+
+    Returns:
+        Normalized item with the blueprint as a string
+    """
+    if isinstance(raw, dict) and "blueprint" in raw:
+        blueprint = raw["blueprint"]
+        item_id = raw.get("id")
+        scenario = raw.get("scenario")
+    else:
+        blueprint = raw
+        item_id = None
+        scenario = None
+
+    if not isinstance(blueprint, str):
+        blueprint = json.dumps(blueprint, ensure_ascii=False)
+
+    return {
+        "id": str(item_id) if item_id is not None else f"item-{index}",
+        "blueprint": blueprint,
+        "scenario": scenario
+    }
+
+
+def _summarize(item: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the output record for one finished item."""
+    return {
+        "id": item["id"],
+        "execution_id": result.get("execution_id"),
+        "success": result.get("success", False),
+        "status": result.get("status"),
+        "retry_count": result.get("retry_count", 0),
+        "duration_seconds": result.get("duration_seconds"),
+        "final_output": result.get("final_output"),
+        "error": result.get("error")
+    }
+
+
+def _invalid(item: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+    """Build the output record for an item whose blueprint failed to parse."""
+    return {
+        "id": item["id"],
+        "execution_id": None,
+        "success": False,
+        "status": "invalid",
+        "retry_count": 0,
+        "duration_seconds": 0.0,
+        "final_output": None,
+        "error": f"Invalid blueprint: {error}"
+    }
+
+
+def _errored(item: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+    """Build the output record for an item that raised while parsing or executing."""
+    logger.error(f"Batch item {item['id']} failed: {type(error).__name__}: {error}")
+    return {
+        "id": item["id"],
+        "execution_id": None,
+        "success": False,
+        "status": "error",
+        "retry_count": 0,
+        "duration_seconds": 0.0,
+        "final_output": None,
+        "error": f"{type(error).__name__}: {error}"
+    }
+
+
+def run_item(item: Dict[str, Any], parser: Optional[BlueprintParser] = None) -> Dict[str, Any]:
+    """
+    Parse and execute one normalized item.
+
+    Args:
+        item: Item from normalize_item
+        parser: Optional blueprint parser to reuse
+
+    Returns:
+        Output record for the item; errors are reported in the record, never raised
+    """
+    parser = parser or BlueprintParser()
+    try:
+        workflow = parser.parse(item["blueprint"], item["scenario"])
+    except ValueError as e:
+        return _invalid(item, e)
+    except Exception as e:
+        return _errored(item, e)
+
+    try:
+        return _summarize(item, execute_workflow(workflow, item["blueprint"]))
+    except Exception as e:
+        return _errored(item, e)
+
+
+async def arun_item(item: Dict[str, Any], parser: Optional[BlueprintParser] = None) -> Dict[str, Any]:
+    """
+    Async variant of run_item.
+
+    Args:
+        item: Item from normalize_item
+        parser: Optional blueprint parser to reuse
+
+    Returns:
+        Output record for the item; errors are reported in the record, never raised
+    """
+    parser = parser or BlueprintParser()
+    try:
+        workflow = await parser.aparse(item["blueprint"], item["scenario"])
+    except ValueError as e:
+        return _invalid(item, e)
+    except Exception as e:
+        return _errored(item, e)
+
+    try:
+        return _summarize(item, await execute_workflow_async(workflow, item["blueprint"]))
+    except Exception as e:
+        return _errored(item, e)
+
+
+def iter_batch(items: Iterable[Dict[str, Any]], concurrency: int = 4) -> Iterator[Dict[str, Any]]:
+    """
+    Execute normalized items on a thread pool, yielding records as they finish.
+
+    Input is consumed lazily with at most `concurrency` runs in flight, so
+    arbitrarily long inputs stream in constant memory.
+
+    Args:
+        items: Normalized items
+        concurrency: Maximum concurrent runs
+
+    Yields:
+        Output records in completion order
+    """
+    concurrency = max(1, concurrency)
+    parser = BlueprintParser()
+    items = iter(items)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch") as executor:
+        pending = set()
+        for item in items:
+            pending.add(executor.submit(run_item, item, parser))
+            if len(pending) >= concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+async def aiter_batch(items: Iterable[Dict[str, Any]], concurrency: int = 4) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Async variant of iter_batch using the async execution path.
+
+    Args:
+        items: Normalized items
+        concurrency: Maximum concurrent runs
+
+    Yields:
+        Output records in completion order
+    """
+    concurrency = max(1, concurrency)
+    parser = BlueprintParser()
+
+    pending = set()
+    for item in items:
+        pending.add(asyncio.ensure_future(arun_item(item, parser)))
+        if len(pending) >= concurrency:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            yield task.result()
+
+
+def execute_workflows_batch(blueprints: Iterable[BatchInput], concurrency: int = 4) -> List[Dict[str, Any]]:
+    """
+    Execute many blueprints with bounded parallelism.
+
+    Args:
+        blueprints: Blueprint objects/strings or {"id", "blueprint", "scenario"} wrappers
+        concurrency: Maximum concurrent runs
+
+    Returns:
+        Output records in input order
+    """
+    items = [normalize_item(raw, i) for i, raw in enumerate(blueprints)]
+    order = {item["id"]: i for i, item in enumerate(items)}
+    records = list(iter_batch(items, concurrency))
+    return sorted(records, key=lambda record: order[record["id"]])
+
+
+async def aexecute_workflows_batch(
+    blueprints: Iterable[BatchInput],
+    concurrency: int = 4
+) -> List[Dict[str, Any]]:
+    """
+    Async variant of execute_workflows_batch.
+
+    Args:
+        blueprints: Blueprint objects/strings or {"id", "blueprint", "scenario"} wrappers
+        concurrency: Maximum concurrent runs
+
+    Returns:
+        Output records in input order
+    """
+    items = [normalize_item(raw, i) for i, raw in enumerate(blueprints)]
+    order = {item["id"]: i for i, item in enumerate(items)}
+    records = [record async for record in aiter_batch(items, concurrency)]
+    return sorted(records, key=lambda record: order[record["id"]])
+
+
+def read_items(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream normalized items from a JSONL file, skipping blank lines.
+
+    Args:
+        path: Input JSONL path ("-" for stdin)
+
+    Yields:
+        Normalized items
+    """
+    handle = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for index, line in enumerate(handle):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                raw = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{index + 1}: invalid JSON: {e}")
+            yield normalize_item(raw, index)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def completed_ids(path: str) -> Set[str]:
+    """
+    Read ids already written to an output file.
+
+    A torn last line from a crash is ignored, so that item runs again.
+
+    Args:
+        path: Output JSONL path
+
+    Returns:
+        Set of finished item ids
+    """
+    done: Set[str] = set()
+    if not os.path.exists(path):
+        return done
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["id"])
+            except (ValueError, KeyError):
+                continue
+    return done
+
+
+def _open_output(path: str):
+    """Open the output for appending, terminating a torn last line first."""
+    needs_newline = False
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+
+    handle = open(path, "a", encoding="utf-8")
+    if needs_newline:
+        handle.write("\n")
+    return handle
+
+
+def run_batch_file(input_path: str, output_path: str, concurrency: int = 4) -> Dict[str, Any]:
+    """
+    Execute a JSONL batch, appending results incrementally and resuming.
+
+    Args:
+        input_path: Input JSONL path ("-" for stdin)
+        output_path: Output JSONL path
+        concurrency: Maximum concurrent runs
+
+    Returns:
+        Throughput report
+    """
+    done = completed_ids(output_path)
+    skipped = 0
+
+    def pending_items():
+        nonlocal skipped
+        for item in read_items(input_path):
+            if item["id"] in done:
+                skipped += 1
+                continue
+            yield item
+
+    usage = get_usage_counter()
+    tokens_before = usage.snapshot()["total_tokens"]
+    start = time.time()
+    runs = succeeded = 0
+
+    with _open_output(output_path) as out:
+        for record in iter_batch(pending_items(), concurrency):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            runs += 1
+            succeeded += 1 if record["success"] else 0
+            logger.info(f"[{runs}] {record['id']}: {record['status']}")
+
+    elapsed = time.time() - start
+    tokens = usage.snapshot()["total_tokens"] - tokens_before
+
+    return {
+        "runs": runs,
+        "succeeded": succeeded,
+        "failed": runs - succeeded,
+        "skipped": skipped,
+        "elapsed_seconds": elapsed,
+        "runs_per_second": runs / elapsed if elapsed > 0 else 0.0,
+        "tokens": tokens,
+        "tokens_per_second": tokens / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    CLI entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Exit code (1 if any run failed)
+    """
+    parser = argparse.ArgumentParser(description="Execute a JSONL file of blueprints.")
+    parser.add_argument("input", help="Input JSONL file ('-' for stdin)")
+    parser.add_argument("-o", "--output", required=True, help="Output JSONL file (appended; used to resume)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Maximum concurrent runs")
+    args = parser.parse_args(argv)
+
+    report = run_batch_file(args.input, args.output, args.concurrency)
+
+    print(
+        f"{report['runs']} runs ({report['succeeded']} succeeded, {report['failed']} failed, "
+        f"{report['skipped']} already done) in {report['elapsed_seconds']:.1f}s: "
+        f"{report['runs_per_second']:.2f} runs/s, {report['tokens_per_second']:.0f} tokens/s",
+        file=sys.stderr
+    )
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
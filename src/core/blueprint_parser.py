@@ -70,6 +70,29 @@ class BlueprintParser:
         logger.info(f"Parsed workflow: {workflow.name} with {len(workflow.steps)} steps")
         return workflow
 
+    async def aparse(self, raw_input: str, scenario: str = None) -> Workflow:
+        """
+        Async variant of parse; natural language parsing awaits the LLM.
+
+        Args:
+            raw_input: JSON string or natural language description
+            scenario: Optional scenario hint (due_diligence, recruiting)
+
+        Returns:
+            Standardized Workflow object
+
+        Raises:
+            ValueError: If blueprint cannot be parsed
+        """
+        try:
+            data = json.loads(raw_input)
+            return self._parse_json(data)
+        except json.JSONDecodeError:
+            logger.info("JSON parsing failed, attempting natural language parsing")
+            prompt = self._build_natural_language_prompt(raw_input, scenario)
+            response = await self.llm.agenerate(prompt, json_mode=True)
+            return self._parse_natural_language_response(response, scenario)
+
     def _parse_natural_language(self, text: str, scenario: str) -> Workflow:
         """
         Parse natural language request into Workflow using LLM.
@@ -81,7 +104,13 @@ class BlueprintParser:
         Returns:
             Workflow object
         """
-        prompt = f"""Parse this workflow request into a structured format:
+        prompt = self._build_natural_language_prompt(text, scenario)
+        response = self.llm.generate(prompt, json_mode=True)
+        return self._parse_natural_language_response(response, scenario)
+
+    def _build_natural_language_prompt(self, text: str, scenario: str) -> str:
+        """Build the LLM prompt for natural language parsing."""
+        return f"""Parse this workflow request into a structured format:
 
 Request: {text}
 Scenario hint: {scenario}
@@ -94,7 +123,8 @@ Output a JSON with:
 
 Output ONLY valid JSON, no explanation."""
 
-        response = self.llm.generate(prompt, json_mode=True)
+    def _parse_natural_language_response(self, response: str, scenario: str) -> Workflow:
+        """Build Workflow from the LLM's JSON response."""
         data = json.loads(response)
 
         # Ensure workflow_name is set
@@ -0,0 +1,104 @@
+"""Content-addressed, optionally compressed blueprint storage.
+
+Execution history references blueprints by the SHA-256 of their text, so a
+blueprint replayed thousands of times is stored once. Content is encoded
+with zstd (when the zstandard package is installed), zlib, or left as is
+for small texts where compression does not pay.
+"""
+import hashlib
+import os
+import zlib
+from typing import Tuple
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+CODECS = ("zstd", "zlib", "none")
+
+# Below this size the codec header outweighs the savings
+MIN_COMPRESS_BYTES = 256
+
+
+def blueprint_hash(text: str) -> str:
+    """
+    Content hash of a blueprint.
+
+    Args:
+        text: Raw blueprint text
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def default_codec() -> str:
+    """
+    Codec configured by MEMORY_BLUEPRINT_CODEC, falling back to zlib if zstd is unavailable.
+
+    Returns:
+        One of CODECS
+    """
+    codec = os.getenv("MEMORY_BLUEPRINT_CODEC", "zstd" if ZSTD_AVAILABLE else "zlib")
+    if codec not in CODECS:
+        raise ValueError(f"Unknown blueprint codec {codec!r}, expected one of {CODECS}")
+    if codec == "zstd" and not ZSTD_AVAILABLE:
+        logger.warning("zstandard is not installed; storing blueprints with zlib")
+        return "zlib"
+    return codec
+
+
+def encode_blueprint(text: str, codec: str = None) -> Tuple[str, bytes]:
+    """
+    Encode a blueprint for storage.
+
+    Args:
+        text: Raw blueprint text
+        codec: One of CODECS (defaults to default_codec())
+
+    Returns:
+        Tuple of (encoding actually used, stored bytes)
+    """
+    raw = text.encode("utf-8")
+    codec = codec or default_codec()
+
+    if codec == "none" or len(raw) < MIN_COMPRESS_BYTES:
+        return "none", raw
+    if codec == "zstd":
+        return "zstd", zstandard.ZstdCompressor(level=3).compress(raw)
+    return "zlib", zlib.compress(raw, 6)
+
+
+def decode_blueprint(encoding: str, content: bytes) -> str:
+    """
+    Decode stored blueprint bytes.
+
+    Args:
+        encoding: Encoding recorded with the content
+        content: Stored bytes
+
+    Returns:
+        Raw blueprint text
+
+    Raises:
+        RuntimeError: If the content is zstd-encoded and zstandard is not installed
+        ValueError: If the encoding is unknown
+    """
+    if encoding == "none":
+        raw = content
+    elif encoding == "zlib":
+        raw = zlib.decompress(content)
+    elif encoding == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("Blueprint is zstd-compressed but zstandard is not installed")
+        raw = zstandard.ZstdDecompressor().decompress(content)
+    else:
+        raise ValueError(f"Unknown blueprint encoding {encoding!r}")
+    return bytes(raw).decode("utf-8")
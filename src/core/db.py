@@ -0,0 +1,180 @@
+"""Per-process SQLite connection pool tuned for concurrent writers."""
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class ConnectionPool:
+    """
+    One long-lived connection per thread for a database file.
+
+    Connections are opened in autocommit mode with WAL journaling (readers
+    never block the writer), synchronous=NORMAL (fsync at checkpoints, not
+    every commit), a busy timeout (writers queue instead of failing with
+    "database is locked"), and a statement cache so repeated SQL is
+    prepared once per connection.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        busy_timeout_ms: int = 5000,
+        cached_statements: int = 128
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            db_path: Path to SQLite database
+            busy_timeout_ms: How long a writer waits for the lock
+            cached_statements: Prepared statements kept per connection
+        """
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[Tuple["weakref.ref", sqlite3.Connection]] = []
+        self._pid = os.getpid()
+        self.opened = 0
+
+    def _open(self) -> sqlite3.Connection:
+        """Open and configure a new connection."""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            isolation_level=None,
+            cached_statements=self.cached_statements,
+            # Each connection is only used by the thread that opened it;
+            # this lets close_all() close them from any thread
+            check_same_thread=False
+        )
+        # Takes effect on new files only; lets retention return freed pages to the OS
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        Get the calling thread's connection, opening it on first use.
+
+        Returns:
+            Autocommit connection owned by this thread
+        """
+        if os.getpid() != self._pid:
+            # Connections must not cross a fork
+            self._reset_after_fork()
+
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        conn = self._open()
+        self._local.conn = conn
+        with self._lock:
+            self.opened += 1
+            self._prune()
+            self._connections.append((weakref.ref(threading.current_thread()), conn))
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run statements in one write transaction.
+
+        BEGIN IMMEDIATE takes the write lock up front, so read-then-write
+        sequences wait on busy_timeout instead of failing on lock upgrade.
+
+        Yields:
+            Connection inside the transaction
+        """
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _prune(self):
+        """Close connections whose threads have exited. Caller holds the lock."""
+        alive = []
+        for thread_ref, conn in self._connections:
+            thread = thread_ref()
+            if thread is None or not thread.is_alive():
+                conn.close()
+            else:
+                alive.append((thread_ref, conn))
+        self._connections = alive
+
+    def _reset_after_fork(self):
+        """Forget connections inherited from the parent process."""
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._pid = os.getpid()
+
+    def close_all(self):
+        """Close every pooled connection."""
+        with self._lock:
+            for _, conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with open and total-opened connection counts
+        """
+        with self._lock:
+            return {"open": len(self._connections), "opened": self.opened}
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_path: str) -> ConnectionPool:
+    """
+    Get the process-wide pool for a database file.
+
+    Args:
+        db_path: Path to SQLite database
+
+    Returns:
+        Shared ConnectionPool for that file
+    """
+    key = os.path.abspath(db_path)
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(
+                db_path,
+                busy_timeout_ms=int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+            )
+            _pools[key] = pool
+        return pool
+
+
+def close_connection_pools():
+    """Close all pooled connections in this process."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close_all()
+        _pools.clear()
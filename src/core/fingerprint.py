@@ -0,0 +1,216 @@
+"""Fingerprint failure reasons so similar failures share one pattern.
+
+A failure is reduced to a label (volatile tokens such as numbers, ids,
+timestamps and quoted text replaced by placeholders), its lowercase key,
+and a MinHash signature over the key's word unigrams and bigrams.
+Identical keys match exactly; otherwise two failures are the same pattern when their estimated
+Jaccard similarity is at least SIMILARITY_THRESHOLD.
+
+Candidates come from LSH: the signature is cut into BANDS bands of ROWS
+values and each band is hashed to one integer. Similar failures collide in
+at least one band with high probability (about 98% at similarity 0.8,
+under 7% at 0.3), so lookups are a few indexed probes instead of a
+comparison against every stored pattern.
+"""
+import hashlib
+import re
+import struct
+from typing import Iterable, List, Optional, Tuple
+from pydantic import BaseModel
+
+NUM_PERMUTATIONS = 32
+BANDS = 8
+ROWS = NUM_PERMUTATIONS // BANDS
+SIMILARITY_THRESHOLD = 0.6
+MAX_LABEL_LENGTH = 300
+UNKNOWN_LABEL = "Unknown failure"
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# Fixed, so signatures stored in the database stay comparable across processes
+_PERMUTATIONS = [
+    (
+        int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % (_PRIME - 1) + 1,
+        int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % _PRIME
+    )
+    for i in range(NUM_PERMUTATIONS)
+]
+
+_VOLATILE = [
+    (r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", "<id>"),
+    (r"\d{4}-\d{2}-\d{2}[t ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?", "<time>"),
+    (r"\b(0x)?[0-9a-f]*\d[0-9a-f]*[a-f][0-9a-f]*\b|\b(0x)?[0-9a-f]*[a-f][0-9a-f]*\d[0-9a-f]*\b", "<id>"),
+    (r"\"[^\"]*\"|“[^”]*”|'[^'\s][^']*'", "<str>"),
+    (r"\d+(\.\d+)?", "<n>"),
+]
+_VOLATILE = [(re.compile(pattern, re.IGNORECASE), placeholder) for pattern, placeholder in _VOLATILE]
+_NOISE = re.compile(r"[^\w<>:;,.()/ -]+")
+_SPACE = re.compile(r"\s+")
+_TOKEN = re.compile(r"<\w+>|\w+")
+
+
+class FailureFingerprint(BaseModel):
+    """Normalized identity of a failure."""
+    label: str
+    key: str
+    signature: List[int]
+
+    def signature_bytes(self) -> bytes:
+        """Pack the signature for storage."""
+        return pack_signature(self.signature)
+
+    def band_keys(self) -> List[Tuple[int, int]]:
+        """(band, band hash) pairs for the LSH index."""
+        return band_keys(self.signature)
+
+
+def scrub(text: str) -> str:
+    """
+    Replace volatile tokens with placeholders, keeping case.
+
+    Idempotent: scrubbing a scrubbed string returns it unchanged.
+
+    Args:
+        text: Raw failure text
+
+    Returns:
+        Scrubbed text
+    """
+    for pattern, placeholder in _VOLATILE:
+        text = pattern.sub(placeholder, text)
+    text = _NOISE.sub(" ", text)
+    return _SPACE.sub(" ", text).strip(" -:;,.")
+
+
+def normalize(text: str) -> str:
+    """
+    Scrub and lowercase text into a matching key.
+
+    Args:
+        text: Raw failure text
+
+    Returns:
+        Normalized text
+    """
+    return scrub(text).lower()
+
+
+def check_ids(failed_checks: Iterable[str]) -> List[str]:
+    """
+    Scrub failed check descriptions, de-duplicated by key and sorted.
+
+    Args:
+        failed_checks: Check descriptions from validation
+
+    Returns:
+        Scrubbed check descriptions
+    """
+    checks = {}
+    for check in failed_checks:
+        label = scrub(check or "")
+        if label:
+            checks.setdefault(label.lower(), label)
+    return [checks[key] for key in sorted(checks)]
+
+
+def minhash(text: str) -> List[int]:
+    """
+    MinHash signature over word unigrams and bigrams.
+
+    Args:
+        text: Normalized text
+
+    Returns:
+        NUM_PERMUTATIONS 32-bit minimums
+    """
+    tokens = _TOKEN.findall(text)
+    features = set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+    if not features:
+        return [_MAX_HASH] * NUM_PERMUTATIONS
+
+    hashes = [
+        int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for feature in features
+    ]
+    return [
+        min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def similarity(a: List[int], b: List[int]) -> float:
+    """
+    Estimate Jaccard similarity from two signatures.
+
+    Args:
+        a: First signature
+        b: Second signature
+
+    Returns:
+        Fraction of matching positions
+    """
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERMUTATIONS
+
+
+def band_keys(signature: List[int]) -> List[Tuple[int, int]]:
+    """
+    Hash each band of a signature for the LSH index.
+
+    Args:
+        signature: MinHash signature
+
+    Returns:
+        One (band, signed 63-bit hash) pair per band
+    """
+    keys = []
+    for band in range(BANDS):
+        rows = pack_signature(signature[band * ROWS:(band + 1) * ROWS])
+        digest = hashlib.blake2b(rows, digest_size=8).digest()
+        keys.append((band, int.from_bytes(digest, "big") >> 1))
+    return keys
+
+
+def pack_signature(signature: List[int]) -> bytes:
+    """Pack signature values as big-endian uint32s."""
+    return struct.pack(f">{len(signature)}I", *signature)
+
+
+def unpack_signature(data: bytes) -> List[int]:
+    """Inverse of pack_signature."""
+    return list(struct.unpack(f">{len(data) // 4}I", data))
+
+
+def fingerprint_failure(
+    error_message: Optional[str] = None,
+    error_type: Optional[str] = None,
+    failed_checks: Optional[Iterable[str]] = None
+) -> FailureFingerprint:
+    """
+    Fingerprint a failure.
+
+    Failed check ids are preferred over the free-text message, since the
+    message embeds volatile QA feedback.
+
+    Args:
+        error_message: Error message or QA feedback
+        error_type: Error type (exception name or "validation_failed")
+        failed_checks: Failed check descriptions
+
+    Returns:
+        FailureFingerprint with label and MinHash signature
+    """
+    checks = check_ids(failed_checks or [])
+    if checks:
+        label = "; ".join(checks)
+    elif error_message and scrub(error_message):
+        label = scrub(error_message)
+        if error_type and error_type != "validation_failed":
+            label = f"{scrub(error_type)}: {label}"
+    elif error_type and scrub(error_type):
+        label = scrub(error_type)
+    else:
+        label = UNKNOWN_LABEL
+
+    label = label[:MAX_LABEL_LENGTH].rstrip(" -:;,.")
+    key = label.lower()
+    return FailureFingerprint(label=label, key=key, signature=minhash(key))
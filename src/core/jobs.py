@@ -0,0 +1,283 @@
+"""Background job queue executing workflows on a bounded worker pool."""
+import itertools
+import os
+import queue
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from src.core.memory import MemoryManager, default_db_path
+from src.core.schemas import Workflow
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when a run is submitted to a queue at its depth limit."""
+
+
+class JobQueue:
+    """
+    Priority queue of workflow runs served by worker threads.
+
+    Submission returns a run ID immediately; workers execute runs in
+    priority order (higher first, FIFO within a priority). Status and
+    results are persisted in the runs table next to execution_history, so
+    they can be polled by ID from any process sharing the database.
+
+    Each run records the queue that owns it. While its workers are up, a
+    queue heartbeats in the job_owners table and marks unfinished runs of
+    queues that stopped heartbeating (crashed or killed processes) as
+    errored, since nothing else would ever finish them.
+    """
+
+    def __init__(
+        self,
+        runner: Optional[Callable[..., Dict[str, Any]]] = None,
+        workers: int = 4,
+        max_depth: int = 100,
+        db_path: Optional[str] = None,
+        heartbeat_seconds: float = 10.0
+    ):
+        """
+        Initialize job queue.
+
+        Args:
+            runner: Function executing a run as runner(workflow, blueprint_raw, execution_id=...)
+                (defaults to execute_workflow)
+            workers: Number of worker threads
+            max_depth: Maximum queued (not yet running) runs before rejecting
+            db_path: Path to SQLite database for run status (defaults to EXECUTION_DB_PATH)
+            heartbeat_seconds: Interval between heartbeats; owners silent for three
+                intervals are considered gone
+        """
+        if runner is None:
+            from src.graph.builder import execute_workflow
+            runner = execute_workflow
+
+        self.runner = runner
+        self.workers = max(1, workers)
+        self.max_depth = max(1, max_depth)
+        self.memory = MemoryManager(db_path or default_db_path())
+        self.heartbeat_seconds = heartbeat_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._heartbeat_stop = threading.Event()
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue(maxsize=self.max_depth)
+        self._sequence = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._running = 0
+        self._stopping = False
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.interrupted = 0
+
+    def _ensure_workers(self):
+        """Start worker threads and the heartbeat on first use. Caller holds the lock."""
+        if self._threads:
+            return
+        # Registered before any run is created, so no sweep can mistake our runs for orphans
+        self.interrupted += self._beat()
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Started {self.workers} job workers (queue depth {self.max_depth})")
+
+    def submit(self, workflow: Workflow, blueprint_raw: str = "", priority: int = 0) -> str:
+        """
+        Queue a workflow run.
+
+        Args:
+            workflow: Workflow to execute
+            blueprint_raw: Raw blueprint string
+            priority: Higher runs sooner
+
+        Returns:
+            Run ID (used as the execution ID)
+
+        Raises:
+            QueueFullError: If the queue is at max_depth or shutting down
+        """
+        run_id = str(uuid.uuid4())
+
+        with self._lock:
+            if self._stopping:
+                raise QueueFullError("Job queue is shutting down")
+            self._ensure_workers()
+            # Negate priority: PriorityQueue pops the smallest entry first
+            item = (-priority, next(self._sequence), run_id, workflow, blueprint_raw)
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                self.rejected += 1
+                raise QueueFullError(f"Job queue is full ({self.max_depth} runs queued)")
+            self.submitted += 1
+            # Record before a worker can pick the run up
+            self.memory.create_run(run_id, workflow.name, priority, owner=self.owner)
+
+        logger.info(f"Queued run {run_id} for {workflow.name} (priority {priority})")
+        return run_id
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a run's status and result.
+
+        Args:
+            run_id: Run ID from submit
+
+        Returns:
+            Run dictionary, or None if unknown
+        """
+        return self.memory.get_run(run_id)
+
+    def _work(self):
+        """Worker loop: execute queued runs until shutdown."""
+        while True:
+            item = self._queue.get()
+            if item[2] is None:
+                self._queue.task_done()
+                return
+
+            _, _, run_id, workflow, blueprint_raw = item
+            with self._lock:
+                self._running += 1
+
+            try:
+                self.memory.start_run(run_id)
+                result = self.runner(workflow, blueprint_raw, execution_id=run_id)
+                status = result.get("status") or ("completed" if result.get("success") else "failed")
+                self.memory.finish_run(run_id, status, result=result, error=result.get("error"))
+                with self._lock:
+                    if result.get("success"):
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+
+            except Exception as e:
+                logger.error(f"Run {run_id} raised: {e}")
+                with self._lock:
+                    self.failed += 1
+                try:
+                    self.memory.finish_run(run_id, "error", error=str(e))
+                except Exception as record_error:
+                    logger.error(f"Could not record failure of run {run_id}: {record_error}")
+
+            finally:
+                with self._lock:
+                    self._running -= 1
+                self._queue.task_done()
+
+    def _beat(self) -> int:
+        """Heartbeat and fail runs of owners that stopped heartbeating; returns runs failed."""
+        self.memory.heartbeat_owner(self.owner)
+        interrupted = self.memory.fail_orphaned_runs(
+            datetime.now() - timedelta(seconds=3 * self.heartbeat_seconds),
+            "Interrupted: the job queue that accepted the run stopped before it finished"
+        )
+        if interrupted:
+            logger.warning(f"Marked {interrupted} runs of stopped job queues as errored")
+        return interrupted
+
+    def _heartbeat(self):
+        """Heartbeat loop: runs until the queue has drained and shut down."""
+        while not self._heartbeat_stop.wait(self.heartbeat_seconds):
+            try:
+                interrupted = self._beat()
+            except Exception as e:
+                logger.error(f"Job queue heartbeat failed: {e}")
+                continue
+            with self._lock:
+                self.interrupted += interrupted
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue statistics.
+
+        Returns:
+            Dictionary with queue depth, active runs and outcome counters
+        """
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_depth": self.max_depth,
+                "queued": self._queue.qsize(),
+                "running": self._running,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "completed": self.completed,
+                "failed": self.failed,
+                "interrupted": self.interrupted
+            }
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop accepting runs and stop workers once queued runs finish.
+
+        Args:
+            wait: Whether to block until workers exit
+        """
+        with self._lock:
+            if self._stopping:
+                return
+            self._stopping = True
+            threads = list(self._threads)
+
+        # Sentinels sort after every real run, so queued work drains first
+        for _ in threads:
+            self._queue.put((float("inf"), next(self._sequence), None, None, None))
+
+        if wait:
+            for thread in threads:
+                thread.join()
+            # Keep heartbeating until every run has finished, or other processes would fail them
+            if self._heartbeat_thread is not None:
+                self._heartbeat_stop.set()
+                self._heartbeat_thread.join()
+                self.memory.remove_owner(self.owner)
+        logger.info("Job queue shut down")
+
+
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Get the process-wide job queue configured by JOB_WORKERS / JOB_QUEUE_DEPTH /
+    JOB_HEARTBEAT_SECONDS.
+
+    Returns:
+        Shared JobQueue
+    """
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                _job_queue = JobQueue(
+                    workers=int(os.getenv("JOB_WORKERS", "4")),
+                    max_depth=int(os.getenv("JOB_QUEUE_DEPTH", "100")),
+                    heartbeat_seconds=float(os.getenv("JOB_HEARTBEAT_SECONDS", "10"))
+                )
+    return _job_queue
+
+
+def reset_job_queue(wait: bool = True):
+    """
+    Shut down the process-wide job queue so the next lookup re-reads configuration.
+
+    Args:
+        wait: Whether to block until queued runs finish
+    """
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is not None:
+            _job_queue.shutdown(wait=wait)
+        _job_queue = None
@@ -0,0 +1,242 @@
+"""Maintenance commands for the execution history database.
+
+Usage:
+    python -m src.core.maintenance check [--db execution_history.db]
+    python -m src.core.maintenance rebuild [--db execution_history.db]
+
+`check` compares workflow_aggregates and the all-time distribution sketches
+with totals recomputed from execution_history plus the daily rollups of
+archived executions, and exits non-zero on any mismatch; `rebuild`
+recomputes both from scratch.
+"""
+import argparse
+import math
+import sqlite3
+import sys
+from typing import Any, Dict, List, Optional
+from src.core.memory import default_db_path
+from src.core.migrations import migrate
+from src.core.sketch import ALL_TIME, DAY_KEY_LENGTH, sketch_counts
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+AGGREGATE_COLUMNS = ("total_executions", "successful", "duration_sum", "duration_sq_sum", "retry_sum")
+
+_RECOMPUTE_SQL = """
+    SELECT workflow_name, SUM(total), SUM(successful), TOTAL(duration_sum), TOTAL(duration_sq_sum), SUM(retry_sum)
+    FROM (
+        SELECT
+            workflow_name,
+            COUNT(*) AS total,
+            SUM(CASE WHEN success THEN 1 ELSE 0 END) AS successful,
+            TOTAL(duration_seconds) AS duration_sum,
+            TOTAL(duration_seconds * duration_seconds) AS duration_sq_sum,
+            TOTAL(retry_count) AS retry_sum
+        FROM execution_history
+        WHERE workflow_name IS NOT NULL
+        GROUP BY workflow_name
+        UNION ALL
+        SELECT workflow_name, total_executions, successful, duration_sum, duration_sq_sum, retry_sum
+        FROM workflow_daily_rollups
+    )
+    GROUP BY workflow_name
+"""
+
+
+def rebuild_aggregates(conn: sqlite3.Connection) -> int:
+    """
+    Recompute workflow_aggregates from execution_history and daily rollups.
+
+    Args:
+        conn: Autocommit (isolation_level=None) database connection
+
+    Returns:
+        Number of workflows rebuilt
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM workflow_aggregates")
+        conn.execute(f"""
+            INSERT INTO workflow_aggregates (workflow_name, {", ".join(AGGREGATE_COLUMNS)})
+            {_RECOMPUTE_SQL}
+        """)
+        count = conn.execute("SELECT COUNT(*) FROM workflow_aggregates").fetchone()[0]
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+    logger.info(f"Rebuilt aggregates for {count} workflows")
+    return count
+
+
+def check_aggregates(conn: sqlite3.Connection, rel_tol: float = 1e-6) -> List[Dict[str, Any]]:
+    """
+    Compare maintained aggregates with a full recomputation.
+
+    Both reads run in one transaction so concurrent writers cannot cause
+    false mismatches.
+
+    Args:
+        conn: Autocommit (isolation_level=None) database connection
+        rel_tol: Relative tolerance for the floating-point sums
+
+    Returns:
+        One {"workflow_name", "column", "expected", "actual"} entry per mismatch
+    """
+    conn.execute("BEGIN")
+    try:
+        expected = {row[0]: row[1:] for row in conn.execute(_RECOMPUTE_SQL)}
+        actual = {
+            row[0]: row[1:]
+            for row in conn.execute(
+                f"SELECT workflow_name, {', '.join(AGGREGATE_COLUMNS)} FROM workflow_aggregates"
+            )
+        }
+    finally:
+        conn.execute("COMMIT")
+
+    missing = (0,) * len(AGGREGATE_COLUMNS)
+    mismatches = []
+    for workflow_name in sorted(set(expected) | set(actual)):
+        want = expected.get(workflow_name, missing)
+        have = actual.get(workflow_name, missing)
+        for column, want_value, have_value in zip(AGGREGATE_COLUMNS, want, have):
+            if not math.isclose(want_value, have_value, rel_tol=rel_tol, abs_tol=1e-9):
+                mismatches.append({
+                    "workflow_name": workflow_name,
+                    "column": column,
+                    "expected": want_value,
+                    "actual": have_value
+                })
+    return mismatches
+
+
+def rebuild_sketches(conn: sqlite3.Connection) -> int:
+    """
+    Recompute duration sketches and retry histograms from execution_history.
+
+    Hourly rows for hours no longer in history are dropped as well. Daily
+    rows of archived executions cannot be recomputed; they are kept and
+    counted into the all-time rows.
+
+    Args:
+        conn: Autocommit (isolation_level=None) database connection
+
+    Returns:
+        Number of duration sketch rows written
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        durations, retries = sketch_counts(conn.execute(
+            "SELECT workflow_name, timestamp, duration_seconds, retry_count "
+            "FROM execution_history WHERE workflow_name IS NOT NULL"
+        ))
+        for table, counts in (("workflow_duration_sketch", durations), ("workflow_retry_histogram", retries)):
+            for workflow_name, _, value, count in conn.execute(
+                f"SELECT * FROM {table} WHERE length(hour) = ?", (DAY_KEY_LENGTH,)
+            ).fetchall():
+                counts[(workflow_name, ALL_TIME, value)] += count
+            conn.execute(f"DELETE FROM {table} WHERE length(hour) != ?", (DAY_KEY_LENGTH,))
+        conn.executemany(
+            "INSERT INTO workflow_duration_sketch VALUES (?, ?, ?, ?)",
+            [(*key, count) for key, count in durations.items()]
+        )
+        conn.executemany(
+            "INSERT INTO workflow_retry_histogram VALUES (?, ?, ?, ?)",
+            [(*key, count) for key, count in retries.items()]
+        )
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+    logger.info(f"Rebuilt {len(durations)} duration sketch rows")
+    return len(durations)
+
+
+def check_sketches(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """
+    Compare all-time sketch sample counts with history and rollup row counts.
+
+    Args:
+        conn: Autocommit (isolation_level=None) database connection
+
+    Returns:
+        One {"workflow_name", "column", "expected", "actual"} entry per mismatch
+    """
+    conn.execute("BEGIN")
+    try:
+        expected = dict(conn.execute("""
+            SELECT workflow_name, SUM(total) FROM (
+                SELECT workflow_name, COUNT(*) AS total FROM execution_history
+                WHERE workflow_name IS NOT NULL GROUP BY workflow_name
+                UNION ALL
+                SELECT workflow_name, total_executions FROM workflow_daily_rollups
+            )
+            GROUP BY workflow_name
+        """))
+        actual = {
+            table: dict(conn.execute(
+                f"SELECT workflow_name, SUM(count) FROM {table} WHERE hour = ? GROUP BY workflow_name",
+                (ALL_TIME,)
+            ))
+            for table in ("workflow_duration_sketch", "workflow_retry_histogram")
+        }
+    finally:
+        conn.execute("COMMIT")
+
+    mismatches = []
+    for table, counts in actual.items():
+        for workflow_name in sorted(set(expected) | set(counts)):
+            if expected.get(workflow_name, 0) != counts.get(workflow_name, 0):
+                mismatches.append({
+                    "workflow_name": workflow_name,
+                    "column": table,
+                    "expected": expected.get(workflow_name, 0),
+                    "actual": counts.get(workflow_name, 0)
+                })
+    return mismatches
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    CLI entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Exit code (1 if check found mismatches)
+    """
+    parser = argparse.ArgumentParser(description="Execution history maintenance.")
+    parser.add_argument("command", choices=["check", "rebuild"])
+    parser.add_argument(
+        "--db", default=default_db_path(), help="Path to SQLite database (defaults to EXECUTION_DB_PATH)"
+    )
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db, isolation_level=None)
+    try:
+        migrate(conn)
+        if args.command == "rebuild":
+            workflows = rebuild_aggregates(conn)
+            sketch_rows = rebuild_sketches(conn)
+            print(f"{args.db}: rebuilt aggregates for {workflows} workflows, {sketch_rows} sketch rows")
+            return 0
+
+        mismatches = check_aggregates(conn) + check_sketches(conn)
+        for mismatch in mismatches:
+            print(
+                f"{mismatch['workflow_name']}.{mismatch['column']}: "
+                f"expected {mismatch['expected']}, found {mismatch['actual']}"
+            )
+        print(f"{args.db}: {'aggregates consistent' if not mismatches else f'{len(mismatches)} mismatches'}")
+        return 1 if mismatches else 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
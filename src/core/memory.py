@@ -1,60 +1,188 @@
 """Memory manager for execution history and meta-learning."""
+import atexit
+import base64
+import binascii
+import json
+import math
+import os
+import queue
 import sqlite3
-from typing import List, Optional, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 from datetime import datetime
+from src.core.blueprint_store import blueprint_hash, decode_blueprint, default_codec, encode_blueprint
+from src.core.db import get_connection_pool
+from src.core.fingerprint import (
+    SIMILARITY_THRESHOLD, FailureFingerprint, fingerprint_failure, similarity, unpack_signature
+)
+from src.core.migrations import migrate
 from src.core.schemas import ExecutionRecord
+from src.core.search import build_match_query, make_snippet, segment
+from src.core.sketch import ALL_TIME, DurationSketch, sketch_counts, window_start
 from src.utils.logging import setup_logger
 
 logger = setup_logger(__name__)
 
+BLUEPRINT_CACHE_SIZE = 128
+
+# Queued by flush() to make the flusher commit its partial batch immediately
+_FLUSH = object()
+
+MAX_PAGE_SIZE = 500
+
+SEARCH_ORDERS = ("recent", "relevance")
+
+_HISTORY_COLUMNS = (
+    "id", "workflow_name", "success", "error_type", "error_message",
+    "retry_count", "duration_seconds", "timestamp", "blueprint_hash"
+)
+
+
+def normalize_timestamp(value: Union[datetime, str]) -> str:
+    """
+    Convert a timestamp to the naive local ISO form stored in execution_history.
+
+    Args:
+        value: datetime or ISO 8601 string (offsets and "Z" are converted to local time)
+
+    Returns:
+        ISO timestamp comparable with stored values
+
+    Raises:
+        ValueError: If the string is not ISO 8601
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value.isoformat()
+
+
+def encode_cursor(timestamp: str, execution_id: str) -> str:
+    """
+    Opaque cursor for the page after an execution.
+
+    Args:
+        timestamp: Timestamp of the last execution returned
+        execution_id: ID of the last execution returned
+
+    Returns:
+        URL-safe cursor string
+    """
+    return base64.urlsafe_b64encode(json.dumps([timestamp, execution_id]).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Inverse of encode_cursor.
+
+    Args:
+        cursor: Cursor from a previous page
+
+    Returns:
+        Tuple of (timestamp, execution ID)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        timestamp, execution_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeError, TypeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+    if not isinstance(timestamp, str) or not isinstance(execution_id, str):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return timestamp, execution_id
+
 
 class MemoryManager:
-    """Manage execution history and meta-learning."""
+    """
+    Manage execution history and meta-learning.
+
+    With write_behind enabled, record_execution only enqueues the record; a
+    background flusher commits queued records in one transaction per batch
+    (up to batch_size records, or whatever arrived within flush_interval_ms).
+    When the queue is full the record is written synchronously instead.
+    History reads may lag writes by up to one flush interval; call flush()
+    for read-your-writes.
 
-    def __init__(self, db_path: str = "execution_history.db"):
+    Learning context and execution stats are cached per workflow. Each
+    workflow has a version bumped after every committed write or clear, and
+    entries filled under an older version are ignored, so this process
+    never serves a result older than its own writes. Writes from other
+    processes become visible once the entry's TTL (cache_ttl_seconds)
+    expires.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        write_behind: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+        flush_interval_ms: Optional[float] = None,
+        queue_size: Optional[int] = None,
+        cache_ttl_seconds: Optional[float] = None,
+        cache_maxsize: int = 1024
+    ):
         """
         Initialize memory manager.
 
         Args:
-            db_path: Path to SQLite database
+            db_path: Path to SQLite database (defaults to EXECUTION_DB_PATH)
+            write_behind: Buffer execution records (defaults to MEMORY_WRITE_BEHIND)
+            batch_size: Maximum records per flush transaction (defaults to MEMORY_BATCH_SIZE)
+            flush_interval_ms: Maximum time a record waits in the buffer (defaults to MEMORY_FLUSH_MS)
+            queue_size: Buffer capacity before falling back to synchronous writes
+                (defaults to MEMORY_QUEUE_SIZE)
+            cache_ttl_seconds: Lifetime of cached reads, 0 to disable (defaults to MEMORY_CACHE_TTL)
+            cache_maxsize: Maximum cached (kind, workflow) entries
         """
-        self.db_path = db_path
+        self.db_path = db_path or default_db_path()
+        self._pool = get_connection_pool(self.db_path)
         self._init_db()
 
-    def _init_db(self):
-        """Initialize database tables."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS execution_history (
-                id TEXT PRIMARY KEY,
-                workflow_name TEXT,
-                blueprint TEXT,
-                success BOOLEAN,
-                error_type TEXT,
-                error_message TEXT,
-                retry_count INTEGER,
-                duration_seconds REAL,
-                timestamp DATETIME,
-                learned_adjustments TEXT
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS failure_patterns (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                workflow_name TEXT,
-                failure_reason TEXT,
-                frequency INTEGER DEFAULT 1,
-                last_seen DATETIME,
-                recommended_fix TEXT
-            )
-        """)
+        if write_behind is None:
+            write_behind = os.getenv("MEMORY_WRITE_BEHIND", "0") == "1"
+        if batch_size is None:
+            batch_size = int(os.getenv("MEMORY_BATCH_SIZE", "100"))
+        if flush_interval_ms is None:
+            flush_interval_ms = float(os.getenv("MEMORY_FLUSH_MS", "50"))
+        if queue_size is None:
+            queue_size = int(os.getenv("MEMORY_QUEUE_SIZE", "10000"))
+        if cache_ttl_seconds is None:
+            cache_ttl_seconds = float(os.getenv("MEMORY_CACHE_TTL", "5"))
 
-        conn.commit()
-        conn.close()
-        logger.info(f"Memory database initialized at {self.db_path}")
+        self.write_behind = write_behind
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.0, flush_interval_ms) / 1000
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, queue_size))
+        self._flusher: Optional[threading.Thread] = None
+        self._flusher_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._atexit_registered = False
+        self._lock = threading.Lock()
+        self.buffered = 0
+        self.flushed = 0
+        self.batches = 0
+        self.sync_fallbacks = 0
+        self.write_errors = 0
+
+        self.cache_ttl = max(0.0, cache_ttl_seconds)
+        self.cache_maxsize = max(1, cache_maxsize)
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[Tuple[int, int], float, Any]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._global_version = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self.blueprint_codec = default_codec()
+        self._blueprints: "OrderedDict[str, str]" = OrderedDict()
+
+    def _init_db(self):
+        """Create or upgrade database tables to the latest schema version."""
+        version = migrate(self._pool.connection())
+        logger.info(f"Memory database initialized at {self.db_path} (schema v{version})")
 
     def record_execution(self, record: ExecutionRecord):
         """
@@ -63,32 +191,374 @@ class MemoryManager:
         Args:
             record: ExecutionRecord to save
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        if not self.write_behind:
+            self._write_records([record])
+            return
 
-        cursor.execute("""
-            INSERT INTO execution_history VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            record.id,
-            record.workflow_name,
-            record.blueprint,
-            record.success,
-            record.error_type,
-            record.error_message,
-            record.retry_count,
-            record.duration_seconds,
-            record.timestamp.isoformat(),
-            record.learned_adjustments
-        ))
+        self._ensure_flusher()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            # Backpressure: pay the commit on the caller rather than drop the record
+            with self._lock:
+                self.sync_fallbacks += 1
+            self._write_records([record])
+            return
 
-        conn.commit()
-        conn.close()
+        with self._lock:
+            self.buffered += 1
 
-        if not record.success:
-            self._update_failure_patterns(record)
-            logger.warning(f"Execution failed: {record.workflow_name} - {record.error_message}")
+    def _write_records(self, records: List[ExecutionRecord]):
+        """
+        Write execution records in one transaction.
+
+        Args:
+            records: Records to insert
+        """
+        # Fingerprint outside the transaction to keep the write lock short
+        fingerprints = {
+            record.id: fingerprint_failure(record.error_message, record.error_type, record.failed_checks)
+            for record in records if not record.success
+        }
+
+        hashes = {record.id: blueprint_hash(record.blueprint) if record.blueprint else None for record in records}
+
+        searchable = {
+            record.id: (segment(record.error_message), segment(record.validation_feedback), segment(record.final_output))
+            for record in records
+            if record.error_message or record.validation_feedback or record.final_output
+        }
+
+        # History rows and failure patterns are written atomically
+        with self._pool.transaction() as conn:
+            self._store_blueprints(conn, {
+                hashes[record.id]: record.blueprint for record in records if hashes[record.id]
+            })
+            search_rowids = {
+                execution_id: conn.execute(
+                    "INSERT INTO execution_search "
+                    "(execution_id, error_message, validation_feedback, final_output) VALUES (?, ?, ?, ?)",
+                    (execution_id, *texts)
+                ).lastrowid
+                for execution_id, texts in searchable.items()
+            }
+            conn.executemany("""
+                INSERT INTO execution_history (
+                    id, workflow_name, blueprint_hash, success, error_type, error_message,
+                    retry_count, duration_seconds, timestamp, learned_adjustments,
+                    final_output, validation_feedback, search_rowid
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(
+                record.id,
+                record.workflow_name,
+                hashes[record.id],
+                record.success,
+                record.error_type,
+                record.error_message,
+                record.retry_count,
+                record.duration_seconds,
+                record.timestamp.isoformat(),
+                record.learned_adjustments,
+                record.final_output,
+                record.validation_feedback,
+                search_rowids.get(record.id)
+            ) for record in records])
+
+            for record in records:
+                if not record.success:
+                    self._update_failure_patterns(conn, record, fingerprints[record.id])
+
+            self._update_sketches(conn, records)
+
+        self._invalidate({record.workflow_name for record in records})
+
+        for record in records:
+            if not record.success:
+                logger.warning(f"Execution failed: {record.workflow_name} - {record.error_message}")
+            else:
+                logger.info(f"Execution recorded: {record.workflow_name} (success)")
+
+    def _store_blueprints(self, conn: sqlite3.Connection, blueprints: Dict[str, str]):
+        """
+        Store blueprints not yet in the blueprints table.
+
+        Repeat blueprints cost one primary-key probe; only new ones are
+        encoded and written.
+
+        Args:
+            conn: Connection inside the caller's write transaction
+            blueprints: Blueprint text by content hash
+        """
+        if not blueprints:
+            return
+
+        placeholders = ", ".join("?" * len(blueprints))
+        stored = {row[0] for row in conn.execute(
+            f"SELECT hash FROM blueprints WHERE hash IN ({placeholders})", list(blueprints)
+        )}
+        rows = []
+        for digest, text in blueprints.items():
+            if digest not in stored:
+                encoding, content = encode_blueprint(text, self.blueprint_codec)
+                rows.append((digest, encoding, content, len(text.encode("utf-8"))))
+        conn.executemany("INSERT INTO blueprints VALUES (?, ?, ?, ?)", rows)
+
+    def load_blueprint(self, digest: str) -> Optional[str]:
+        """
+        Rehydrate a blueprint from its content hash.
+
+        Content is immutable, so decoded texts are cached without expiry.
+
+        Args:
+            digest: Blueprint content hash
+
+        Returns:
+            Blueprint text, or None if unknown
+        """
+        with self._lock:
+            text = self._blueprints.get(digest)
+            if text is not None:
+                self._blueprints.move_to_end(digest)
+                return text
+
+        row = self._pool.connection().execute(
+            "SELECT encoding, content FROM blueprints WHERE hash = ?", (digest,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        text = decode_blueprint(*row)
+        with self._lock:
+            self._blueprints[digest] = text
+            while len(self._blueprints) > BLUEPRINT_CACHE_SIZE:
+                self._blueprints.popitem(last=False)
+        return text
+
+    def get_execution_blueprint(self, execution_id: str) -> Optional[str]:
+        """
+        Get the blueprint an execution ran with.
+
+        Args:
+            execution_id: Execution ID
+
+        Returns:
+            Blueprint text, or None if the execution is unknown or had none
+        """
+        row = self._pool.connection().execute(
+            "SELECT blueprint, blueprint_hash FROM execution_history WHERE id = ?", (execution_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        inline, digest = row
+        if digest:
+            return self.load_blueprint(digest)
+        return inline
+
+    def _ensure_flusher(self):
+        """Start the background flusher if it is not running."""
+        flusher = self._flusher
+        if flusher is not None and flusher.is_alive():
+            return
+
+        with self._flusher_lock:
+            if self._flusher is None or not self._flusher.is_alive():
+                self._stop.clear()
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="memory-flusher", daemon=True
+                )
+                self._flusher.start()
+                if not self._atexit_registered:
+                    atexit.register(self.close)
+                    self._atexit_registered = True
+
+    def _flush_loop(self):
+        """Commit queued records in batches until stopped and drained."""
+        while True:
+            try:
+                if self._stop.is_set():
+                    item = self._queue.get_nowait()
+                else:
+                    item = self._queue.get(timeout=self.flush_interval or 0.05)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+
+            if item is _FLUSH:
+                self._queue.task_done()
+                continue
+
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = 0.0 if self._stop.is_set() else deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = self._queue.get(timeout=remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _FLUSH:
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+
+            self._commit_batch(batch)
+
+    def _commit_batch(self, batch: List[ExecutionRecord]):
+        """
+        Write a batch taken from the queue.
+
+        If the batch transaction fails, records are retried one by one so a
+        single bad record does not lose the rest.
+
+        Args:
+            batch: Records taken from the queue
+        """
+        try:
+            self._write_records(batch)
+            written = len(batch)
+        except sqlite3.Error as e:
+            logger.error(f"Batched write of {len(batch)} records failed, retrying individually: {e}")
+            written = 0
+            for record in batch:
+                try:
+                    self._write_records([record])
+                    written += 1
+                except sqlite3.Error as record_error:
+                    logger.error(f"Dropped execution record {record.id}: {record_error}")
+                    with self._lock:
+                        self.write_errors += 1
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+        with self._lock:
+            self.batches += 1
+            self.flushed += written
+
+    def _drain(self):
+        """Synchronously write whatever is queued (no flusher running)."""
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _FLUSH:
+                    self._queue.task_done()
+                    continue
+                batch.append(item)
+            if not batch:
+                return
+            self._commit_batch(batch)
+
+    def flush(self):
+        """Block until every buffered record is committed."""
+        flusher = self._flusher
+        if flusher is not None and flusher.is_alive():
+            self._queue.put(_FLUSH)
+            self._queue.join()
         else:
-            logger.info(f"Execution recorded: {record.workflow_name} (success)")
+            self._drain()
+
+    def close(self):
+        """Flush buffered records and stop the background flusher."""
+        with self._flusher_lock:
+            flusher, self._flusher = self._flusher, None
+            if flusher is not None:
+                self._stop.set()
+                self._queue.put(_FLUSH)  # wake the flusher if it is idle
+                flusher.join()
+        # Records enqueued while the flusher was stopping
+        self._drain()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get write-behind and read cache statistics.
+
+        Returns:
+            Dictionary with buffer depth, flushed records, batches, fallbacks
+            and cache hit/miss counts
+        """
+        with self._lock:
+            batches = self.batches
+            lookups = self.cache_hits + self.cache_misses
+            return {
+                "write_behind": self.write_behind,
+                "queued": self._queue.qsize(),
+                "buffered": self.buffered,
+                "flushed": self.flushed,
+                "batches": batches,
+                "avg_batch_size": (self.flushed / batches) if batches else 0.0,
+                "sync_fallbacks": self.sync_fallbacks,
+                "write_errors": self.write_errors,
+                "cache_entries": len(self._cache),
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+                "cache_hit_rate": (self.cache_hits / lookups) if lookups else 0.0
+            }
+
+    def _version(self, workflow_name: str) -> Tuple[int, int]:
+        """Current cache version of a workflow. Caller holds the lock."""
+        return self._global_version, self._versions.get(workflow_name, 0)
+
+    def _invalidate(self, workflow_names: Optional[Set[str]] = None):
+        """
+        Invalidate cached reads after a committed write.
+
+        Args:
+            workflow_names: Workflows whose data changed, or None for all
+        """
+        with self._lock:
+            if workflow_names is None:
+                self._global_version += 1
+                self._cache.clear()
+                return
+            for workflow_name in workflow_names:
+                self._versions[workflow_name] = self._versions.get(workflow_name, 0) + 1
+            for key in [key for key in self._cache if key[1] in workflow_names]:
+                del self._cache[key]
+
+    def _cached(self, kind: str, workflow_name: str, load: Callable[[], Any]) -> Any:
+        """
+        Serve a per-workflow read from the cache, loading it on a miss.
+
+        Args:
+            kind: Read type ("learning", "stats", "distribution:<window>")
+            workflow_name: Name of the workflow
+            load: Function that queries the database
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        if self.cache_ttl <= 0:
+            return load()
+
+        key = (kind, workflow_name)
+        with self._lock:
+            version = self._version(workflow_name)
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] == version and entry[1] > time.monotonic():
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return entry[2]
+            self.cache_misses += 1
+
+        value = load()
+
+        with self._lock:
+            # A write committed while loading makes this value stale; drop it
+            if self._version(workflow_name) == version:
+                self._cache[key] = (version, time.monotonic() + self.cache_ttl, value)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_maxsize:
+                    self._cache.popitem(last=False)
+        return value
 
     def get_learning_context(self, workflow_name: str) -> str:
         """
@@ -100,20 +570,18 @@ class MemoryManager:
         Returns:
             Learning context string
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        return self._cached("learning", workflow_name, lambda: self._load_learning_context(workflow_name))
 
+    def _load_learning_context(self, workflow_name: str) -> str:
+        """Build the learning context from the database."""
         # Query recent failures
-        cursor.execute("""
+        patterns = self._pool.connection().execute("""
             SELECT failure_reason, frequency, recommended_fix
             FROM failure_patterns
             WHERE workflow_name = ?
             ORDER BY frequency DESC
             LIMIT 5
-        """, (workflow_name,))
-
-        patterns = cursor.fetchall()
-        conn.close()
+        """, (workflow_name,)).fetchall()
 
         if not patterns:
             return "No historical failures for this workflow type."
@@ -129,85 +597,474 @@ class MemoryManager:
         """
         Get execution statistics for a workflow.
 
+        Reads the incrementally maintained workflow_aggregates row, so the
+        cost does not grow with history size.
+
         Args:
             workflow_name: Name of the workflow
 
         Returns:
             Dictionary with statistics
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        return dict(self._cached("stats", workflow_name, lambda: self._load_execution_stats(workflow_name)))
 
-        cursor.execute("""
-            SELECT
-                COUNT(*) as total_executions,
-                SUM(CASE WHEN success THEN 1 ELSE 0 END) as successful,
-                AVG(duration_seconds) as avg_duration,
-                AVG(retry_count) as avg_retries
-            FROM execution_history
+    def _load_execution_stats(self, workflow_name: str) -> Dict[str, Any]:
+        """Read a workflow's aggregates row from the database."""
+        result = self._pool.connection().execute("""
+            SELECT total_executions, successful, duration_sum, duration_sq_sum, retry_sum
+            FROM workflow_aggregates
             WHERE workflow_name = ?
-        """, (workflow_name,))
+        """, (workflow_name,)).fetchone()
 
-        result = cursor.fetchone()
-        conn.close()
-
-        if not result or result[0] == 0:
+        if not result or result[0] <= 0:
             return {
                 "total_executions": 0,
                 "successful": 0,
                 "success_rate": 0.0,
                 "avg_duration": 0.0,
+                "duration_stddev": 0.0,
                 "avg_retries": 0.0
             }
 
-        total, successful, avg_duration, avg_retries = result
+        total, successful, duration_sum, duration_sq_sum, retry_sum = result
+        avg_duration = duration_sum / total
         return {
             "total_executions": total,
             "successful": successful,
-            "success_rate": (successful / total) * 100 if total > 0 else 0.0,
-            "avg_duration": avg_duration or 0.0,
-            "avg_retries": avg_retries or 0.0
+            "success_rate": (successful / total) * 100,
+            "avg_duration": avg_duration,
+            "duration_stddev": math.sqrt(max(0.0, duration_sq_sum / total - avg_duration ** 2)),
+            "avg_retries": retry_sum / total
         }
 
-    def _update_failure_patterns(self, record: ExecutionRecord):
+    def get_distribution(self, workflow_name: str, window: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get duration percentiles and the retry histogram for a workflow.
+
+        Read from the hourly sketch rows, so the cost depends on the window
+        length, not on history size.
+
+        Args:
+            workflow_name: Name of the workflow
+            window: "hour", "day" or "week" (hour granularity), or None for all time
+
+        Returns:
+            Dictionary with executions, p50/p90/p99 duration and retry histogram
+
+        Raises:
+            ValueError: If the window is unknown
+        """
+        since = window_start(window) if window else None
+        return dict(self._cached(
+            f"distribution:{window or 'all'}",
+            workflow_name,
+            lambda: self._load_distribution(workflow_name, since)
+        ))
+
+    def _load_distribution(self, workflow_name: str, since: Optional[str]) -> Dict[str, Any]:
+        """Merge sketch rows for a workflow, all time or from an hour key on."""
+        if since is None:
+            where, params = "workflow_name = ? AND hour = ?", (workflow_name, ALL_TIME)
+        else:
+            # ALL_TIME sorts before every ISO hour, so it is excluded here
+            where, params = "workflow_name = ? AND hour >= ?", (workflow_name, since)
+
+        conn = self._pool.connection()
+        sketch = DurationSketch(dict(conn.execute(
+            f"SELECT bucket, SUM(count) FROM workflow_duration_sketch WHERE {where} GROUP BY bucket",
+            params
+        ).fetchall()))
+        retries = conn.execute(
+            f"SELECT retry_count, SUM(count) FROM workflow_retry_histogram WHERE {where} "
+            "GROUP BY retry_count ORDER BY retry_count",
+            params
+        ).fetchall()
+
+        return {
+            "executions": sketch.count,
+            "p50_duration": sketch.quantile(0.5),
+            "p90_duration": sketch.quantile(0.9),
+            "p99_duration": sketch.quantile(0.99),
+            "retry_histogram": {str(retry_count): count for retry_count, count in retries}
+        }
+
+    def _update_sketches(self, conn: sqlite3.Connection, records: List[ExecutionRecord]):
+        """
+        Add records to the hourly and all-time distribution sketches.
+
+        Args:
+            conn: Connection inside the caller's write transaction
+            records: Records being inserted
+        """
+        durations, retries = sketch_counts(
+            (record.workflow_name, record.timestamp, record.duration_seconds, record.retry_count)
+            for record in records
+        )
+        conn.executemany("""
+            INSERT INTO workflow_duration_sketch (workflow_name, hour, bucket, count)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (workflow_name, hour, bucket) DO UPDATE SET count = count + excluded.count
+        """, [(*key, count) for key, count in durations.items()])
+        conn.executemany("""
+            INSERT INTO workflow_retry_histogram (workflow_name, hour, retry_count, count)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (workflow_name, hour, retry_count) DO UPDATE SET count = count + excluded.count
+        """, [(*key, count) for key, count in retries.items()])
+
+    def _update_failure_patterns(
+        self,
+        conn: sqlite3.Connection,
+        record: ExecutionRecord,
+        fingerprint: FailureFingerprint
+    ):
         """
         Update failure patterns for meta-learning.
 
+        The failure joins the pattern with the same fingerprint key, else
+        the most similar pattern found through the LSH band index, else
+        starts a new pattern. Runs inside BEGIN IMMEDIATE, so the lookup and
+        the write cannot race with another writer.
+
         Args:
+            conn: Connection inside the caller's write transaction
             record: Failed execution record
+            fingerprint: Fingerprint of the failure
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        now = datetime.now().isoformat()
+        row = conn.execute(
+            "SELECT id FROM failure_patterns WHERE workflow_name = ? AND fingerprint = ?",
+            (record.workflow_name, fingerprint.key)
+        ).fetchone()
+        pattern_id = row[0] if row else self._find_similar_pattern(conn, record.workflow_name, fingerprint)
 
-        # Check if pattern exists
-        cursor.execute("""
-            SELECT id, frequency FROM failure_patterns
-            WHERE workflow_name = ? AND failure_reason = ?
-        """, (record.workflow_name, record.error_message))
+        if pattern_id is not None:
+            conn.execute(
+                "UPDATE failure_patterns SET frequency = frequency + 1, last_seen = ? WHERE id = ?",
+                (now, pattern_id)
+            )
+            return
 
-        existing = cursor.fetchone()
+        cursor = conn.execute("""
+            INSERT INTO failure_patterns (
+                workflow_name, failure_reason, last_seen, recommended_fix, fingerprint, signature
+            )
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (
+            record.workflow_name,
+            fingerprint.label,
+            now,
+            "Increase prompt strictness and add explicit validation",
+            fingerprint.key,
+            fingerprint.signature_bytes()
+        ))
+        conn.executemany(
+            "INSERT OR IGNORE INTO failure_pattern_bands VALUES (?, ?, ?, ?)",
+            [(record.workflow_name, band, band_hash, cursor.lastrowid) for band, band_hash in fingerprint.band_keys()]
+        )
 
-        if existing:
-            # Update frequency
-            cursor.execute("""
-                UPDATE failure_patterns
-                SET frequency = ?, last_seen = ?
-                WHERE id = ?
-            """, (existing[1] + 1, datetime.now().isoformat(), existing[0]))
-        else:
-            # Insert new pattern
-            cursor.execute("""
-                INSERT INTO failure_patterns (workflow_name, failure_reason, last_seen, recommended_fix)
-                VALUES (?, ?, ?, ?)
-            """, (
-                record.workflow_name,
-                record.error_message,
-                datetime.now().isoformat(),
-                "Increase prompt strictness and add explicit validation"
-            ))
+    def _find_similar_pattern(
+        self,
+        conn: sqlite3.Connection,
+        workflow_name: str,
+        fingerprint: FailureFingerprint
+    ) -> Optional[int]:
+        """
+        Find the most similar existing pattern via the LSH band index.
+
+        Args:
+            conn: Database connection
+            workflow_name: Name of the workflow
+            fingerprint: Fingerprint of the failure
+
+        Returns:
+            Pattern id, or None if no candidate reaches SIMILARITY_THRESHOLD
+        """
+        keys = fingerprint.band_keys()
+        bands_match = " OR ".join(["(band = ? AND band_hash = ?)"] * len(keys))
+        candidates = conn.execute(f"""
+            SELECT id, signature FROM failure_patterns
+            WHERE id IN (
+                SELECT pattern_id FROM failure_pattern_bands
+                WHERE workflow_name = ? AND ({bands_match})
+            )
+        """, (workflow_name, *[value for key in keys for value in key])).fetchall()
+
+        best_id, best_similarity = None, SIMILARITY_THRESHOLD
+        for pattern_id, signature in candidates:
+            score = similarity(fingerprint.signature, unpack_signature(signature))
+            if score >= best_similarity:
+                best_id, best_similarity = pattern_id, score
+        return best_id
+
+    def list_executions(
+        self,
+        workflow_name: Optional[str] = None,
+        success: Optional[bool] = None,
+        since: Union[datetime, str, None] = None,
+        until: Union[datetime, str, None] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Page through execution history, newest first.
+
+        Pages are keyed on (timestamp, id) rather than offsets, so each page
+        is one index range scan of at most limit rows however deep it is.
+        Executions without a timestamp are not listed.
+
+        Args:
+            workflow_name: Only this workflow's executions
+            success: Only successful (True) or failed (False) executions
+            since: Earliest timestamp, inclusive
+            until: Latest timestamp, exclusive
+            cursor: next_cursor of the previous page
+            limit: Page size (capped at MAX_PAGE_SIZE)
+
+        Returns:
+            {"items": execution dictionaries, "next_cursor": cursor or None on the last page}
+
+        Raises:
+            ValueError: If a timestamp or the cursor is malformed
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        clauses = ["timestamp IS NOT NULL"]
+        params: List[Any] = []
+        if workflow_name is not None:
+            clauses.append("workflow_name = ?")
+            params.append(workflow_name)
+        if success is not None:
+            clauses.append("success = ?")
+            params.append(success)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(normalize_timestamp(since))
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(normalize_timestamp(until))
+        if cursor is not None:
+            clauses.append("(timestamp, id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+
+        rows = self._pool.connection().execute(f"""
+            SELECT {", ".join(_HISTORY_COLUMNS)} FROM execution_history
+            WHERE {" AND ".join(clauses)}
+            ORDER BY timestamp DESC, id DESC
+            LIMIT ?
+        """, (*params, limit + 1)).fetchall()
+
+        items = []
+        for row in rows[:limit]:
+            item = dict(zip(_HISTORY_COLUMNS, row))
+            item["success"] = bool(item["success"])
+            items.append(item)
+
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(items[-1]["timestamp"], items[-1]["id"])
+        return {"items": items, "next_cursor": next_cursor}
+
+    def iter_executions(self, page_size: int = MAX_PAGE_SIZE, **filters: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over every matching execution, newest first.
+
+        Reads one keyset page at a time, so memory stays bounded and no read
+        transaction is held between pages.
+
+        Args:
+            page_size: Executions fetched per query
+            **filters: Filters accepted by list_executions
+
+        Yields:
+            Execution dictionaries
+        """
+        cursor = filters.pop("cursor", None)
+        while True:
+            page = self.list_executions(cursor=cursor, limit=page_size, **filters)
+            yield from page["items"]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return
+
+    def search_executions(
+        self,
+        query: str,
+        workflow_name: Optional[str] = None,
+        success: Optional[bool] = None,
+        order: str = "recent",
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Full-text search over error messages, validation feedback and final outputs.
+
+        Every whitespace-separated term must match; CJK terms match any
+        substring of two or more characters. "recent" ordering walks the
+        index newest first and stops after limit hits, so it stays fast for
+        common terms; "relevance" ranks every match by BM25.
+
+        Args:
+            query: Search text
+            workflow_name: Only this workflow's executions
+            success: Only successful (True) or failed (False) executions
+            order: One of SEARCH_ORDERS
+            limit: Maximum results (capped at MAX_PAGE_SIZE)
+
+        Returns:
+            Matching executions with a snippet around the first hit
+
+        Raises:
+            ValueError: If the query has no searchable terms or the order is unknown
+        """
+        if order not in SEARCH_ORDERS:
+            raise ValueError(f"Unknown order {order!r}, expected one of {SEARCH_ORDERS}")
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        clauses = ["execution_search MATCH ?"]
+        params: List[Any] = [build_match_query(query)]
+        if workflow_name is not None:
+            clauses.append("h.workflow_name = ?")
+            params.append(workflow_name)
+        if success is not None:
+            clauses.append("h.success = ?")
+            params.append(success)
 
-        conn.commit()
-        conn.close()
+        rows = self._pool.connection().execute(f"""
+            SELECT h.id, h.workflow_name, h.success, h.timestamp, h.error_type,
+                   h.error_message, h.validation_feedback, h.final_output
+            FROM execution_search s
+            JOIN execution_history h ON h.id = s.execution_id
+            WHERE {" AND ".join(clauses)}
+            ORDER BY {"s.rank" if order == "relevance" else "s.rowid DESC"}
+            LIMIT ?
+        """, (*params, limit)).fetchall()
+
+        return [{
+            "id": execution_id,
+            "workflow_name": name,
+            "success": bool(succeeded),
+            "timestamp": timestamp,
+            "error_type": error_type,
+            "snippet": make_snippet([error_message, validation_feedback, final_output], query)
+        } for (execution_id, name, succeeded, timestamp, error_type,
+               error_message, validation_feedback, final_output) in rows]
+
+    def create_run(self, run_id: str, workflow_name: str, priority: int = 0, owner: Optional[str] = None):
+        """
+        Record a queued run.
+
+        Args:
+            run_id: Run ID (also the execution ID)
+            workflow_name: Name of the workflow
+            priority: Queue priority
+            owner: ID of the job queue that will execute the run
+        """
+        self._pool.connection().execute("""
+            INSERT INTO runs (id, workflow_name, status, priority, submitted_at, owner)
+            VALUES (?, ?, 'queued', ?, ?, ?)
+        """, (run_id, workflow_name, priority, datetime.now().isoformat(), owner))
+
+    def start_run(self, run_id: str):
+        """
+        Mark a run as running.
+
+        Args:
+            run_id: Run ID
+        """
+        self._pool.connection().execute(
+            "UPDATE runs SET status = 'running', started_at = ? WHERE id = ?",
+            (datetime.now().isoformat(), run_id)
+        )
+
+    def finish_run(
+        self,
+        run_id: str,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ):
+        """
+        Store a run's final status and result.
+
+        Args:
+            run_id: Run ID
+            status: Final status (completed, failed, error)
+            result: Execution result dictionary
+            error: Error message if the run raised
+        """
+        self._pool.connection().execute("""
+            UPDATE runs SET status = ?, finished_at = ?, result = ?, error = ?
+            WHERE id = ?
+        """, (
+            status,
+            datetime.now().isoformat(),
+            json.dumps(result, default=str) if result is not None else None,
+            error,
+            run_id
+        ))
+
+    def heartbeat_owner(self, owner: str):
+        """
+        Record that a job queue is alive.
+
+        Args:
+            owner: Job queue ID
+        """
+        self._pool.connection().execute("""
+            INSERT INTO job_owners (owner, heartbeat_at) VALUES (?, ?)
+            ON CONFLICT (owner) DO UPDATE SET heartbeat_at = excluded.heartbeat_at
+        """, (owner, datetime.now().isoformat()))
+
+    def remove_owner(self, owner: str):
+        """
+        Forget a job queue that has drained and stopped.
+
+        Args:
+            owner: Job queue ID
+        """
+        self._pool.connection().execute("DELETE FROM job_owners WHERE owner = ?", (owner,))
+
+    def fail_orphaned_runs(self, stale_before: datetime, error: str) -> int:
+        """
+        Mark unfinished runs whose job queue has stopped heartbeating as errored.
+
+        Queued work lives only in the process that accepted it, so these
+        runs can never finish on their own. Runs without an owner predate
+        ownership tracking and are treated as orphaned.
+
+        Args:
+            stale_before: Owners whose last heartbeat is older than this are gone
+            error: Error message stored on each run
+
+        Returns:
+            Number of runs marked
+        """
+        with self._pool.transaction() as conn:
+            conn.execute("DELETE FROM job_owners WHERE heartbeat_at < ?", (stale_before.isoformat(),))
+            cursor = conn.execute("""
+                UPDATE runs SET status = 'error', finished_at = ?, error = ?
+                WHERE status IN ('queued', 'running')
+                  AND (owner IS NULL OR owner NOT IN (SELECT owner FROM job_owners))
+            """, (datetime.now().isoformat(), error))
+            return cursor.rowcount
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a run's status and result.
+
+        Args:
+            run_id: Run ID
+
+        Returns:
+            Run dictionary, or None if unknown
+        """
+        cursor = self._pool.connection().execute("SELECT * FROM runs WHERE id = ?", (run_id,))
+        row = cursor.fetchone()
+
+        if row is None:
+            return None
+
+        run = dict(zip([column[0] for column in cursor.description], row))
+        run["result"] = json.loads(run["result"]) if run["result"] else None
+        return run
 
     def clear_history(self, workflow_name: Optional[str] = None):
         """
@@ -216,17 +1073,91 @@ class MemoryManager:
         Args:
             workflow_name: If provided, clear only this workflow's history
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # Otherwise buffered records would reappear after the clear
+        self.flush()
 
+        with self._pool.transaction() as conn:
+            if workflow_name:
+                conn.execute("DELETE FROM execution_history WHERE workflow_name = ?", (workflow_name,))
+                conn.execute("DELETE FROM failure_patterns WHERE workflow_name = ?", (workflow_name,))
+                conn.execute("DELETE FROM failure_pattern_bands WHERE workflow_name = ?", (workflow_name,))
+                conn.execute("DELETE FROM workflow_duration_sketch WHERE workflow_name = ?", (workflow_name,))
+                conn.execute("DELETE FROM workflow_retry_histogram WHERE workflow_name = ?", (workflow_name,))
+                conn.execute("DELETE FROM workflow_daily_rollups WHERE workflow_name = ?", (workflow_name,))
+                conn.execute("DELETE FROM workflow_aggregates WHERE workflow_name = ?", (workflow_name,))
+                # Blueprints are shared across workflows; drop only orphans
+                conn.execute("""
+                    DELETE FROM blueprints WHERE hash NOT IN (
+                        SELECT blueprint_hash FROM execution_history WHERE blueprint_hash IS NOT NULL
+                    )
+                """)
+            else:
+                conn.execute("DELETE FROM execution_history")
+                conn.execute("DELETE FROM failure_patterns")
+                conn.execute("DELETE FROM failure_pattern_bands")
+                conn.execute("DELETE FROM workflow_duration_sketch")
+                conn.execute("DELETE FROM workflow_retry_histogram")
+                conn.execute("DELETE FROM workflow_daily_rollups")
+                conn.execute("DELETE FROM workflow_aggregates")
+                conn.execute("DELETE FROM blueprints")
+
+        self._invalidate({workflow_name} if workflow_name else None)
         if workflow_name:
-            cursor.execute("DELETE FROM execution_history WHERE workflow_name = ?", (workflow_name,))
-            cursor.execute("DELETE FROM failure_patterns WHERE workflow_name = ?", (workflow_name,))
             logger.info(f"Cleared history for workflow: {workflow_name}")
         else:
-            cursor.execute("DELETE FROM execution_history")
-            cursor.execute("DELETE FROM failure_patterns")
             logger.info("Cleared all execution history")
 
-        conn.commit()
-        conn.close()
+
+_managers: Dict[str, MemoryManager] = {}
+_managers_lock = threading.Lock()
+
+
+def default_db_path() -> str:
+    """
+    Get the execution history database configured by EXECUTION_DB_PATH.
+
+    Returns:
+        Path to SQLite database
+    """
+    return os.getenv("EXECUTION_DB_PATH", "execution_history.db")
+
+
+def get_memory_manager(db_path: Optional[str] = None) -> MemoryManager:
+    """
+    Get the process-wide memory manager for a database.
+
+    Avoids re-running schema setup on every execution.
+
+    Args:
+        db_path: Path to SQLite database (defaults to EXECUTION_DB_PATH)
+
+    Returns:
+        Shared MemoryManager
+    """
+    db_path = db_path or default_db_path()
+    key = os.path.abspath(db_path)
+    manager = _managers.get(key)
+    if manager is not None:
+        return manager
+
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = MemoryManager(db_path)
+            _managers[key] = manager
+        return manager
+
+
+def shutdown_memory_managers():
+    """Flush buffered records and stop the flushers of all shared memory managers."""
+    with _managers_lock:
+        managers = list(_managers.values())
+    for manager in managers:
+        manager.close()
+
+
+def reset_memory_managers():
+    """Shut down and forget all shared memory managers so the next lookup re-reads configuration."""
+    shutdown_memory_managers()
+    with _managers_lock:
+        _managers.clear()
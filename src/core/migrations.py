@@ -0,0 +1,513 @@
+"""Versioned schema migrations for the execution history database.
+
+The schema version is stored in SQLite's PRAGMA user_version. Each
+migration runs in its own BEGIN IMMEDIATE transaction together with the
+version bump, so concurrent processes apply it exactly once and a failed
+migration leaves the file at the previous version.
+
+Usage:
+    python -m src.core.migrations [db_path]
+"""
+import sqlite3
+import sys
+from typing import Callable, List, Optional, Tuple
+from src.core.blueprint_store import blueprint_hash, default_codec, encode_blueprint
+from src.core.fingerprint import SIMILARITY_THRESHOLD, fingerprint_failure, similarity
+from src.core.search import segment
+from src.core.sketch import sketch_counts
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+UNKNOWN_FAILURE = "Unknown failure"
+
+
+def _baseline(conn: sqlite3.Connection):
+    """v1: original tables (no-op for files created before versioning)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS execution_history (
+            id TEXT PRIMARY KEY,
+            workflow_name TEXT,
+            blueprint TEXT,
+            success BOOLEAN,
+            error_type TEXT,
+            error_message TEXT,
+            retry_count INTEGER,
+            duration_seconds REAL,
+            timestamp DATETIME,
+            learned_adjustments TEXT
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS failure_patterns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            workflow_name TEXT,
+            failure_reason TEXT,
+            frequency INTEGER DEFAULT 1,
+            last_seen DATETIME,
+            recommended_fix TEXT
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS runs (
+            id TEXT PRIMARY KEY,
+            workflow_name TEXT,
+            status TEXT,
+            priority INTEGER DEFAULT 0,
+            submitted_at DATETIME,
+            started_at DATETIME,
+            finished_at DATETIME,
+            result TEXT,
+            error TEXT
+        )
+    """)
+
+
+def _indexes_and_unique_patterns(conn: sqlite3.Connection):
+    """v2: workflow/timestamp indexes; one failure_patterns row per (workflow, reason)."""
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_execution_history_workflow_timestamp "
+        "ON execution_history (workflow_name, timestamp)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_execution_history_timestamp "
+        "ON execution_history (timestamp)"
+    )
+
+    # UNIQUE treats NULLs as distinct, so give unnamed failures a shared reason
+    conn.execute(
+        "UPDATE failure_patterns SET failure_reason = ? WHERE failure_reason IS NULL",
+        (UNKNOWN_FAILURE,)
+    )
+
+    # Merge duplicates left by the old SELECT-then-INSERT race into the oldest row
+    conn.execute("""
+        UPDATE failure_patterns
+        SET frequency = (
+                SELECT SUM(frequency) FROM failure_patterns AS dup
+                WHERE dup.workflow_name IS failure_patterns.workflow_name
+                  AND dup.failure_reason = failure_patterns.failure_reason
+            ),
+            last_seen = (
+                SELECT MAX(last_seen) FROM failure_patterns AS dup
+                WHERE dup.workflow_name IS failure_patterns.workflow_name
+                  AND dup.failure_reason = failure_patterns.failure_reason
+            )
+        WHERE id IN (
+            SELECT MIN(id) FROM failure_patterns
+            GROUP BY workflow_name, failure_reason
+            HAVING COUNT(*) > 1
+        )
+    """)
+    conn.execute("""
+        DELETE FROM failure_patterns
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM failure_patterns
+            GROUP BY workflow_name, failure_reason
+        )
+    """)
+
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_failure_patterns_workflow_reason "
+        "ON failure_patterns (workflow_name, failure_reason)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_failure_patterns_workflow_frequency "
+        "ON failure_patterns (workflow_name, frequency DESC)"
+    )
+
+
+def _workflow_aggregates(conn: sqlite3.Connection):
+    """v3: per-workflow running totals kept in step with execution_history by triggers."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS workflow_aggregates (
+            workflow_name TEXT PRIMARY KEY,
+            total_executions INTEGER NOT NULL DEFAULT 0,
+            successful INTEGER NOT NULL DEFAULT 0,
+            duration_sum REAL NOT NULL DEFAULT 0,
+            duration_sq_sum REAL NOT NULL DEFAULT 0,
+            retry_sum INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+    # Triggers run inside the inserting/deleting transaction, so every
+    # writer (batched, synchronous, maintenance) keeps the totals exact
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_execution_history_aggregate_insert
+        AFTER INSERT ON execution_history
+        BEGIN
+            INSERT INTO workflow_aggregates (
+                workflow_name, total_executions, successful,
+                duration_sum, duration_sq_sum, retry_sum
+            )
+            VALUES (
+                NEW.workflow_name, 1, CASE WHEN NEW.success THEN 1 ELSE 0 END,
+                COALESCE(NEW.duration_seconds, 0),
+                COALESCE(NEW.duration_seconds, 0) * COALESCE(NEW.duration_seconds, 0),
+                COALESCE(NEW.retry_count, 0)
+            )
+            ON CONFLICT (workflow_name) DO UPDATE SET
+                total_executions = total_executions + 1,
+                successful = successful + excluded.successful,
+                duration_sum = duration_sum + excluded.duration_sum,
+                duration_sq_sum = duration_sq_sum + excluded.duration_sq_sum,
+                retry_sum = retry_sum + excluded.retry_sum;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_execution_history_aggregate_delete
+        AFTER DELETE ON execution_history
+        BEGIN
+            UPDATE workflow_aggregates SET
+                total_executions = total_executions - 1,
+                successful = successful - CASE WHEN OLD.success THEN 1 ELSE 0 END,
+                duration_sum = duration_sum - COALESCE(OLD.duration_seconds, 0),
+                duration_sq_sum = duration_sq_sum
+                    - COALESCE(OLD.duration_seconds, 0) * COALESCE(OLD.duration_seconds, 0),
+                retry_sum = retry_sum - COALESCE(OLD.retry_count, 0)
+            WHERE workflow_name = OLD.workflow_name;
+
+            -- Drop emptied rows so float residue does not accumulate
+            DELETE FROM workflow_aggregates
+            WHERE workflow_name = OLD.workflow_name AND total_executions <= 0;
+        END
+    """)
+
+    # Backfill from existing history
+    conn.execute("DELETE FROM workflow_aggregates")
+    conn.execute("""
+        INSERT INTO workflow_aggregates (
+            workflow_name, total_executions, successful,
+            duration_sum, duration_sq_sum, retry_sum
+        )
+        SELECT
+            workflow_name,
+            COUNT(*),
+            SUM(CASE WHEN success THEN 1 ELSE 0 END),
+            TOTAL(duration_seconds),
+            TOTAL(duration_seconds * duration_seconds),
+            TOTAL(retry_count)
+        FROM execution_history
+        WHERE workflow_name IS NOT NULL
+        GROUP BY workflow_name
+    """)
+
+
+def _distribution_sketches(conn: sqlite3.Connection):
+    """v4: hourly and all-time duration sketches and retry histograms per workflow."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS workflow_duration_sketch (
+            workflow_name TEXT NOT NULL,
+            hour TEXT NOT NULL,
+            bucket INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (workflow_name, hour, bucket)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS workflow_retry_histogram (
+            workflow_name TEXT NOT NULL,
+            hour TEXT NOT NULL,
+            retry_count INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (workflow_name, hour, retry_count)
+        ) WITHOUT ROWID
+    """)
+
+    # Backfill from existing history
+    durations, retries = sketch_counts(conn.execute(
+        "SELECT workflow_name, timestamp, duration_seconds, retry_count "
+        "FROM execution_history WHERE workflow_name IS NOT NULL"
+    ))
+    conn.executemany(
+        "INSERT INTO workflow_duration_sketch VALUES (?, ?, ?, ?)",
+        [(*key, count) for key, count in durations.items()]
+    )
+    conn.executemany(
+        "INSERT INTO workflow_retry_histogram VALUES (?, ?, ?, ?)",
+        [(*key, count) for key, count in retries.items()]
+    )
+
+
+def _failure_fingerprints(conn: sqlite3.Connection):
+    """v5: fingerprinted failure patterns with an LSH band index; merge existing near-duplicates."""
+    conn.execute("ALTER TABLE failure_patterns ADD COLUMN fingerprint TEXT")
+    conn.execute("ALTER TABLE failure_patterns ADD COLUMN signature BLOB")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS failure_pattern_bands (
+            workflow_name TEXT NOT NULL,
+            band INTEGER NOT NULL,
+            band_hash INTEGER NOT NULL,
+            pattern_id INTEGER NOT NULL,
+            PRIMARY KEY (workflow_name, band, band_hash, pattern_id)
+        ) WITHOUT ROWID
+    """)
+
+    # Re-cluster rows keyed on raw messages; oldest row of each cluster survives.
+    # Candidates come from an in-memory copy of the band index, as on the live path.
+    clusters = {}
+    exact = {}
+    bands = {}
+    merged = []
+    rows = conn.execute(
+        "SELECT id, workflow_name, failure_reason, frequency, last_seen FROM failure_patterns ORDER BY id"
+    ).fetchall()
+    for pattern_id, workflow_name, reason, frequency, last_seen in rows:
+        fingerprint = fingerprint_failure(reason)
+        band_keys = [(workflow_name, band, band_hash) for band, band_hash in fingerprint.band_keys()]
+        match = exact.get((workflow_name, fingerprint.key))
+        if match is None:
+            candidates = {cluster["id"]: cluster for key in band_keys for cluster in bands.get(key, [])}
+            best_similarity = SIMILARITY_THRESHOLD
+            for _, cluster in sorted(candidates.items()):
+                score = similarity(cluster["fingerprint"].signature, fingerprint.signature)
+                if score >= best_similarity and (match is None or score > best_similarity):
+                    match, best_similarity = cluster, score
+
+        if match is None:
+            cluster = {
+                "id": pattern_id, "fingerprint": fingerprint,
+                "frequency": frequency or 0, "last_seen": last_seen
+            }
+            clusters.setdefault(workflow_name, []).append(cluster)
+            exact[(workflow_name, fingerprint.key)] = cluster
+            for key in band_keys:
+                bands.setdefault(key, []).append(cluster)
+        else:
+            match["frequency"] += frequency or 0
+            match["last_seen"] = max(filter(None, [match["last_seen"], last_seen]), default=None)
+            merged.append((pattern_id,))
+
+    conn.executemany("DELETE FROM failure_patterns WHERE id = ?", merged)
+    for workflow_name, kept in clusters.items():
+        for cluster in kept:
+            fingerprint = cluster["fingerprint"]
+            conn.execute(
+                "UPDATE failure_patterns "
+                "SET failure_reason = ?, fingerprint = ?, signature = ?, frequency = ?, last_seen = ? "
+                "WHERE id = ?",
+                (fingerprint.label, fingerprint.key, fingerprint.signature_bytes(), cluster["frequency"],
+                 cluster["last_seen"], cluster["id"])
+            )
+            if workflow_name is None:
+                continue
+            conn.executemany(
+                "INSERT OR IGNORE INTO failure_pattern_bands VALUES (?, ?, ?, ?)",
+                [(workflow_name, band, band_hash, cluster["id"]) for band, band_hash in fingerprint.band_keys()]
+            )
+
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_failure_patterns_workflow_fingerprint "
+        "ON failure_patterns (workflow_name, fingerprint)"
+    )
+
+
+def _content_addressed_blueprints(conn: sqlite3.Connection):
+    """v6: store each distinct blueprint once and reference it by hash from history."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS blueprints (
+            hash TEXT PRIMARY KEY,
+            encoding TEXT NOT NULL,
+            content BLOB NOT NULL,
+            size INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+    conn.execute("ALTER TABLE execution_history ADD COLUMN blueprint_hash TEXT")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_execution_history_blueprint_hash "
+        "ON execution_history (blueprint_hash)"
+    )
+
+    # One pass to store distinct blueprints, one to swap text for hashes
+    codec = default_codec()
+    for (text,) in conn.execute(
+        "SELECT DISTINCT blueprint FROM execution_history WHERE blueprint IS NOT NULL AND blueprint != ''"
+    ).fetchall():
+        encoding, content = encode_blueprint(text, codec)
+        conn.execute(
+            "INSERT OR IGNORE INTO blueprints VALUES (?, ?, ?, ?)",
+            (blueprint_hash(text), encoding, content, len(text.encode("utf-8")))
+        )
+
+    conn.create_function("blueprint_hash", 1, blueprint_hash, deterministic=True)
+    conn.execute("""
+        UPDATE execution_history
+        SET blueprint_hash = CASE WHEN blueprint != '' THEN blueprint_hash(blueprint) END,
+            blueprint = NULL
+        WHERE blueprint IS NOT NULL
+    """)
+
+
+def _retention_rollups(conn: sqlite3.Connection):
+    """v7: daily rollups of archived executions and an index for pruning finished runs."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS workflow_daily_rollups (
+            workflow_name TEXT NOT NULL,
+            day TEXT NOT NULL,
+            total_executions INTEGER NOT NULL DEFAULT 0,
+            successful INTEGER NOT NULL DEFAULT 0,
+            duration_sum REAL NOT NULL DEFAULT 0,
+            duration_sq_sum REAL NOT NULL DEFAULT 0,
+            retry_sum INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (workflow_name, day)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_finished_at ON runs (finished_at)")
+
+
+def _keyset_indexes(conn: sqlite3.Connection):
+    """v8: extend the v2 timestamp indexes to (timestamp, id) order for keyset pagination."""
+    conn.execute("DROP INDEX IF EXISTS idx_execution_history_workflow_timestamp")
+    conn.execute("DROP INDEX IF EXISTS idx_execution_history_timestamp")
+    # success is carried in the index so the success filter skips rows without a table lookup
+    conn.execute(
+        "CREATE INDEX idx_execution_history_workflow_timestamp "
+        "ON execution_history (workflow_name, timestamp, id, success)"
+    )
+    conn.execute(
+        "CREATE INDEX idx_execution_history_timestamp "
+        "ON execution_history (timestamp, id, success)"
+    )
+
+
+def _execution_search(conn: sqlite3.Connection):
+    """v9: output and feedback columns, and an FTS5 index over failure text and outputs."""
+    conn.execute("ALTER TABLE execution_history ADD COLUMN final_output TEXT")
+    conn.execute("ALTER TABLE execution_history ADD COLUMN validation_feedback TEXT")
+    # Explicit FTS rowid: implicit history rowids may change on VACUUM
+    conn.execute("ALTER TABLE execution_history ADD COLUMN search_rowid INTEGER")
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS execution_search USING fts5(
+            execution_id UNINDEXED,
+            error_message,
+            validation_feedback,
+            final_output,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_execution_history_search_delete
+        AFTER DELETE ON execution_history
+        WHEN OLD.search_rowid IS NOT NULL
+        BEGIN
+            DELETE FROM execution_search WHERE rowid = OLD.search_rowid;
+        END
+    """)
+
+    # Backfill: only error messages were recorded before this version
+    for execution_id, error_message in conn.execute(
+        "SELECT id, error_message FROM execution_history WHERE error_message IS NOT NULL AND error_message != ''"
+    ).fetchall():
+        search_rowid = conn.execute(
+            "INSERT INTO execution_search (execution_id, error_message) VALUES (?, ?)",
+            (execution_id, segment(error_message))
+        ).lastrowid
+        conn.execute("UPDATE execution_history SET search_rowid = ? WHERE id = ?", (search_rowid, execution_id))
+
+
+def _run_owners(conn: sqlite3.Connection):
+    """v10: record which job queue owns each run, and queue heartbeats for orphan detection."""
+    conn.execute("ALTER TABLE runs ADD COLUMN owner TEXT")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS job_owners (
+            owner TEXT PRIMARY KEY,
+            heartbeat_at TEXT NOT NULL
+        ) WITHOUT ROWID
+    """)
+    # Only unfinished runs are ever swept, so keep the index to those
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_runs_unfinished_owner ON runs (owner) "
+        "WHERE status IN ('queued', 'running')"
+    )
+
+
+# (version, description, migration); append only, never renumber
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "baseline tables", _baseline),
+    (2, "indexes and unique failure patterns", _indexes_and_unique_patterns),
+    (3, "incremental workflow aggregates", _workflow_aggregates),
+    (4, "duration sketches and retry histograms", _distribution_sketches),
+    (5, "failure fingerprints and LSH band index", _failure_fingerprints),
+    (6, "content-addressed blueprints", _content_addressed_blueprints),
+    (7, "retention rollups", _retention_rollups),
+    (8, "keyset pagination indexes", _keyset_indexes),
+    (9, "full-text search over failures and outputs", _execution_search),
+    (10, "run owners and job queue heartbeats", _run_owners),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    """
+    Read the schema version of a database.
+
+    Args:
+        conn: Database connection
+
+    Returns:
+        Current user_version (0 for unversioned files)
+    """
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, target: Optional[int] = None) -> int:
+    """
+    Apply pending migrations in order.
+
+    Args:
+        conn: Autocommit (isolation_level=None) database connection
+        target: Stop after this version (defaults to the latest)
+
+    Returns:
+        Schema version after migrating
+    """
+    target = LATEST_VERSION if target is None else target
+
+    for version, description, apply in MIGRATIONS:
+        if version > target or version <= get_version(conn):
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have applied it while we waited for the lock
+            if get_version(conn) >= version:
+                conn.execute("ROLLBACK")
+                continue
+            apply(conn)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        logger.info(f"Applied migration {version}: {description}")
+
+    return get_version(conn)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Upgrade a database file in place.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Exit code
+    """
+    args = sys.argv[1:] if argv is None else argv
+    db_path = args[0] if args else "execution_history.db"
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    before = get_version(conn)
+    after = migrate(conn)
+    conn.close()
+
+    print(f"{db_path}: schema version {before} -> {after}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,638 @@
+"""Retention, compaction and archival for the execution history database.
+
+Usage:
+    python -m src.core.retention [--db execution_history.db] [--days 30]
+        [--archive-dir archive | --no-archive] [--format jsonl|parquet]
+        [--chunk-size 500] [--dry-run] [--convert-vacuum]
+
+Executions older than the retention window are exported to archive files
+partitioned by day (archive/day=YYYY-MM-DD/part-<first id>.jsonl.gz), then
+rolled up and deleted in chunks of chunk_size rows, one short write
+transaction per chunk. Rolling up keeps every all-time number intact:
+
+- workflow_aggregates keeps its lifetime totals (the delete trigger's
+  decrement is added back) and workflow_daily_rollups records per-day totals
+- hourly sketch and retry histogram rows move into daily rows, so windowed
+  percentiles keep day granularity for archived executions
+- failure patterns are untouched; orphaned blueprints are dropped
+
+Finished runs older than the window are deleted as well, and freed pages
+are returned with incremental VACUUM. Archive files are written before the
+chunk is deleted and named after its first row, so a run interrupted
+between the two rewrites the same file instead of duplicating rows.
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+from src.core.blueprint_store import decode_blueprint
+from src.core.db import ConnectionPool, get_connection_pool
+from src.core.memory import default_db_path
+from src.core.migrations import migrate
+from src.core.sketch import ALL_TIME, day_key, sketch_counts
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+    PARQUET_AVAILABLE = True
+except ImportError:
+    pyarrow = None
+    PARQUET_AVAILABLE = False
+
+ARCHIVE_FORMATS = ("jsonl", "parquet")
+
+ARCHIVE_COLUMNS = (
+    "id", "workflow_name", "blueprint", "blueprint_hash", "success", "error_type", "error_message",
+    "retry_count", "duration_seconds", "timestamp", "learned_adjustments", "final_output", "validation_feedback"
+)
+
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+class RetentionPolicy:
+    """How long raw history is kept and how it is archived and pruned."""
+
+    def __init__(
+        self,
+        keep_days: float = 30,
+        archive_dir: Optional[str] = "archive",
+        archive_format: str = "jsonl",
+        chunk_size: int = 500,
+        chunk_pause_ms: float = 10,
+        vacuum_pages: int = 1000
+    ):
+        """
+        Initialize retention policy.
+
+        Args:
+            keep_days: Days of raw executions and finished runs to keep
+            archive_dir: Directory for archive files (None to delete without archiving)
+            archive_format: One of ARCHIVE_FORMATS
+            chunk_size: Rows deleted per write transaction
+            chunk_pause_ms: Pause between chunks so other writers get the lock
+            vacuum_pages: Pages freed per incremental VACUUM step
+
+        Raises:
+            ValueError: If the archive format is unknown
+            RuntimeError: If Parquet is requested and pyarrow is not installed
+        """
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown archive format {archive_format!r}, expected one of {ARCHIVE_FORMATS}")
+        if archive_format == "parquet" and archive_dir and not PARQUET_AVAILABLE:
+            raise RuntimeError("Parquet archives require pyarrow, which is not installed")
+
+        self.keep_days = keep_days
+        self.archive_dir = archive_dir or None
+        self.archive_format = archive_format
+        self.chunk_size = max(1, chunk_size)
+        self.chunk_pause = max(0.0, chunk_pause_ms) / 1000
+        self.vacuum_pages = max(1, vacuum_pages)
+
+    @classmethod
+    def from_env(cls) -> "RetentionPolicy":
+        """Build a policy from RETENTION_* environment variables."""
+        return cls(
+            keep_days=float(os.getenv("RETENTION_DAYS", "30")),
+            archive_dir=os.getenv("RETENTION_ARCHIVE_DIR", "archive"),
+            archive_format=os.getenv("RETENTION_ARCHIVE_FORMAT", "jsonl"),
+            chunk_size=int(os.getenv("RETENTION_CHUNK_SIZE", "500")),
+            chunk_pause_ms=float(os.getenv("RETENTION_CHUNK_PAUSE_MS", "10")),
+            vacuum_pages=int(os.getenv("RETENTION_VACUUM_PAGES", "1000"))
+        )
+
+    def cutoff(self, now: Optional[datetime] = None) -> str:
+        """
+        Oldest timestamp kept.
+
+        Args:
+            now: Reference time (defaults to now)
+
+        Returns:
+            ISO timestamp; rows strictly older are pruned
+        """
+        return ((now or datetime.now()) - timedelta(days=self.keep_days)).isoformat()
+
+
+class RetentionReport(BaseModel):
+    """Outcome of one retention pass."""
+    cutoff: str
+    dry_run: bool = False
+    executions_deleted: int = 0
+    runs_deleted: int = 0
+    blueprints_deleted: int = 0
+    chunks: int = 0
+    archive_files: List[str] = Field(default_factory=list)
+    pages_vacuumed: int = 0
+    duration_seconds: float = 0.0
+
+
+def write_archive(rows: List[Dict[str, Any]], archive_dir: str, archive_format: str = "jsonl") -> List[str]:
+    """
+    Write executions to one archive file per day.
+
+    Files are written to a temporary name, fsynced and renamed, so a file
+    either holds the whole chunk's rows for that day or does not exist.
+
+    Args:
+        rows: Execution rows with ARCHIVE_COLUMNS keys, ordered by timestamp
+        archive_dir: Archive root directory
+        archive_format: One of ARCHIVE_FORMATS
+
+    Returns:
+        Paths of the files written
+    """
+    by_day: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        by_day[day_key(row["timestamp"])].append(row)
+
+    paths = []
+    for day, day_rows in by_day.items():
+        directory = os.path.join(archive_dir, f"day={day}")
+        os.makedirs(directory, exist_ok=True)
+        extension = "parquet" if archive_format == "parquet" else "jsonl.gz"
+        path = os.path.join(directory, f"part-{day_rows[0]['id']}.{extension}")
+        tmp_path = f"{path}.tmp"
+
+        if archive_format == "parquet":
+            pyarrow.parquet.write_table(pyarrow.Table.from_pylist(day_rows), tmp_path, compression="zstd")
+        else:
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                for row in day_rows:
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        paths.append(path)
+
+    return paths
+
+
+def read_archive(path: str) -> List[Dict[str, Any]]:
+    """
+    Read executions back from an archive file.
+
+    Args:
+        path: File written by write_archive
+
+    Returns:
+        Execution rows
+    """
+    if path.endswith(".parquet"):
+        if not PARQUET_AVAILABLE:
+            raise RuntimeError("Reading Parquet archives requires pyarrow, which is not installed")
+        return pyarrow.parquet.read_table(path).to_pylist()
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _select_expired(conn, cutoff: str, limit: int) -> List[Dict[str, Any]]:
+    """Oldest executions before the cutoff, with blueprint text rehydrated."""
+    rows = conn.execute("""
+        SELECT h.id, h.workflow_name, h.blueprint, h.blueprint_hash, b.encoding, b.content,
+               h.success, h.error_type, h.error_message, h.retry_count, h.duration_seconds,
+               h.timestamp, h.learned_adjustments, h.final_output, h.validation_feedback
+        FROM execution_history h
+        LEFT JOIN blueprints b ON b.hash = h.blueprint_hash
+        WHERE h.timestamp < ?
+        ORDER BY h.timestamp, h.id
+        LIMIT ?
+    """, (cutoff, limit)).fetchall()
+
+    expired = []
+    for (execution_id, workflow_name, blueprint, digest, encoding, content, success, error_type,
+         error_message, retry_count, duration, timestamp, learned_adjustments, final_output,
+         validation_feedback) in rows:
+        if blueprint is None and content is not None:
+            blueprint = decode_blueprint(encoding, content)
+        expired.append({
+            "id": execution_id,
+            "workflow_name": workflow_name,
+            "blueprint": blueprint,
+            "blueprint_hash": digest,
+            "success": None if success is None else bool(success),
+            "error_type": error_type,
+            "error_message": error_message,
+            "retry_count": retry_count,
+            "duration_seconds": duration,
+            "timestamp": timestamp,
+            "learned_adjustments": learned_adjustments,
+            "final_output": final_output,
+            "validation_feedback": validation_feedback
+        })
+    return expired
+
+
+def _roll_up_and_delete(conn, execution_ids: List[str]) -> int:
+    """
+    Fold executions into rollups and daily sketch rows, then delete them.
+
+    Re-reads the rows inside the caller's write transaction so executions
+    removed concurrently (e.g. by clear_history) are not rolled up.
+
+    Args:
+        conn: Connection inside the caller's write transaction
+        execution_ids: Executions to prune
+
+    Returns:
+        Number of executions deleted
+    """
+    placeholders = ", ".join("?" * len(execution_ids))
+    rows = conn.execute(f"""
+        SELECT workflow_name, timestamp, success, duration_seconds, retry_count
+        FROM execution_history WHERE id IN ({placeholders})
+    """, execution_ids).fetchall()
+    if not rows:
+        return 0
+
+    named = [row for row in rows if row[0] is not None]
+    totals: Dict[tuple, List[float]] = defaultdict(lambda: [0, 0, 0.0, 0.0, 0])
+    for workflow_name, timestamp, success, duration, retry_count in named:
+        duration = duration or 0.0
+        for key in ((workflow_name, day_key(timestamp)), (workflow_name, None)):
+            total = totals[key]
+            total[0] += 1
+            total[1] += 1 if success else 0
+            total[2] += duration
+            total[3] += duration * duration
+            total[4] += retry_count or 0
+
+    conn.executemany("""
+        INSERT INTO workflow_daily_rollups (
+            workflow_name, day, total_executions, successful, duration_sum, duration_sq_sum, retry_sum
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (workflow_name, day) DO UPDATE SET
+            total_executions = total_executions + excluded.total_executions,
+            successful = successful + excluded.successful,
+            duration_sum = duration_sum + excluded.duration_sum,
+            duration_sq_sum = duration_sq_sum + excluded.duration_sq_sum,
+            retry_sum = retry_sum + excluded.retry_sum
+    """, [(*key, *total) for key, total in totals.items() if key[1] is not None])
+
+    # Hourly rows move to daily rows; all-time rows stay as they are
+    samples = [(workflow_name, timestamp, duration, retry_count)
+               for workflow_name, timestamp, _, duration, retry_count in named]
+    hourly = [Counter({k: v for k, v in counts.items() if k[1] != ALL_TIME}) for counts in sketch_counts(samples)]
+    daily = [Counter({k: v for k, v in counts.items() if k[1] != ALL_TIME})
+             for counts in sketch_counts(samples, period=day_key)]
+    for table, column, moved_out, moved_in in zip(
+        ("workflow_duration_sketch", "workflow_retry_histogram"), ("bucket", "retry_count"), hourly, daily
+    ):
+        conn.executemany(
+            f"UPDATE {table} SET count = count - ? WHERE workflow_name = ? AND hour = ? AND {column} = ?",
+            [(count, *key) for key, count in moved_out.items()]
+        )
+        conn.executemany(
+            f"DELETE FROM {table} WHERE workflow_name = ? AND hour = ? AND {column} = ? AND count <= 0",
+            list(moved_out)
+        )
+        conn.executemany(f"""
+            INSERT INTO {table} (workflow_name, hour, {column}, count)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (workflow_name, hour, {column}) DO UPDATE SET count = count + excluded.count
+        """, [(*key, count) for key, count in moved_in.items()])
+
+    digests = [row[0] for row in conn.execute(
+        f"SELECT DISTINCT blueprint_hash FROM execution_history "
+        f"WHERE id IN ({placeholders}) AND blueprint_hash IS NOT NULL",
+        execution_ids
+    )]
+    conn.execute(f"DELETE FROM execution_history WHERE id IN ({placeholders})", execution_ids)
+
+    # The delete trigger decremented the lifetime aggregates; add the rolled-up rows back
+    conn.executemany("""
+        INSERT INTO workflow_aggregates (
+            workflow_name, total_executions, successful, duration_sum, duration_sq_sum, retry_sum
+        )
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (workflow_name) DO UPDATE SET
+            total_executions = total_executions + excluded.total_executions,
+            successful = successful + excluded.successful,
+            duration_sum = duration_sum + excluded.duration_sum,
+            duration_sq_sum = duration_sq_sum + excluded.duration_sq_sum,
+            retry_sum = retry_sum + excluded.retry_sum
+    """, [(key[0], *total) for key, total in totals.items() if key[1] is None])
+
+    conn.executemany("""
+        DELETE FROM blueprints WHERE hash = ?
+        AND NOT EXISTS (SELECT 1 FROM execution_history WHERE blueprint_hash = ?)
+    """, [(digest, digest) for digest in digests])
+
+    return len(rows)
+
+
+def incremental_vacuum(conn, pages: int = 1000, pause: float = 0.0) -> int:
+    """
+    Return free pages to the filesystem a step at a time.
+
+    Args:
+        conn: Autocommit database connection
+        pages: Pages freed per step
+        pause: Seconds to sleep between steps
+
+    Returns:
+        Number of pages freed (0 if the file is not in incremental auto_vacuum mode)
+    """
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != _AUTO_VACUUM_INCREMENTAL:
+        logger.info("auto_vacuum is not incremental; run retention with --convert-vacuum once to enable it")
+        return 0
+
+    freed = 0
+    while True:
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if free == 0:
+            break
+        conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+        step = free - conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if step <= 0:
+            break
+        freed += step
+        time.sleep(pause)
+
+    conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+    return freed
+
+
+def convert_to_incremental_vacuum(conn):
+    """
+    Switch an existing file to incremental auto_vacuum.
+
+    Rebuilds the whole file with a full VACUUM, holding an exclusive lock
+    for the duration; needed once for files created before it was the
+    default.
+
+    Args:
+        conn: Autocommit database connection
+    """
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.execute("VACUUM")
+    logger.info("Converted database to incremental auto_vacuum")
+
+
+def apply_retention(
+    db_path: str,
+    policy: Optional[RetentionPolicy] = None,
+    now: Optional[datetime] = None,
+    dry_run: bool = False,
+    stop: Optional[threading.Event] = None
+) -> RetentionReport:
+    """
+    Archive, roll up and delete executions older than the retention window.
+
+    Args:
+        db_path: Path to SQLite database
+        policy: Retention policy (defaults to RetentionPolicy.from_env())
+        now: Reference time (defaults to now)
+        dry_run: Only count what would be deleted
+        stop: Event that ends the pass after the current chunk
+
+    Returns:
+        RetentionReport
+    """
+    policy = policy or RetentionPolicy.from_env()
+    pool: ConnectionPool = get_connection_pool(db_path)
+    conn = pool.connection()
+    migrate(conn)
+
+    started = time.perf_counter()
+    report = RetentionReport(cutoff=policy.cutoff(now), dry_run=dry_run)
+
+    if dry_run:
+        report.executions_deleted = conn.execute(
+            "SELECT COUNT(*) FROM execution_history WHERE timestamp < ?", (report.cutoff,)
+        ).fetchone()[0]
+        report.runs_deleted = conn.execute(
+            "SELECT COUNT(*) FROM runs WHERE finished_at < ?", (report.cutoff,)
+        ).fetchone()[0]
+        return report
+
+    blueprints_before = conn.execute("SELECT COUNT(*) FROM blueprints").fetchone()[0]
+    while not (stop and stop.is_set()):
+        expired = _select_expired(conn, report.cutoff, policy.chunk_size)
+        if not expired:
+            break
+        if policy.archive_dir:
+            report.archive_files.extend(write_archive(expired, policy.archive_dir, policy.archive_format))
+        with pool.transaction() as tx:
+            report.executions_deleted += _roll_up_and_delete(tx, [row["id"] for row in expired])
+        report.chunks += 1
+        time.sleep(policy.chunk_pause)
+
+    while not (stop and stop.is_set()):
+        with pool.transaction() as tx:
+            deleted = tx.execute("""
+                DELETE FROM runs WHERE id IN (
+                    SELECT id FROM runs WHERE finished_at < ? LIMIT ?
+                )
+            """, (report.cutoff, policy.chunk_size)).rowcount
+        report.runs_deleted += deleted
+        if deleted < policy.chunk_size:
+            break
+        time.sleep(policy.chunk_pause)
+
+    report.blueprints_deleted = blueprints_before - conn.execute("SELECT COUNT(*) FROM blueprints").fetchone()[0]
+    if report.executions_deleted or report.runs_deleted:
+        report.pages_vacuumed = incremental_vacuum(conn, policy.vacuum_pages, policy.chunk_pause)
+
+    report.duration_seconds = time.perf_counter() - started
+    logger.info(
+        f"Retention pruned {report.executions_deleted} executions and {report.runs_deleted} runs "
+        f"older than {report.cutoff} in {report.chunks} chunks "
+        f"({len(report.archive_files)} archive files, {report.pages_vacuumed} pages vacuumed)"
+    )
+    return report
+
+
+class RetentionScheduler:
+    """Background thread that applies the retention policy periodically."""
+
+    def __init__(self, db_path: str, policy: RetentionPolicy, interval_seconds: float):
+        """
+        Initialize scheduler.
+
+        Args:
+            db_path: Path to SQLite database
+            policy: Retention policy
+            interval_seconds: Time between passes (the first runs at start)
+        """
+        self.db_path = db_path
+        self.policy = policy
+        self.interval = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.failures = 0
+        self.executions_deleted = 0
+        self.last_report: Optional[RetentionReport] = None
+
+    def start(self):
+        """Start the background thread."""
+        self._thread = threading.Thread(target=self._loop, name="retention", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        """Run passes until stopped."""
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+    def run_once(self) -> Optional[RetentionReport]:
+        """
+        Apply the policy once, logging instead of raising on failure.
+
+        Returns:
+            RetentionReport, or None if the pass failed
+        """
+        try:
+            report = apply_retention(self.db_path, self.policy, stop=self._stop)
+        except Exception as e:
+            logger.error(f"Retention pass failed: {e}")
+            with self._lock:
+                self.failures += 1
+            return None
+
+        with self._lock:
+            self.runs += 1
+            self.executions_deleted += report.executions_deleted
+            self.last_report = report
+        return report
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop after the current chunk.
+
+        Args:
+            timeout: Seconds to wait for the thread
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Scheduler counters.
+
+        Returns:
+            Dictionary of counters and the last pass's cutoff
+        """
+        with self._lock:
+            return {
+                "interval_seconds": self.interval,
+                "keep_days": self.policy.keep_days,
+                "runs": self.runs,
+                "failures": self.failures,
+                "executions_deleted": self.executions_deleted,
+                "last_cutoff": self.last_report.cutoff if self.last_report else None
+            }
+
+
+_scheduler: Optional[RetentionScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def start_retention_scheduler(db_path: Optional[str] = None) -> Optional[RetentionScheduler]:
+    """
+    Start the process-wide scheduler if RETENTION_INTERVAL_HOURS is positive.
+
+    Args:
+        db_path: Path to SQLite database (defaults to EXECUTION_DB_PATH)
+
+    Returns:
+        Running scheduler, or None when scheduling is disabled
+    """
+    global _scheduler
+    interval_hours = float(os.getenv("RETENTION_INTERVAL_HOURS", "0"))
+    if interval_hours <= 0:
+        return None
+
+    db_path = db_path or default_db_path()
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RetentionScheduler(db_path, RetentionPolicy.from_env(), interval_hours * 3600)
+            _scheduler.start()
+            logger.info(f"Retention scheduled every {interval_hours}h for {db_path}")
+        return _scheduler
+
+
+def get_retention_scheduler() -> Optional[RetentionScheduler]:
+    """Get the process-wide scheduler, if one is running."""
+    return _scheduler
+
+
+def shutdown_retention_scheduler(timeout: Optional[float] = None):
+    """
+    Stop the process-wide scheduler after its current chunk.
+
+    Args:
+        timeout: Seconds to wait for the thread
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None:
+            _scheduler.stop(timeout)
+        _scheduler = None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    CLI entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Exit code
+    """
+    defaults = RetentionPolicy.from_env()
+    parser = argparse.ArgumentParser(description="Archive and prune old execution history.")
+    parser.add_argument(
+        "--db", default=default_db_path(), help="Path to SQLite database (defaults to EXECUTION_DB_PATH)"
+    )
+    parser.add_argument("--days", type=float, default=defaults.keep_days, help="Days of raw history to keep")
+    parser.add_argument("--archive-dir", default=defaults.archive_dir, help="Archive root directory")
+    parser.add_argument("--no-archive", action="store_true", help="Delete without archiving")
+    parser.add_argument("--format", choices=ARCHIVE_FORMATS, default=defaults.archive_format)
+    parser.add_argument("--chunk-size", type=int, default=defaults.chunk_size, help="Rows per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="Only count what would be deleted")
+    parser.add_argument(
+        "--convert-vacuum", action="store_true",
+        help="Switch the file to incremental auto_vacuum first (full VACUUM, exclusive lock)"
+    )
+    args = parser.parse_args(argv)
+
+    policy = RetentionPolicy(
+        keep_days=args.days,
+        archive_dir=None if args.no_archive else args.archive_dir,
+        archive_format=args.format,
+        chunk_size=args.chunk_size,
+        chunk_pause_ms=defaults.chunk_pause * 1000,
+        vacuum_pages=defaults.vacuum_pages
+    )
+
+    if args.convert_vacuum and not args.dry_run:
+        convert_to_incremental_vacuum(get_connection_pool(args.db).connection())
+
+    report = apply_retention(args.db, policy, dry_run=args.dry_run)
+    verb = "would delete" if report.dry_run else "deleted"
+    print(
+        f"{args.db}: {verb} {report.executions_deleted} executions and {report.runs_deleted} runs "
+        f"older than {report.cutoff}; {len(report.archive_files)} archive files, "
+        f"{report.blueprints_deleted} blueprints, {report.pages_vacuumed} pages vacuumed"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -54,6 +54,9 @@ class ExecutionRecord(BaseModel):
     duration_seconds: float
     timestamp: datetime
     learned_adjustments: Optional[str] = None
+    failed_checks: List[str] = Field(default_factory=list)
+    final_output: Optional[str] = None
+    validation_feedback: Optional[str] = None
 
 
 class ValidationResult(BaseModel):
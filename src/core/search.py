@@ -0,0 +1,102 @@
+"""Full-text search text preparation for execution history.
+
+SQLite's unicode61 tokenizer splits on spaces and punctuation, which leaves
+a CJK sentence as one giant token ("缺少市場分析" would only match itself).
+Text is therefore segmented before indexing: every run of CJK characters
+is replaced by its overlapping bigrams ("缺少 少市 市場 場分 分析"), and queries
+are segmented the same way and matched as phrases, so any CJK substring of
+two or more characters matches. A single CJK character is matched as a
+bigram prefix, i.e. only where it starts a bigram.
+"""
+import re
+from typing import Iterable, List, Optional
+
+# Kana, CJK ideographs (extension A, unified, compatibility, supplementary planes) and Hangul
+_CJK = re.compile(
+    "[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff\U00020000-\U0002fa1f]+"
+)
+
+SNIPPET_WIDTH = 160
+
+
+def segment(text: Optional[str]) -> str:
+    """
+    Replace each CJK run with its overlapping bigrams.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Text ready for the unicode61 tokenizer
+    """
+    if not text:
+        return ""
+
+    def bigrams(match: "re.Match") -> str:
+        run = match.group(0)
+        if len(run) == 1:
+            return f" {run} "
+        return " " + " ".join(run[i:i + 2] for i in range(len(run) - 1)) + " "
+
+    return _CJK.sub(bigrams, text)
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every whitespace-separated term must appear; each term is matched as a
+    quoted phrase, so FTS5 operators in user input are treated as text.
+
+    Args:
+        query: Search text
+
+    Returns:
+        MATCH expression
+
+    Raises:
+        ValueError: If the query has no searchable characters
+    """
+    phrases = []
+    for term in query.split():
+        segmented = segment(term).strip()
+        if not re.search(r"\w", segmented):
+            continue
+        phrase = '"' + segmented.replace('"', '""') + '"'
+        # A lone CJK character only exists as the first half of bigrams
+        if _CJK.fullmatch(term) and len(term) == 1:
+            phrase += "*"
+        phrases.append(phrase)
+
+    if not phrases:
+        raise ValueError(f"Search query has no searchable terms: {query!r}")
+    return " ".join(phrases)
+
+
+def make_snippet(texts: Iterable[Optional[str]], query: str, width: int = SNIPPET_WIDTH) -> str:
+    """
+    Excerpt of the first text containing a query term, centred on the match.
+
+    Args:
+        texts: Original (unsegmented) texts in priority order
+        query: Search text
+        width: Maximum snippet length in characters
+
+    Returns:
+        Excerpt, or the start of the first non-empty text if no term is found verbatim
+    """
+    terms: List[str] = [term.lower() for term in query.split() if term.strip()]
+    fallback = ""
+    for text in texts:
+        if not text:
+            continue
+        fallback = fallback or text
+        lowered = text.lower()
+        positions = [position for position in (lowered.find(term) for term in terms) if position >= 0]
+        if not positions:
+            continue
+        start = max(0, min(positions) - width // 4)
+        excerpt = text[start:start + width]
+        return ("…" if start > 0 else "") + excerpt + ("…" if start + width < len(text) else "")
+
+    return fallback[:width] + ("…" if len(fallback) > width else "")
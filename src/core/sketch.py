@@ -0,0 +1,209 @@
+"""Mergeable latency sketch and hourly bucketing for workflow distributions.
+
+Durations are counted in logarithmic buckets (HDR/DDSketch style): bucket i
+holds values in (MIN_DURATION * GAMMA**(i-1), MIN_DURATION * GAMMA**i], so
+any quantile read back is within RELATIVE_ACCURACY of the true value no
+matter how many samples were added. Sketches merge by adding counts, which
+is what lets hourly rows be summed into any time window. Retention rolls
+hourly rows of archived executions into daily rows ("YYYY-MM-DD"), which
+sort before every hour key of the same day.
+"""
+import math
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+
+GAMMA = 1.02
+RELATIVE_ACCURACY = (GAMMA - 1) / (GAMMA + 1)
+MIN_DURATION = 0.001
+
+# Length of the "YYYY-MM-DD" keys of daily rows
+DAY_KEY_LENGTH = 10
+
+# Hour key of the rows that accumulate every sample ever recorded
+ALL_TIME = "*"
+
+WINDOWS: Dict[str, timedelta] = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+SketchKey = Tuple[str, str, int]
+
+
+def duration_bucket(seconds: Optional[float]) -> int:
+    """
+    Map a duration to its bucket index.
+
+    Args:
+        seconds: Duration in seconds
+
+    Returns:
+        Bucket index (0 for anything at or below MIN_DURATION)
+    """
+    if seconds is None or seconds <= MIN_DURATION:
+        return 0
+    return int(math.ceil(math.log(seconds / MIN_DURATION, GAMMA)))
+
+
+def bucket_value(bucket: int) -> float:
+    """
+    Representative duration of a bucket.
+
+    Args:
+        bucket: Bucket index
+
+    Returns:
+        Value within RELATIVE_ACCURACY of every duration in the bucket
+    """
+    if bucket <= 0:
+        return MIN_DURATION
+    return MIN_DURATION * 2 * GAMMA ** bucket / (GAMMA + 1)
+
+
+def hour_key(timestamp: Union[datetime, str, None]) -> Optional[str]:
+    """
+    Truncate a timestamp to its hour, in the ISO form stored in the database.
+
+    Args:
+        timestamp: datetime or ISO string
+
+    Returns:
+        "YYYY-MM-DDTHH:00:00", or None for a missing timestamp
+    """
+    if timestamp is None:
+        return None
+    if isinstance(timestamp, datetime):
+        timestamp = timestamp.isoformat()
+    return f"{timestamp[:13]}:00:00"
+
+
+def day_key(timestamp: Union[datetime, str, None]) -> Optional[str]:
+    """
+    Truncate a timestamp to its day.
+
+    Args:
+        timestamp: datetime or ISO string
+
+    Returns:
+        "YYYY-MM-DD", or None for a missing timestamp
+    """
+    if timestamp is None:
+        return None
+    if isinstance(timestamp, datetime):
+        timestamp = timestamp.isoformat()
+    return timestamp[:DAY_KEY_LENGTH]
+
+
+def window_start(window: str, now: Optional[datetime] = None) -> str:
+    """
+    First hour key included in a time window.
+
+    Windows have hour granularity: "hour" covers the current and previous
+    clock hour.
+
+    Args:
+        window: One of WINDOWS
+        now: Reference time (defaults to now)
+
+    Returns:
+        Hour key to compare with >=
+
+    Raises:
+        ValueError: If the window is unknown
+    """
+    if window not in WINDOWS:
+        raise ValueError(f"Unknown window {window!r}, expected one of {tuple(WINDOWS)}")
+    return hour_key((now or datetime.now()) - WINDOWS[window])
+
+
+class DurationSketch:
+    """Log-bucketed duration counts with quantile queries."""
+
+    def __init__(self, counts: Optional[Dict[int, int]] = None):
+        """
+        Initialize sketch.
+
+        Args:
+            counts: Existing bucket -> count mapping
+        """
+        self.counts: Counter = Counter(counts or {})
+
+    @property
+    def count(self) -> int:
+        """Total number of samples."""
+        return sum(self.counts.values())
+
+    def add(self, seconds: float, count: int = 1):
+        """
+        Add a sample.
+
+        Args:
+            seconds: Duration in seconds
+            count: Number of occurrences
+        """
+        self.counts[duration_bucket(seconds)] += count
+
+    def merge(self, other: "DurationSketch"):
+        """
+        Add another sketch's samples to this one.
+
+        Args:
+            other: Sketch to merge
+        """
+        self.counts.update(other.counts)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Estimated duration in seconds (0.0 for an empty sketch)
+        """
+        total = self.count
+        if total == 0:
+            return 0.0
+
+        rank = q * (total - 1)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen > rank:
+                return bucket_value(bucket)
+        return bucket_value(max(self.counts))
+
+
+def sketch_counts(
+    rows: Iterable[Tuple[str, Union[datetime, str, None], Optional[float], Optional[int]]],
+    period: Callable[[Union[datetime, str, None]], Optional[str]] = hour_key
+) -> Tuple[Counter, Counter]:
+    """
+    Count executions into hourly and all-time sketch rows.
+
+    Args:
+        rows: (workflow_name, timestamp, duration_seconds, retry_count) tuples
+        period: Maps a timestamp to its row key (hour_key or day_key)
+
+    Returns:
+        Tuple of (duration counts keyed by (workflow, hour, bucket),
+        retry counts keyed by (workflow, hour, retry_count))
+    """
+    durations: Counter = Counter()
+    retries: Counter = Counter()
+
+    for workflow_name, timestamp, duration, retry_count in rows:
+        bucket = duration_bucket(duration)
+        retry_count = retry_count or 0
+        hours = [ALL_TIME]
+        hour = period(timestamp)
+        if hour is not None:
+            hours.append(hour)
+        for hour in hours:
+            durations[(workflow_name, hour, bucket)] += 1
+            retries[(workflow_name, hour, retry_count)] += 1
+
+    return durations, retries
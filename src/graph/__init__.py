@@ -1,9 +1,28 @@
 """LangGraph workflow execution."""
 from src.graph.state import AgentState
-from src.graph.builder import build_graph, execute_workflow
+from src.graph.builder import (
+    build_graph,
+    execute_workflow,
+    execute_workflow_async,
+    stream_workflow,
+    astream_workflow,
+    get_compiled_graph,
+    get_graph_cache_stats,
+    clear_graph_cache,
+    render_mermaid,
+    write_mermaid,
+)
 
 __all__ = [
     "AgentState",
     "build_graph",
     "execute_workflow",
+    "execute_workflow_async",
+    "stream_workflow",
+    "astream_workflow",
+    "get_compiled_graph",
+    "get_graph_cache_stats",
+    "clear_graph_cache",
+    "render_mermaid",
+    "write_mermaid",
 ]
@@ -1,19 +1,41 @@
 """LangGraph builder: constructs dynamic execution graphs."""
 from langgraph.graph import StateGraph, START, END  # ⭐ Correct imports
 from langgraph.checkpoint.memory import MemorySaver
-from typing import Literal, Any, Dict
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.runnables.utils import accepts_config
+from langgraph.config import get_stream_writer
+from typing import Literal, Any, AsyncIterator, Callable, Dict, Iterator, Optional, Tuple
+import asyncio
+import os
 import time
 import uuid
 from datetime import datetime
 
 from src.graph.state import AgentState
-from src.agents import ManagerAgent, ResearcherAgent, WriterAgent, QAAgent
+from src.graph.cache import LRUCache
+from src.agents import get_agent
 from src.core.schemas import Workflow, ExecutionRecord
-from src.core.memory import MemoryManager
+from src.core.memory import get_memory_manager
 from src.utils.logging import setup_logger
 
 logger = setup_logger(__name__)
 
+# Unconditional edges wired by build_graph. Part of the graph cache key so a
+# topology change never serves a stale compiled app.
+STATIC_EDGES: Tuple[Tuple[str, str], ...] = (
+    (START, "manager"),
+    ("manager", "researcher"),
+    ("researcher", "writer"),  # Direct path, no second manager call
+    ("writer", "qa"),
+)
+
+_graph_cache = LRUCache(maxsize=int(os.getenv("GRAPH_CACHE_SIZE", "32")))
+_mermaid_cache = LRUCache(maxsize=int(os.getenv("GRAPH_CACHE_SIZE", "32")))
+
+
+class RunCancelled(RuntimeError):
+    """A streamed run abandoned by its consumer before it finished."""
+
 
 def manager_node(state: AgentState) -> Dict[str, Any]:
     """
@@ -26,25 +48,47 @@ def manager_node(state: AgentState) -> Dict[str, Any]:
         Partial state update with manager decisions
     """
     logger.info("Executing manager node")
-    agent = ManagerAgent()
+    agent = get_agent("manager")
 
     try:
         result = agent.process(state)
+        return _manager_update(state, result)
 
-        # Modify agent_outputs in-place to avoid INVALID_CONCURRENT_GRAPH_UPDATE
-        if "agent_outputs" not in state:
-            state["agent_outputs"] = {}
-        state["agent_outputs"]["manager"] = result
+    except Exception as e:
+        return _manager_error(e)
 
-        return {
-            "current_step": state.get("current_step", 0) + 1
-        }
+
+async def amanager_node(state: AgentState) -> Dict[str, Any]:
+    """Async manager decision node."""
+    logger.info("Executing manager node (async)")
+    agent = get_agent("manager")
+
+    try:
+        result = await agent.aprocess(state)
+        return _manager_update(state, result)
 
     except Exception as e:
-        logger.error(f"Manager node error: {e}")
-        return {
-            "errors": [{"node": "manager", "error": str(e)}]
-        }
+        return _manager_error(e)
+
+
+def _manager_update(state: AgentState, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply manager result to state."""
+    # Modify agent_outputs in-place to avoid INVALID_CONCURRENT_GRAPH_UPDATE
+    if "agent_outputs" not in state:
+        state["agent_outputs"] = {}
+    state["agent_outputs"]["manager"] = result
+
+    return {
+        "current_step": state.get("current_step", 0) + 1
+    }
+
+
+def _manager_error(e: Exception) -> Dict[str, Any]:
+    """State update for a manager node failure."""
+    logger.error(f"Manager node error: {e}")
+    return {
+        "errors": [{"node": "manager", "error": str(e)}]
+    }
 
 
 def researcher_node(state: AgentState) -> Dict[str, Any]:
@@ -58,63 +102,137 @@ def researcher_node(state: AgentState) -> Dict[str, Any]:
         Partial state update with research findings
     """
     logger.info("Executing researcher node")
-    agent = ResearcherAgent()
+    agent = get_agent("researcher")
 
     try:
         result = agent.process(state)
+        return _researcher_update(state, result)
+
+    except Exception as e:
+        return _researcher_error(e)
 
-        # Modify agent_outputs in-place to avoid INVALID_CONCURRENT_GRAPH_UPDATE
-        if "agent_outputs" not in state:
-            state["agent_outputs"] = {}
-        state["agent_outputs"]["researcher"] = result
 
-        return {
-            "researcher_findings": result.get("findings")
-        }
+async def aresearcher_node(state: AgentState) -> Dict[str, Any]:
+    """Async researcher node."""
+    logger.info("Executing researcher node (async)")
+    agent = get_agent("researcher")
+
+    try:
+        result = await agent.aprocess(state)
+        return _researcher_update(state, result)
 
     except Exception as e:
-        logger.error(f"Researcher node error: {e}")
-        return {
-            "errors": [{"node": "researcher", "error": str(e)}],
-            "researcher_findings": "Error in research, using fallback data"
-        }
+        return _researcher_error(e)
+
 
+def _researcher_update(state: AgentState, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply researcher result to state."""
+    # Modify agent_outputs in-place to avoid INVALID_CONCURRENT_GRAPH_UPDATE
+    if "agent_outputs" not in state:
+        state["agent_outputs"] = {}
+    state["agent_outputs"]["researcher"] = result
 
-def writer_node(state: AgentState) -> Dict[str, Any]:
+    return {
+        "researcher_findings": result.get("findings")
+    }
+
+
+def _researcher_error(e: Exception) -> Dict[str, Any]:
+    """State update for a researcher node failure."""
+    logger.error(f"Researcher node error: {e}")
+    return {
+        "errors": [{"node": "researcher", "error": str(e)}],
+        "researcher_findings": "Error in research, using fallback data"
+    }
+
+
+def writer_node(state: AgentState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
     """
     Writer node.
 
+    When the run was started with stream_tokens, draft chunks are emitted
+    through the graph's custom stream as they are generated.
+
     Args:
         state: Current state
+        config: Run config
 
     Returns:
         Partial state update with written draft
     """
     logger.info(f"Executing writer node (retry: {state.get('retry_count', 0)})")
-    agent = WriterAgent()
+    agent = get_agent("writer")
 
     try:
-        # Get manager's adjusted prompts if available
-        manager_decision = state.get("agent_outputs", {}).get("manager", {}).get("manager_decision", {})
-        adjusted_prompt = manager_decision.get("adjusted_prompts", {}).get("writer")
+        if _stream_tokens(config):
+            on_chunk = _token_emitter(state)
+            result = agent.process_stream(state, on_chunk, custom_prompt=_writer_guidance(state))
+        else:
+            result = agent.process(state, custom_prompt=_writer_guidance(state))
+        return _writer_update(state, result)
+
+    except Exception as e:
+        return _writer_error(e)
 
-        result = agent.process(state, custom_prompt=adjusted_prompt)
 
-        # Modify agent_outputs in-place to avoid INVALID_CONCURRENT_GRAPH_UPDATE
-        if "agent_outputs" not in state:
-            state["agent_outputs"] = {}
-        state["agent_outputs"]["writer"] = result
+async def awriter_node(state: AgentState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
+    """Async writer node."""
+    logger.info(f"Executing writer node (async, retry: {state.get('retry_count', 0)})")
+    agent = get_agent("writer")
 
-        return {
-            "writer_draft": result.get("draft")
-        }
+    try:
+        if _stream_tokens(config):
+            on_chunk = _token_emitter(state)
+            result = await agent.aprocess_stream(state, on_chunk, custom_prompt=_writer_guidance(state))
+        else:
+            result = await agent.aprocess(state, custom_prompt=_writer_guidance(state))
+        return _writer_update(state, result)
 
     except Exception as e:
-        logger.error(f"Writer node error: {e}")
-        return {
-            "errors": [{"node": "writer", "error": str(e)}],
-            "writer_draft": "Error in writing, using fallback content"
-        }
+        return _writer_error(e)
+
+
+def _stream_tokens(config: Optional[RunnableConfig]) -> bool:
+    """Whether the run asked for writer tokens to be streamed."""
+    return bool((config or {}).get("configurable", {}).get("stream_tokens"))
+
+
+def _token_emitter(state: AgentState) -> Callable[[str], None]:
+    """Build a callback that emits writer chunks on the custom stream."""
+    write = get_stream_writer()
+    retry_count = state.get("retry_count", 0)
+
+    def emit(chunk: str):
+        write({"type": "token", "node": "writer", "retry_count": retry_count, "text": chunk})
+
+    return emit
+
+
+def _writer_guidance(state: AgentState) -> Any:
+    """Get manager's adjusted writer prompt if available."""
+    manager_decision = state.get("agent_outputs", {}).get("manager", {}).get("manager_decision", {})
+    return manager_decision.get("adjusted_prompts", {}).get("writer")
+
+
+def _writer_update(state: AgentState, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply writer result to state."""
+    # Modify agent_outputs in-place to avoid INVALID_CONCURRENT_GRAPH_UPDATE
+    if "agent_outputs" not in state:
+        state["agent_outputs"] = {}
+    state["agent_outputs"]["writer"] = result
+
+    return {
+        "writer_draft": result.get("draft")
+    }
+
+
+def _writer_error(e: Exception) -> Dict[str, Any]:
+    """State update for a writer node failure."""
+    logger.error(f"Writer node error: {e}")
+    return {
+        "errors": [{"node": "writer", "error": str(e)}],
+        "writer_draft": "Error in writing, using fallback content"
+    }
 
 
 def qa_node(state: AgentState) -> Dict[str, Any]:
@@ -128,42 +246,64 @@ def qa_node(state: AgentState) -> Dict[str, Any]:
         Partial state update with validation results
     """
     logger.info("Executing QA node")
-    agent = QAAgent()
+    agent = get_agent("qa")
 
     try:
         result = agent.process(state)
+        return _qa_update(state, result)
 
-        # Modify agent_outputs in-place to avoid INVALID_CONCURRENT_GRAPH_UPDATE
-        if "agent_outputs" not in state:
-            state["agent_outputs"] = {}
-        state["agent_outputs"]["qa"] = result
+    except Exception as e:
+        return _qa_error(e)
 
-        passed = result.get("passed", False)
-        updates = {
-            "validation_passed": passed,
-            "validation_feedback": result.get("feedback")
-        }
 
-        if passed:
-            updates["final_output"] = state.get("writer_draft")
-            updates["status"] = "completed"
-            logger.info("✅ Validation passed")
-        else:
-            retry_count = state.get("retry_count", 0) + 1
-            updates["retry_count"] = retry_count
-            updates["status"] = "retrying" if retry_count < 2 else "failed"
-            logger.warning(f"❌ Validation failed (retry {retry_count}/2)")
+async def aqa_node(state: AgentState) -> Dict[str, Any]:
+    """Async QA validation node."""
+    logger.info("Executing QA node (async)")
+    agent = get_agent("qa")
 
-        return updates
+    try:
+        result = await agent.aprocess(state)
+        return _qa_update(state, result)
 
     except Exception as e:
-        logger.error(f"QA node error: {e}")
-        return {
-            "errors": [{"node": "qa", "error": str(e)}],
-            "validation_passed": False,
-            "validation_feedback": f"QA error: {e}",
-            "status": "failed"
-        }
+        return _qa_error(e)
+
+
+def _qa_update(state: AgentState, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply QA result to state and decide completion or retry status."""
+    # Modify agent_outputs in-place to avoid INVALID_CONCURRENT_GRAPH_UPDATE
+    if "agent_outputs" not in state:
+        state["agent_outputs"] = {}
+    state["agent_outputs"]["qa"] = result
+
+    passed = result.get("passed", False)
+    updates = {
+        "validation_passed": passed,
+        "validation_feedback": result.get("feedback")
+    }
+
+    if passed:
+        updates["final_output"] = state.get("writer_draft")
+        updates["status"] = "completed"
+        logger.info("✅ Validation passed")
+    else:
+        retry_count = state.get("retry_count", 0) + 1
+        updates["retry_count"] = retry_count
+        updates["status"] = "retrying" if retry_count < 2 else "failed"
+        logger.warning(f"❌ Validation failed (retry {retry_count}/2)")
+
+    return updates
+
+
+def _qa_error(e: Exception) -> Dict[str, Any]:
+    """State update for a QA node failure."""
+    logger.error(f"QA node error: {e}")
+    return {
+        "errors": [{"node": "qa", "error": str(e)}],
+        "validation_passed": False,
+        "validation_feedback": f"QA error: {e}",
+        "status": "failed"
+    }
 
 
 def qa_decision(state: AgentState) -> Literal["done", "rewrite"]:
@@ -189,6 +329,74 @@ def qa_decision(state: AgentState) -> Literal["done", "rewrite"]:
     return "rewrite"
 
 
+def _progress_node(name: str, node: Callable, anode: Callable) -> RunnableLambda:
+    """
+    Wrap a node pair so it reports start/end events on the custom stream.
+
+    Outside a streaming run the stream writer is a no-op, so wrapping costs
+    nothing for invoke/ainvoke.
+
+    Args:
+        name: Node name
+        node: Sync node function
+        anode: Async node function
+
+    Returns:
+        Runnable with sync and async variants
+    """
+    pass_config = accepts_config(node)
+
+    def run(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+        write = get_stream_writer()
+        write(_node_start_event(name, state))
+        start = time.perf_counter()
+        update = node(state, config) if pass_config else node(state)
+        write(_node_end_event(name, state, update, time.perf_counter() - start))
+        return update
+
+    async def arun(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+        write = get_stream_writer()
+        write(_node_start_event(name, state))
+        start = time.perf_counter()
+        update = await (anode(state, config) if pass_config else anode(state))
+        write(_node_end_event(name, state, update, time.perf_counter() - start))
+        return update
+
+    return RunnableLambda(run, arun, name=name)
+
+
+def _node_start_event(name: str, state: AgentState) -> Dict[str, Any]:
+    """Build the event emitted when a node starts."""
+    return {
+        "type": "node_start",
+        "node": name,
+        "retry_count": state.get("retry_count", 0),
+        "timestamp": time.time()
+    }
+
+
+def _node_end_event(
+    name: str,
+    state: AgentState,
+    update: Dict[str, Any],
+    duration: float
+) -> Dict[str, Any]:
+    """Build the event emitted when a node finishes, including QA verdicts."""
+    event = {
+        "type": "node_end",
+        "node": name,
+        "duration_seconds": duration,
+        "timestamp": time.time(),
+        "errors": update.get("errors", [])
+    }
+    if name == "qa":
+        event["validation_passed"] = update.get("validation_passed", False)
+        event["validation_feedback"] = update.get("validation_feedback")
+        event["retry_count"] = update.get("retry_count", state.get("retry_count", 0))
+        event["status"] = update.get("status")
+    return event
+
+
 def build_graph(workflow: Workflow) -> Any:
     """
     Build dynamic LangGraph execution graph.
@@ -207,16 +415,15 @@ def build_graph(workflow: Workflow) -> Any:
     # Define state graph
     graph = StateGraph(AgentState)
 
-    # Add nodes
-    graph.add_node("manager", manager_node)
-    graph.add_node("researcher", researcher_node)
-    graph.add_node("writer", writer_node)
-    graph.add_node("qa", qa_node)
+    # Add nodes; each runs its sync variant under invoke and async under ainvoke
+    graph.add_node("manager", _progress_node("manager", manager_node, amanager_node))
+    graph.add_node("researcher", _progress_node("researcher", researcher_node, aresearcher_node))
+    graph.add_node("writer", _progress_node("writer", writer_node, awriter_node))
+    graph.add_node("qa", _progress_node("qa", qa_node, aqa_node))
 
     # Define edges
-    graph.add_edge(START, "manager")  # ⭐ Use START
-    graph.add_edge("manager", "researcher")
-    graph.add_edge("researcher", "writer")  # Direct path, no second manager call
+    for source, target in STATIC_EDGES:
+        graph.add_edge(source, target)
 
     # ⭐ Conditional edge: QA decides pass or retry
     graph.add_conditional_edges(
@@ -228,31 +435,126 @@ def build_graph(workflow: Workflow) -> Any:
         }
     )
 
-    graph.add_edge("writer", "qa")
-
     # ⭐ Must compile
     checkpointer = MemorySaver()
     app = graph.compile(checkpointer=checkpointer)
 
     logger.info("Graph compiled successfully")
 
-    # Generate Mermaid diagram
+    return app
+
+
+def graph_shape(workflow: Workflow) -> Tuple[Any, ...]:
+    """
+    Compute the structural cache key of a workflow's graph.
+
+    Only step roles and edges affect the compiled topology; names, prompts
+    and input data are read from state at run time.
+
+    Args:
+        workflow: Workflow definition
+
+    Returns:
+        Hashable shape key
+    """
+    roles = tuple(step.agent_role.value for step in workflow.steps)
+    return (roles, STATIC_EDGES)
+
+
+def get_compiled_graph(workflow: Workflow) -> Any:
+    """
+    Get a compiled graph for the workflow, reusing one of the same shape.
+
+    Args:
+        workflow: Workflow definition
+
+    Returns:
+        Compiled LangGraph application
+    """
+    return _graph_cache.get_or_create(graph_shape(workflow), lambda: build_graph(workflow))
+
+
+def get_graph_cache_stats() -> Dict[str, Any]:
+    """
+    Get compiled graph cache statistics.
+
+    Returns:
+        Dictionary with size, hits, misses and evictions
+    """
+    return _graph_cache.stats()
+
+
+def clear_graph_cache():
+    """Drop all cached compiled graphs and rendered diagrams."""
+    _graph_cache.clear()
+    _mermaid_cache.clear()
+
+
+def render_mermaid(workflow: Workflow) -> str:
+    """
+    Render the workflow graph as a Mermaid diagram.
+
+    Rendering is memoized per graph shape and never touches the filesystem.
+
+    Args:
+        workflow: Workflow definition
+
+    Returns:
+        Mermaid diagram source
+    """
+    return _mermaid_cache.get_or_create(
+        graph_shape(workflow),
+        lambda: get_compiled_graph(workflow).get_graph().draw_mermaid()
+    )
+
+
+def write_mermaid(workflow: Workflow, path: str = "docs/graph.mmd") -> str:
+    """
+    Write the workflow's Mermaid diagram to a file.
+
+    Intended for documentation builds (``make docs``), not the run path.
+
+    Args:
+        workflow: Workflow definition
+        path: Output file path
+
+    Returns:
+        Path the diagram was written to
+    """
+    mermaid_code = render_mermaid(workflow)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        f.write(mermaid_code)
+    logger.info(f"Mermaid diagram saved to {path}")
+    return path
+
+
+def _release_checkpoints(app: Any, thread_id: str):
+    """
+    Drop checkpoints of a finished run from a shared compiled app.
+
+    Cached apps share one MemorySaver across runs, so per-run threads must
+    be removed to keep memory bounded.
+
+    Args:
+        app: Compiled LangGraph application
+        thread_id: Thread ID used for the run
+    """
+    checkpointer = getattr(app, "checkpointer", None)
+    if checkpointer is None or not hasattr(checkpointer, "delete_thread"):
+        return
     try:
-        mermaid_code = app.get_graph().draw_mermaid()
-        import os
-        os.makedirs("docs", exist_ok=True)
-        with open("docs/graph.mmd", "w") as f:
-            f.write(mermaid_code)
-        logger.info("Mermaid diagram saved to docs/graph.mmd")
+        checkpointer.delete_thread(thread_id)
     except Exception as e:
-        logger.warning(f"Could not generate Mermaid diagram: {e}")
-
-    return app
+        logger.warning(f"Could not release checkpoints for {thread_id}: {e}")
 
 
 def execute_workflow(
     workflow: Workflow,
-    blueprint_raw: str = ""
+    blueprint_raw: str = "",
+    execution_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Execute a workflow end-to-end.
@@ -260,17 +562,182 @@ def execute_workflow(
     Args:
         workflow: Workflow to execute
         blueprint_raw: Raw blueprint string
+        execution_id: Optional pre-assigned execution ID (e.g. a queued run's ID)
 
     Returns:
         Execution result dictionary
     """
     logger.info(f"Starting workflow execution: {workflow.name}")
 
-    # Build graph
-    app = build_graph(workflow)
+    # Reuse a compiled graph of the same shape
+    app = get_compiled_graph(workflow)
+    initial_state = _initial_state(workflow, blueprint_raw, execution_id)
+
+    # Execute
+    start_time = time.time()
+
+    try:
+        result = app.invoke(initial_state, config=_run_config(initial_state))
+        return _complete_execution(workflow, blueprint_raw, initial_state, result, start_time)
+
+    except Exception as e:
+        return _fail_execution(workflow, blueprint_raw, initial_state, e, start_time)
+
+    finally:
+        _release_checkpoints(app, initial_state["execution_id"])
+
+
+async def execute_workflow_async(
+    workflow: Workflow,
+    blueprint_raw: str = "",
+    execution_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Execute a workflow end-to-end without blocking the event loop.
+
+    Uses the same compiled graph as execute_workflow; ainvoke dispatches to
+    the async node variants, which await AsyncOpenAI calls.
+
+    Args:
+        workflow: Workflow to execute
+        blueprint_raw: Raw blueprint string
+        execution_id: Optional pre-assigned execution ID
+
+    Returns:
+        Execution result dictionary
+    """
+    logger.info(f"Starting async workflow execution: {workflow.name}")
+
+    app = get_compiled_graph(workflow)
+    initial_state = _initial_state(workflow, blueprint_raw, execution_id)
+
+    start_time = time.time()
+
+    try:
+        result = await app.ainvoke(initial_state, config=_run_config(initial_state))
+        # History writes hit SQLite; keep them off the event loop
+        return await asyncio.to_thread(
+            _complete_execution, workflow, blueprint_raw, initial_state, result, start_time
+        )
+
+    except Exception as e:
+        return await asyncio.to_thread(_fail_execution, workflow, blueprint_raw, initial_state, e, start_time)
+
+    finally:
+        _release_checkpoints(app, initial_state["execution_id"])
+
+
+def stream_workflow(
+    workflow: Workflow,
+    blueprint_raw: str = ""
+) -> Iterator[Dict[str, Any]]:
+    """
+    Execute a workflow, yielding events while it runs.
+
+    Writer drafts are streamed as {"type": "token"} events, so callers see
+    output long before the run finishes. The last event is always
+    {"type": "result", "result": ...} carrying the same dictionary
+    execute_workflow returns. Closing the generator early records the run
+    as cancelled.
+
+    Args:
+        workflow: Workflow to execute
+        blueprint_raw: Raw blueprint string
+
+    Yields:
+        Event dictionaries
+    """
+    logger.info(f"Starting streaming workflow execution: {workflow.name}")
+
+    app = get_compiled_graph(workflow)
+    initial_state = _initial_state(workflow, blueprint_raw)
+    final_state: Dict[str, Any] = initial_state
+
+    start_time = time.time()
+
+    try:
+        for mode, payload in app.stream(
+            initial_state,
+            config=_run_config(initial_state, stream_tokens=True),
+            stream_mode=["custom", "values"]
+        ):
+            if mode == "values":
+                final_state = payload
+            else:
+                yield payload
+        result = _complete_execution(workflow, blueprint_raw, initial_state, final_state, start_time)
+
+    except GeneratorExit:
+        # Consumer stopped listening (e.g. client disconnected)
+        _fail_execution(workflow, blueprint_raw, initial_state, RunCancelled("Run cancelled by client"), start_time)
+        raise
+
+    except Exception as e:
+        result = _fail_execution(workflow, blueprint_raw, initial_state, e, start_time)
+
+    finally:
+        _release_checkpoints(app, initial_state["execution_id"])
+
+    yield {"type": "result", "result": result}
+
+
+async def astream_workflow(
+    workflow: Workflow,
+    blueprint_raw: str = ""
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Async variant of stream_workflow.
+
+    Args:
+        workflow: Workflow to execute
+        blueprint_raw: Raw blueprint string
+
+    Yields:
+        Event dictionaries
+    """
+    logger.info(f"Starting async streaming workflow execution: {workflow.name}")
+
+    app = get_compiled_graph(workflow)
+    initial_state = _initial_state(workflow, blueprint_raw)
+    final_state: Dict[str, Any] = initial_state
+
+    start_time = time.time()
+
+    try:
+        async for mode, payload in app.astream(
+            initial_state,
+            config=_run_config(initial_state, stream_tokens=True),
+            stream_mode=["custom", "values"]
+        ):
+            if mode == "values":
+                final_state = payload
+            else:
+                yield payload
+        result = await asyncio.to_thread(
+            _complete_execution, workflow, blueprint_raw, initial_state, final_state, start_time
+        )
+
+    except (GeneratorExit, asyncio.CancelledError):
+        # Consumer stopped listening (e.g. client disconnected)
+        _fail_execution(workflow, blueprint_raw, initial_state, RunCancelled("Run cancelled by client"), start_time)
+        raise
 
-    # Initialize state
-    initial_state = {
+    except Exception as e:
+        result = await asyncio.to_thread(_fail_execution, workflow, blueprint_raw, initial_state, e, start_time)
+
+    finally:
+        _release_checkpoints(app, initial_state["execution_id"])
+
+    yield {"type": "result", "result": result}
+
+
+def _initial_state(
+    workflow: Workflow,
+    blueprint_raw: str,
+    execution_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build the initial graph state for a run."""
+    return {
         "workflow": workflow,
         "blueprint_raw": blueprint_raw or workflow.name,
         "current_step": 0,
@@ -281,82 +748,102 @@ def execute_workflow(
         "validation_passed": False,
         "validation_feedback": None,
         "retry_count": 0,
-        "execution_id": str(uuid.uuid4()),
+        "execution_id": execution_id or str(uuid.uuid4()),
         "start_time": time.time(),
         "errors": [],
         "final_output": None,
         "status": "running"
     }
 
-    # Execute
-    start_time = time.time()
-    memory_manager = MemoryManager()
 
-    try:
-        # Run graph with increased recursion limit for retry loops
-        config = {
-            "configurable": {"thread_id": initial_state["execution_id"]},
-            "recursion_limit": 50  # Allow for retries and complex workflows
-        }
-        result = app.invoke(initial_state, config=config)
-
-        duration = time.time() - start_time
-        success = result.get("status") == "completed"
-
-        # Record execution
-        record = ExecutionRecord(
-            id=initial_state["execution_id"],
-            workflow_name=workflow.name,
-            blueprint=blueprint_raw,
-            success=success,
-            error_type=None if success else "validation_failed",
-            error_message=None if success else result.get("validation_feedback"),
-            retry_count=result.get("retry_count", 0),
-            duration_seconds=duration,
-            timestamp=datetime.now(),
-            learned_adjustments=None
-        )
-        memory_manager.record_execution(record)
-
-        logger.info(f"Workflow execution completed: {workflow.name} ({'SUCCESS' if success else 'FAILED'})")
-
-        return {
-            "success": success,
-            "final_output": result.get("final_output"),
-            "status": result.get("status"),
-            "retry_count": result.get("retry_count", 0),
-            "validation_passed": result.get("validation_passed", False),
-            "validation_feedback": result.get("validation_feedback"),
-            "duration_seconds": duration,
-            "execution_id": initial_state["execution_id"],
-            "agent_outputs": result.get("agent_outputs", {}),
-            "errors": result.get("errors", [])
-        }
+def _run_config(initial_state: Dict[str, Any], stream_tokens: bool = False) -> Dict[str, Any]:
+    """Build the graph run config for a run."""
+    # Run graph with increased recursion limit for retry loops
+    return {
+        "configurable": {
+            "thread_id": initial_state["execution_id"],
+            "stream_tokens": stream_tokens
+        },
+        "recursion_limit": 50  # Allow for retries and complex workflows
+    }
 
-    except Exception as e:
-        duration = time.time() - start_time
-        logger.error(f"Workflow execution error: {e}")
-
-        # Record failure
-        record = ExecutionRecord(
-            id=initial_state["execution_id"],
-            workflow_name=workflow.name,
-            blueprint=blueprint_raw,
-            success=False,
-            error_type=type(e).__name__,
-            error_message=str(e),
-            retry_count=0,
-            duration_seconds=duration,
-            timestamp=datetime.now(),
-            learned_adjustments=None
-        )
-        memory_manager.record_execution(record)
-
-        return {
-            "success": False,
-            "final_output": None,
-            "status": "error",
-            "error": str(e),
-            "duration_seconds": duration,
-            "execution_id": initial_state["execution_id"]
-        }
+
+def _complete_execution(
+    workflow: Workflow,
+    blueprint_raw: str,
+    initial_state: Dict[str, Any],
+    result: Dict[str, Any],
+    start_time: float
+) -> Dict[str, Any]:
+    """Record a finished run and build its result dictionary."""
+    duration = time.time() - start_time
+    success = result.get("status") == "completed"
+
+    # Record execution
+    record = ExecutionRecord(
+        id=initial_state["execution_id"],
+        workflow_name=workflow.name,
+        blueprint=blueprint_raw,
+        success=success,
+        error_type=None if success else "validation_failed",
+        error_message=None if success else result.get("validation_feedback"),
+        retry_count=result.get("retry_count", 0),
+        duration_seconds=duration,
+        timestamp=datetime.now(),
+        learned_adjustments=None,
+        failed_checks=[] if success else result.get("agent_outputs", {}).get("qa", {}).get("failed_checks", []),
+        final_output=result.get("final_output"),
+        validation_feedback=result.get("validation_feedback")
+    )
+    get_memory_manager().record_execution(record)
+
+    logger.info(f"Workflow execution completed: {workflow.name} ({'SUCCESS' if success else 'FAILED'})")
+
+    return {
+        "success": success,
+        "final_output": result.get("final_output"),
+        "status": result.get("status"),
+        "retry_count": result.get("retry_count", 0),
+        "validation_passed": result.get("validation_passed", False),
+        "validation_feedback": result.get("validation_feedback"),
+        "duration_seconds": duration,
+        "execution_id": initial_state["execution_id"],
+        "agent_outputs": result.get("agent_outputs", {}),
+        "errors": result.get("errors", [])
+    }
+
+
+def _fail_execution(
+    workflow: Workflow,
+    blueprint_raw: str,
+    initial_state: Dict[str, Any],
+    error: Exception,
+    start_time: float
+) -> Dict[str, Any]:
+    """Record a run that raised and build its error result."""
+    duration = time.time() - start_time
+    logger.error(f"Workflow execution error: {error}")
+
+    # Record failure
+    record = ExecutionRecord(
+        id=initial_state["execution_id"],
+        workflow_name=workflow.name,
+        blueprint=blueprint_raw,
+        success=False,
+        error_type=type(error).__name__,
+        error_message=str(error),
+        retry_count=0,
+        duration_seconds=duration,
+        timestamp=datetime.now(),
+        learned_adjustments=None
+    )
+    get_memory_manager().record_execution(record)
+
+    return {
+        "success": False,
+        "final_output": None,
+        "status": "error",
+        "error": str(error),
+        "duration_seconds": duration,
+        "execution_id": initial_state["execution_id"]
+    }
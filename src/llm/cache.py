@@ -0,0 +1,314 @@
+"""Content-addressed LLM response cache with memory and SQLite tiers."""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+from src.core.db import get_connection_pool
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+# Bump to orphan every persisted entry (v1 keys did not distinguish mock responses)
+KEY_VERSION = 2
+
+
+def make_cache_key(
+    model: str,
+    system_prompt: Optional[str],
+    prompt: str,
+    temperature: float,
+    json_mode: bool,
+    max_tokens: int,
+    mock: bool = False
+) -> str:
+    """
+    Hash every request parameter that affects the completion.
+
+    Args:
+        model: Model name
+        system_prompt: System prompt
+        prompt: User prompt
+        temperature: Sampling temperature
+        json_mode: Whether JSON output is enforced
+        max_tokens: Maximum tokens in response
+        mock: Whether the response comes from mock mode, so it is never served as a real completion
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps(
+        [KEY_VERSION, "mock" if mock else "live", model, system_prompt or "", prompt, temperature, json_mode,
+         max_tokens],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier response cache.
+
+    Lookups hit a bounded in-process LRU first, then an optional SQLite file
+    shared across processes. Disk hits are promoted into memory. Entries in
+    both tiers expire after ttl_seconds. The SQLite tier uses the pooled
+    per-thread connections; async callers reach it through aget/aset,
+    which run disk I/O in a worker thread.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        db_path: Optional[str] = None,
+        ttl_seconds: float = 86400
+    ):
+        """
+        Initialize response cache.
+
+        Args:
+            maxsize: Maximum entries kept in memory
+            db_path: Optional SQLite path for the persistent tier
+            ttl_seconds: Entry lifetime in seconds
+        """
+        self.maxsize = max(1, maxsize)
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._pool = get_connection_pool(db_path) if db_path else None
+
+        if self._pool is not None:
+            self._init_db()
+
+    def _init_db(self):
+        """Initialize the persistent cache table."""
+        self._pool.connection().execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT,
+                created_at REAL,
+                expires_at REAL
+            )
+        """)
+        logger.info(f"LLM response cache persisted at {self.db_path}")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        now = time.time()
+        response = self._get_memory(key, now)
+        if response is None and self._pool is not None:
+            response = self._get_disk(key, now)
+        if response is None:
+            self._count_miss()
+        return response
+
+    async def aget(self, key: str) -> Optional[str]:
+        """
+        Async variant of get that keeps SQLite reads off the event loop.
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        now = time.time()
+        response = self._get_memory(key, now)
+        if response is None and self._pool is not None:
+            response = await asyncio.to_thread(self._get_disk, key, now)
+        if response is None:
+            self._count_miss()
+        return response
+
+    def set(self, key: str, response: str):
+        """
+        Store a response in every tier.
+
+        Args:
+            key: Cache key from make_cache_key
+            response: Response text
+        """
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+
+        with self._lock:
+            self._store_memory(key, response, expires_at)
+
+        if self._pool is not None:
+            self._set_disk(key, response, now, expires_at)
+
+    async def aset(self, key: str, response: str):
+        """
+        Async variant of set that keeps SQLite writes off the event loop.
+
+        Args:
+            key: Cache key from make_cache_key
+            response: Response text
+        """
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+
+        with self._lock:
+            self._store_memory(key, response, expires_at)
+
+        if self._pool is not None:
+            await asyncio.to_thread(self._set_disk, key, response, now, expires_at)
+
+    def _get_memory(self, key: str, now: float) -> Optional[str]:
+        """Look up the memory tier, dropping an expired entry."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            response, expires_at = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return response
+            del self._memory[key]
+            return None
+
+    def _get_disk(self, key: str, now: float) -> Optional[str]:
+        """Look up the SQLite tier, promoting a hit into memory."""
+        row = self._pool.connection().execute(
+            "SELECT response, expires_at FROM llm_cache WHERE key = ? AND expires_at > ?",
+            (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+            self._store_memory(key, row[0], row[1])
+        return row[0]
+
+    def _set_disk(self, key: str, response: str, created_at: float, expires_at: float):
+        """Write one entry to the SQLite tier."""
+        self._pool.connection().execute(
+            "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?)",
+            (key, response, created_at, expires_at)
+        )
+
+    def _count_miss(self):
+        """Record a lookup that missed every tier."""
+        with self._lock:
+            self.misses += 1
+
+    def _store_memory(self, key: str, response: str, expires_at: float):
+        """Insert into the memory tier, evicting the LRU entry if full. Caller holds the lock."""
+        self._memory[key] = (response, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """
+        Delete expired entries from the persistent tier.
+
+        Returns:
+            Number of rows deleted
+        """
+        if self._pool is None:
+            return 0
+
+        cursor = self._pool.connection().execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+        return cursor.rowcount
+
+    def clear(self):
+        """Drop all entries from every tier and reset counters."""
+        with self._lock:
+            self._memory.clear()
+            self.memory_hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+
+        if self._pool is not None:
+            self._pool.connection().execute("DELETE FROM llm_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counters and hit rate
+        """
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "enabled": True,
+                "size": len(self._memory),
+                "maxsize": self.maxsize,
+                "persistent": bool(self.db_path),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (hits / lookups) if lookups else 0.0
+            }
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def cache_enabled() -> bool:
+    """Whether response caching is turned on (LLM_CACHE=1)."""
+    return os.getenv("LLM_CACHE", "0") == "1"
+
+
+def cached_agent_roles() -> Set[str]:
+    """
+    Agent roles whose responses may be cached (LLM_CACHE_AGENTS).
+
+    Returns:
+        Set of role names; empty when caching is disabled
+    """
+    if not cache_enabled():
+        return set()
+    roles = os.getenv("LLM_CACHE_AGENTS", "manager,researcher")
+    return {role.strip() for role in roles.split(",") if role.strip()}
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the process-wide response cache configured from the environment.
+
+    Returns:
+        Shared ResponseCache, or None when caching is disabled
+    """
+    global _cache
+
+    if not cache_enabled():
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(
+                    maxsize=int(os.getenv("LLM_CACHE_SIZE", "1024")),
+                    db_path=os.getenv("LLM_CACHE_DB") or None,
+                    ttl_seconds=float(os.getenv("LLM_CACHE_TTL", "86400"))
+                )
+    return _cache
+
+
+def reset_response_cache():
+    """Forget the process-wide cache so the next lookup re-reads configuration."""
+    global _cache
+    with _cache_lock:
+        _cache = None
@@ -1,9 +1,16 @@
 """LLM client wrapper for OpenAI."""
 import os
+import re
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, AsyncIterator, List
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+from src.llm.cache import get_response_cache, make_cache_key
+from src.llm.singleflight import get_singleflight
+from src.llm.retry import get_retry_policy, get_hedge_policy
+from src.llm.rate_limit import get_rate_limiter, estimate_tokens
+from src.llm.http_client import get_openai_client, get_async_openai_client, get_connection_stats
+from src.llm.usage import get_usage_counter
 from src.utils.logging import setup_logger
 
 load_dotenv()
@@ -23,6 +30,17 @@ class LLMClient:
         """
         self.model = model
         self.mock = mock or os.getenv("MOCK", "0") == "1"
+        self.client: Optional[OpenAI] = None
+        self._api_key: Optional[str] = None
+        self.cache = get_response_cache()
+        # Coalesce identical concurrent requests (LLM_SINGLEFLIGHT=0 disables)
+        self.singleflight = get_singleflight() if os.getenv("LLM_SINGLEFLIGHT", "1") == "1" else None
+        self.rate_limiter = get_rate_limiter()
+        self.retry_policy = get_retry_policy()
+        self.hedge_policy = get_hedge_policy()
+        self.usage = get_usage_counter()
+        # Serve mock text when the API fails (LLM_MOCK_FALLBACK=1); otherwise errors propagate
+        self.mock_fallback = os.getenv("LLM_MOCK_FALLBACK", "0") == "1"
 
         if not self.mock:
             api_key = os.getenv("OPENAI_API_KEY")
@@ -30,18 +48,27 @@ class LLMClient:
                 logger.warning("No OPENAI_API_KEY found, falling back to mock mode")
                 self.mock = True
             else:
-                self.client = OpenAI(api_key=api_key)
+                # Pooled clients are shared process-wide, not per instance
+                self._api_key = api_key
+                self.client = get_openai_client(api_key)
         else:
-            self.client = None
             logger.info("LLM client running in MOCK mode")
 
+    @property
+    def async_client(self) -> Optional[AsyncOpenAI]:
+        """Pooled AsyncOpenAI client for the running event loop."""
+        if self._api_key is None:
+            return None
+        return get_async_openai_client(self._api_key)
+
     def generate(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         json_mode: bool = False,
         temperature: float = 0.7,
-        max_tokens: int = 2000
+        max_tokens: int = 2000,
+        use_cache: bool = False
     ) -> str:
         """
         Generate text completion.
@@ -52,32 +79,307 @@ class LLMClient:
             json_mode: Whether to enforce JSON output
             temperature: Sampling temperature
             max_tokens: Maximum tokens in response
+            use_cache: Whether this call may be served from the response cache
 
         Returns:
             Generated text
         """
-        if self.mock:
+        key = make_cache_key(self.model, system_prompt, prompt, temperature, json_mode, max_tokens, mock=self.mock)
+        cache = self.cache if use_cache else None
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        kwargs = self._completion_kwargs(prompt, system_prompt, json_mode, temperature, max_tokens)
+        try:
+            if self.singleflight is not None:
+                text = self.singleflight.do(key, lambda: self._request(kwargs))
+            else:
+                text = self._request(kwargs)
+        except Exception as e:
+            logger.error(f"LLM API error: {e}")
+            if not self.mock_fallback:
+                raise
+            logger.warning("Falling back to mock response (LLM_MOCK_FALLBACK=1)")
             return self._mock_response(prompt, json_mode)
 
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
+        if cache is not None:
+            cache.set(key, text)
+        return text
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        json_mode: bool = False,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        use_cache: bool = False
+    ) -> str:
+        """
+        Generate text completion without blocking the event loop.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            json_mode: Whether to enforce JSON output
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            use_cache: Whether this call may be served from the response cache
 
+        Returns:
+            Generated text
+        """
+        key = make_cache_key(self.model, system_prompt, prompt, temperature, json_mode, max_tokens, mock=self.mock)
+        cache = self.cache if use_cache else None
+        if cache is not None:
+            cached = await cache.aget(key)
+            if cached is not None:
+                return cached
+
+        kwargs = self._completion_kwargs(prompt, system_prompt, json_mode, temperature, max_tokens)
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                response_format={"type": "json_object"} if json_mode else {"type": "text"}
-            )
-            return response.choices[0].message.content
+            if self.singleflight is not None:
+                text = await self.singleflight.ado(key, lambda: self._arequest(kwargs))
+            else:
+                text = await self._arequest(kwargs)
         except Exception as e:
             logger.error(f"LLM API error: {e}")
-            logger.warning("Falling back to mock response")
+            if not self.mock_fallback:
+                raise
+            logger.warning("Falling back to mock response (LLM_MOCK_FALLBACK=1)")
             return self._mock_response(prompt, json_mode)
 
+        if cache is not None:
+            await cache.aset(key, text)
+        return text
+
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        use_cache: bool = False
+    ) -> Iterator[str]:
+        """
+        Generate a text completion incrementally.
+
+        Opening the stream is retried like a normal request; once chunks
+        have been yielded, errors propagate because output cannot be retracted.
+        Closing the generator early closes the upstream response.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            use_cache: Whether this call may be served from the response cache
+
+        Yields:
+            Text chunks in order; joined they form the full completion
+        """
+        key = make_cache_key(self.model, system_prompt, prompt, temperature, False, max_tokens, mock=self.mock)
+        cache = self.cache if use_cache else None
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        if self.mock:
+            yield from self._chunk_text(self._mock_completion(prompt, False))
+            return
+
+        kwargs = self._completion_kwargs(prompt, system_prompt, False, temperature, max_tokens)
+        try:
+            stream = self.retry_policy.call(lambda: self._open_stream(kwargs))
+        except Exception as e:
+            logger.error(f"LLM API error: {e}")
+            if not self.mock_fallback:
+                raise
+            logger.warning("Falling back to mock response (LLM_MOCK_FALLBACK=1)")
+            yield from self._chunk_text(self._mock_response(prompt, False))
+            return
+
+        chunks: List[str] = []
+        try:
+            for chunk in stream:
+                self.usage.record_usage(getattr(chunk, "usage", None))
+                text = self._chunk_content(chunk)
+                if text:
+                    chunks.append(text)
+                    yield text
+        finally:
+            # Release the pooled connection even if the consumer stops early
+            stream.close()
+
+        if cache is not None:
+            cache.set(key, "".join(chunks))
+
+    async def agenerate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        use_cache: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Async variant of generate_stream.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            use_cache: Whether this call may be served from the response cache
+
+        Yields:
+            Text chunks in order; joined they form the full completion
+        """
+        key = make_cache_key(self.model, system_prompt, prompt, temperature, False, max_tokens, mock=self.mock)
+        cache = self.cache if use_cache else None
+        if cache is not None:
+            cached = await cache.aget(key)
+            if cached is not None:
+                yield cached
+                return
+
+        if self.mock:
+            for text in self._chunk_text(self._mock_completion(prompt, False)):
+                yield text
+            return
+
+        kwargs = self._completion_kwargs(prompt, system_prompt, False, temperature, max_tokens)
+        try:
+            stream = await self.retry_policy.acall(lambda: self._aopen_stream(kwargs))
+        except Exception as e:
+            logger.error(f"LLM API error: {e}")
+            if not self.mock_fallback:
+                raise
+            logger.warning("Falling back to mock response (LLM_MOCK_FALLBACK=1)")
+            for text in self._chunk_text(self._mock_response(prompt, False)):
+                yield text
+            return
+
+        chunks: List[str] = []
+        try:
+            async for chunk in stream:
+                self.usage.record_usage(getattr(chunk, "usage", None))
+                text = self._chunk_content(chunk)
+                if text:
+                    chunks.append(text)
+                    yield text
+        finally:
+            # Release the pooled connection even if the consumer stops early
+            await stream.close()
+
+        if cache is not None:
+            await cache.aset(key, "".join(chunks))
+
+    def _request(self, kwargs: Dict[str, Any]) -> str:
+        """Perform an upstream completion with retries and hedging (or mock response)."""
+        if self.mock:
+            return self._mock_completion(kwargs["messages"][-1]["content"], self._is_json(kwargs))
+
+        return self.retry_policy.call(lambda: self.hedge_policy.call(lambda: self._call_api(kwargs)))
+
+    async def _arequest(self, kwargs: Dict[str, Any]) -> str:
+        """Perform an async upstream completion with retries and hedging (or mock response)."""
+        if self.mock:
+            return self._mock_completion(kwargs["messages"][-1]["content"], self._is_json(kwargs))
+
+        return await self.retry_policy.acall(
+            lambda: self.hedge_policy.acall(lambda: self._acall_api(kwargs))
+        )
+
+    def _call_api(self, kwargs: Dict[str, Any]) -> str:
+        """Send one rate-limited chat completion request."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(estimate_tokens(kwargs["messages"], kwargs["max_tokens"]))
+
+        response = self.client.chat.completions.create(**kwargs)
+        self.usage.record_usage(response.usage)
+        return response.choices[0].message.content
+
+    async def _acall_api(self, kwargs: Dict[str, Any]) -> str:
+        """Send one rate-limited async chat completion request."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.aacquire(estimate_tokens(kwargs["messages"], kwargs["max_tokens"]))
+
+        response = await self.async_client.chat.completions.create(**kwargs)
+        self.usage.record_usage(response.usage)
+        return response.choices[0].message.content
+
+    def _open_stream(self, kwargs: Dict[str, Any]) -> Any:
+        """Open one rate-limited streaming chat completion."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(estimate_tokens(kwargs["messages"], kwargs["max_tokens"]))
+
+        return self.client.chat.completions.create(
+            stream=True,
+            stream_options={"include_usage": True},
+            **kwargs
+        )
+
+    async def _aopen_stream(self, kwargs: Dict[str, Any]) -> Any:
+        """Open one rate-limited async streaming chat completion."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.aacquire(estimate_tokens(kwargs["messages"], kwargs["max_tokens"]))
+
+        return await self.async_client.chat.completions.create(
+            stream=True,
+            stream_options={"include_usage": True},
+            **kwargs
+        )
+
+    @staticmethod
+    def _chunk_content(chunk: Any) -> str:
+        """Extract the text delta from a streamed completion chunk."""
+        if not chunk.choices:
+            return ""
+        return chunk.choices[0].delta.content or ""
+
+    @staticmethod
+    def _chunk_text(text: str) -> List[str]:
+        """Split text into word-sized chunks (mock streaming)."""
+        return re.findall(r"\S+\s*|\s+", text) or [text]
+
+    @staticmethod
+    def _is_json(kwargs: Dict[str, Any]) -> bool:
+        """Whether request arguments enforce JSON output."""
+        return kwargs["response_format"]["type"] == "json_object"
+
+    def _completion_kwargs(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        json_mode: bool,
+        temperature: float,
+        max_tokens: int
+    ) -> Dict[str, Any]:
+        """Build chat completion request arguments."""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "response_format": {"type": "json_object"} if json_mode else {"type": "text"}
+        }
+
+    def _mock_completion(self, prompt: str, json_mode: bool) -> str:
+        """Serve a mock response in place of an API call, recording estimated usage."""
+        text = self._mock_response(prompt, json_mode)
+        self.usage.record(len(prompt) // 4, len(text) // 4)
+        return text
+
     def _mock_response(self, prompt: str, json_mode: bool) -> str:
         """Generate mock response for testing."""
         if json_mode:
@@ -251,3 +553,23 @@ def get_llm_client(model: str = "gpt-4o-mini", mock: bool = False) -> LLMClient:
         LLMClient instance
     """
     return LLMClient(model=model, mock=mock)
+
+
+def get_llm_metrics() -> Dict[str, Any]:
+    """
+    Get process-wide LLM client metrics.
+
+    Returns:
+        Dictionary of metrics per subsystem
+    """
+    cache = get_response_cache()
+    limiter = get_rate_limiter()
+    return {
+        "cache": cache.stats() if cache else {"enabled": False},
+        "singleflight": get_singleflight().stats(),
+        "connections": get_connection_stats(),
+        "rate_limiter": limiter.stats() if limiter else {"enabled": False},
+        "retry": get_retry_policy().stats(),
+        "hedge": get_hedge_policy().stats(),
+        "usage": get_usage_counter().snapshot()
+    }
@@ -0,0 +1,207 @@
+"""Process-wide pooled HTTP clients for the OpenAI API."""
+import asyncio
+import importlib.util
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from openai import OpenAI, AsyncOpenAI
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class ConnectionStats:
+    """
+    Count requests and new connections via httpcore trace events.
+
+    A request that does not open a TCP connection reused a pooled one.
+    """
+
+    def __init__(self):
+        """Initialize counters."""
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+
+    def _record(self, event_name: str):
+        """Update counters for one trace event."""
+        with self._lock:
+            if event_name == "connection.connect_tcp.complete":
+                self.connections_opened += 1
+            elif event_name == "connection.start_tls.complete":
+                self.tls_handshakes += 1
+            elif event_name.endswith(".send_request_headers.started"):
+                self.requests += 1
+
+    def trace(self, event_name: str, info: Dict[str, Any]):
+        """Sync httpcore trace callback."""
+        self._record(event_name)
+
+    async def atrace(self, event_name: str, info: Dict[str, Any]):
+        """Async httpcore trace callback."""
+        self._record(event_name)
+
+    def on_request(self, request: httpx.Request):
+        """Sync httpx request hook attaching the trace callback."""
+        request.extensions["trace"] = self.trace
+
+    async def aon_request(self, request: httpx.Request):
+        """Async httpx request hook attaching the trace callback."""
+        request.extensions["trace"] = self.atrace
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get connection reuse statistics.
+
+        Returns:
+            Dictionary with request/connection counts and reuse ratio
+        """
+        with self._lock:
+            reused = max(0, self.requests - self.connections_opened)
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "tls_handshakes": self.tls_handshakes,
+                "reused_requests": reused,
+                "reuse_ratio": (reused / self.requests) if self.requests else 0.0
+            }
+
+
+def http_settings() -> Dict[str, Any]:
+    """
+    Read HTTP pool settings from the environment.
+
+    Returns:
+        Dictionary of pool limits, timeouts and protocol options
+    """
+    http2 = os.getenv("LLM_HTTP2", "0") == "1"
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("LLM_HTTP2=1 but the 'h2' package is not installed, using HTTP/1.1")
+        http2 = False
+
+    return {
+        "base_url": os.getenv("OPENAI_BASE_URL") or None,
+        "max_connections": int(os.getenv("LLM_MAX_CONNECTIONS", "100")),
+        "max_keepalive_connections": int(os.getenv("LLM_MAX_KEEPALIVE", "20")),
+        "keepalive_expiry": float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30")),
+        "http2": http2,
+        "connect_timeout": float(os.getenv("LLM_CONNECT_TIMEOUT", "10")),
+        "read_timeout": float(os.getenv("LLM_READ_TIMEOUT", "60")),
+    }
+
+
+def _client_kwargs(settings: Dict[str, Any]) -> Dict[str, Any]:
+    """Build shared httpx client arguments from settings."""
+    return {
+        "limits": httpx.Limits(
+            max_connections=settings["max_connections"],
+            max_keepalive_connections=settings["max_keepalive_connections"],
+            keepalive_expiry=settings["keepalive_expiry"]
+        ),
+        "timeout": httpx.Timeout(
+            settings["read_timeout"],
+            connect=settings["connect_timeout"]
+        ),
+        "http2": settings["http2"],
+    }
+
+
+_stats = ConnectionStats()
+_lock = threading.Lock()
+_sync_clients: Dict[Tuple[str, Optional[str]], OpenAI] = {}
+# Async clients hold connections bound to an event loop, so keep one per loop
+_async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def get_openai_client(api_key: str) -> OpenAI:
+    """
+    Get the process-wide pooled OpenAI client.
+
+    Args:
+        api_key: OpenAI API key
+
+    Returns:
+        Shared OpenAI client
+    """
+    settings = http_settings()
+    key = (api_key, settings["base_url"])
+
+    client = _sync_clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _sync_clients.get(key)
+        if client is None:
+            http_client = httpx.Client(
+                event_hooks={"request": [_stats.on_request]},
+                **_client_kwargs(settings)
+            )
+            # Retries are handled by src.llm.retry, not the SDK
+            client = OpenAI(
+                api_key=api_key,
+                base_url=settings["base_url"],
+                http_client=http_client,
+                max_retries=0
+            )
+            _sync_clients[key] = client
+            logger.info(
+                f"Created pooled OpenAI client (max_connections={settings['max_connections']}, "
+                f"http2={settings['http2']})"
+            )
+        return client
+
+
+def get_async_openai_client(api_key: str) -> AsyncOpenAI:
+    """
+    Get the pooled AsyncOpenAI client for the running event loop.
+
+    Args:
+        api_key: OpenAI API key
+
+    Returns:
+        AsyncOpenAI client shared by all callers on this loop
+    """
+    settings = http_settings()
+    key = (api_key, settings["base_url"])
+    loop = asyncio.get_running_loop()
+
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            http_client = httpx.AsyncClient(
+                event_hooks={"request": [_stats.aon_request]},
+                **_client_kwargs(settings)
+            )
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=settings["base_url"],
+                http_client=http_client,
+                max_retries=0
+            )
+            clients[key] = client
+        return client
+
+
+def get_connection_stats() -> Dict[str, Any]:
+    """
+    Get connection reuse statistics for all pooled clients.
+
+    Returns:
+        Dictionary with request/connection counts and reuse ratio
+    """
+    return _stats.snapshot()
+
+
+def reset_openai_clients():
+    """Close pooled sync clients and forget all clients so settings are re-read."""
+    with _lock:
+        for client in _sync_clients.values():
+            client.close()
+        _sync_clients.clear()
+        _async_clients.clear()
@@ -0,0 +1,188 @@
+"""Token-bucket rate limiting for requests-per-minute and tokens-per-minute."""
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a per-minute rate.
+
+    Callers reserve capacity up front; when the bucket is empty the balance
+    goes negative and the caller is told how long to wait. Reservations are
+    served strictly in arrival order, which queues callers fairly instead of
+    letting them race.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialize bucket.
+
+        Args:
+            per_minute: Refill rate per minute
+            capacity: Burst size (defaults to one minute of refill)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Reserve capacity. Caller must hold the limiter lock.
+
+        Args:
+            amount: Units to consume (capped at capacity so it can always be served)
+            now: Current monotonic time
+
+        Returns:
+            Seconds to wait before the reservation is usable
+        """
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= min(amount, self.capacity)
+        return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+
+class RateLimiter:
+    """
+    Combined request and token rate limiter shared across threads and tasks.
+
+    acquire() blocks the calling thread and aacquire() suspends the calling
+    task until both buckets allow the call, so throttled calls queue rather
+    than fail.
+    """
+
+    def __init__(self, rpm: float = 0, tpm: float = 0):
+        """
+        Initialize limiter.
+
+        Args:
+            rpm: Requests per minute (0 disables the request bucket)
+            tpm: Tokens per minute (0 disables the token bucket)
+        """
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _reserve(self, tokens: int) -> float:
+        """Reserve one request and tokens; return the wait in seconds."""
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            if self.requests is not None:
+                wait = max(wait, self.requests.reserve(1, now))
+            if self.tokens is not None:
+                wait = max(wait, self.tokens.reserve(tokens, now))
+
+            self.acquired += 1
+            if wait > 0:
+                self.throttled += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            return wait
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Block until a call of the given size may proceed.
+
+        Args:
+            tokens: Estimated tokens for the call
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        """
+        Async variant of acquire.
+
+        Args:
+            tokens: Estimated tokens for the call
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get throttling statistics.
+
+        Returns:
+            Dictionary with throttle events and queue wait times
+        """
+        with self._lock:
+            return {
+                "enabled": True,
+                "rpm": self.requests.rate * 60 if self.requests else None,
+                "tpm": self.tokens.rate * 60 if self.tokens else None,
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "total_wait_seconds": self.total_wait,
+                "avg_wait_seconds": (self.total_wait / self.throttled) if self.throttled else 0.0,
+                "max_wait_seconds": self.max_wait
+            }
+
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """
+    Estimate the tokens a chat completion counts against TPM limits.
+
+    Providers charge the prompt plus the requested completion budget, so
+    this is prompt characters / 4 (a common heuristic) plus max_tokens.
+
+    Args:
+        messages: Chat messages
+        max_tokens: Completion token budget
+
+    Returns:
+        Estimated token count
+    """
+    prompt_chars = sum(len(message.get("content") or "") for message in messages)
+    return prompt_chars // 4 + max_tokens
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Get the process-wide rate limiter configured by LLM_RPM / LLM_TPM.
+
+    Returns:
+        Shared RateLimiter, or None when no limit is configured
+    """
+    global _limiter
+
+    rpm = float(os.getenv("LLM_RPM", "0"))
+    tpm = float(os.getenv("LLM_TPM", "0"))
+    if rpm <= 0 and tpm <= 0:
+        return None
+
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter(rpm=rpm, tpm=tpm)
+    return _limiter
+
+
+def reset_rate_limiter():
+    """Forget the process-wide limiter so the next lookup re-reads configuration."""
+    global _limiter
+    with _limiter_lock:
+        _limiter = None
@@ -0,0 +1,397 @@
+"""Retry with backoff and request hedging for LLM calls."""
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import openai
+from src.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether an error is transient and worth retrying.
+
+    Args:
+        error: Exception raised by the OpenAI client
+
+    Returns:
+        True for timeouts, connection errors, rate limits and 5xx responses
+    """
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    return False
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Read a Retry-After header (seconds) from an API error, if present."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, bounded by attempts and a deadline.
+
+    The delay before attempt n+1 is uniform in [0, min(max_delay, base_delay * 2**n)],
+    or the server's Retry-After if larger. A retry is skipped when its delay
+    would overrun the overall deadline.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        deadline: float = 120.0
+    ):
+        """
+        Initialize retry policy.
+
+        Args:
+            max_attempts: Total attempts including the first
+            base_delay: Backoff base in seconds
+            max_delay: Backoff cap in seconds
+            deadline: Overall time budget in seconds across all attempts
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.exhausted = 0
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Build a policy from LLM_RETRY_* environment variables."""
+        return cls(
+            max_attempts=int(os.getenv("LLM_RETRY_ATTEMPTS", "3")),
+            base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5")),
+            max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY", "8")),
+            deadline=float(os.getenv("LLM_RETRY_DEADLINE", "120"))
+        )
+
+    def _next_delay(self, error: BaseException, attempt: int, started: float) -> Optional[float]:
+        """Delay before the next attempt, or None if the error should propagate."""
+        if not is_retryable(error) or attempt + 1 >= self.max_attempts:
+            if is_retryable(error):
+                with self._lock:
+                    self.exhausted += 1
+            return None
+
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        delay = max(delay, _retry_after(error) or 0.0)
+
+        if time.monotonic() - started + delay > self.deadline:
+            with self._lock:
+                self.exhausted += 1
+            return None
+
+        with self._lock:
+            self.retries += 1
+        logger.warning(f"Transient LLM error ({type(error).__name__}), retry {attempt + 1} in {delay:.2f}s")
+        return delay
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """
+        Call fn, retrying transient errors.
+
+        Args:
+            fn: Zero-argument callable
+
+        Returns:
+            Result of the first successful attempt
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                delay = self._next_delay(e, attempt, started)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async variant of call.
+
+        Args:
+            fn: Zero-argument coroutine function
+
+        Returns:
+            Result of the first successful attempt
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return await fn()
+            except Exception as e:
+                delay = self._next_delay(e, attempt, started)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get retry statistics.
+
+        Returns:
+            Dictionary with retry and exhaustion counts
+        """
+        with self._lock:
+            return {
+                "max_attempts": self.max_attempts,
+                "retries": self.retries,
+                "exhausted": self.exhausted
+            }
+
+
+class HedgePolicy:
+    """
+    Request hedging: if a call is slower than the recent p95 latency, send a
+    second identical request and take whichever finishes first.
+
+    Until min_samples latencies have been observed, initial_delay is used.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        initial_delay: float = 10.0,
+        min_samples: int = 20,
+        window: int = 200,
+        max_workers: int = 16
+    ):
+        """
+        Initialize hedge policy.
+
+        Args:
+            enabled: Whether hedging is active
+            initial_delay: Hedge delay in seconds before enough samples exist
+            min_samples: Samples needed before the p95 is trusted
+            window: Number of recent latencies kept
+            max_workers: Thread pool size for sync hedged calls
+        """
+        self.enabled = enabled
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self._latencies: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    @classmethod
+    def from_env(cls) -> "HedgePolicy":
+        """Build a policy from LLM_HEDGE* environment variables."""
+        return cls(
+            enabled=os.getenv("LLM_HEDGE", "0") == "1",
+            initial_delay=float(os.getenv("LLM_HEDGE_INITIAL_DELAY", "10")),
+            min_samples=int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+        )
+
+    def record(self, latency: float):
+        """Record a successful call's latency."""
+        with self._lock:
+            self._latencies.append(latency)
+
+    def delay(self) -> float:
+        """
+        Current hedge delay.
+
+        Returns:
+            p95 of recent latencies, or initial_delay with too few samples
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_delay
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the thread pool used for sync hedged calls."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="llm-hedge"
+                )
+            return self._executor
+
+    def _timed(self, fn: Callable[[], Any]) -> Any:
+        """Run fn and record its latency."""
+        start = time.monotonic()
+        result = fn()
+        self.record(time.monotonic() - start)
+        return result
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """
+        Call fn, hedging with a second call if the first is slow.
+
+        Args:
+            fn: Zero-argument callable
+
+        Returns:
+            Result of the first call to succeed
+        """
+        with self._lock:
+            self.calls += 1
+
+        if not self.enabled:
+            return self._timed(fn)
+
+        executor = self._get_executor()
+        primary = executor.submit(self._timed, fn)
+        done, _ = wait([primary], timeout=self.delay())
+        if done:
+            return primary.result()
+
+        with self._lock:
+            self.hedged += 1
+        backup = executor.submit(self._timed, fn)
+
+        pending = {primary, backup}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async variant of call; the losing request is cancelled.
+
+        Args:
+            fn: Zero-argument coroutine function
+
+        Returns:
+            Result of the first call to succeed
+        """
+        with self._lock:
+            self.calls += 1
+
+        async def timed():
+            start = time.monotonic()
+            result = await fn()
+            self.record(time.monotonic() - start)
+            return result
+
+        if not self.enabled:
+            return await timed()
+
+        primary = asyncio.ensure_future(timed())
+        done, _ = await asyncio.wait({primary}, timeout=self.delay())
+        if done:
+            return primary.result()
+
+        with self._lock:
+            self.hedged += 1
+        backup = asyncio.ensure_future(timed())
+
+        pending = {primary, backup}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            with self._lock:
+                                self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hedging statistics.
+
+        Returns:
+            Dictionary with hedge counts and current delay
+        """
+        delay = self.delay()
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "delay_seconds": delay,
+                "samples": len(self._latencies)
+            }
+
+
+_retry_policy: Optional[RetryPolicy] = None
+_hedge_policy: Optional[HedgePolicy] = None
+_policy_lock = threading.Lock()
+
+
+def get_retry_policy() -> RetryPolicy:
+    """
+    Get the process-wide retry policy.
+
+    Returns:
+        Shared RetryPolicy configured from the environment
+    """
+    global _retry_policy
+    if _retry_policy is None:
+        with _policy_lock:
+            if _retry_policy is None:
+                _retry_policy = RetryPolicy.from_env()
+    return _retry_policy
+
+
+def get_hedge_policy() -> HedgePolicy:
+    """
+    Get the process-wide hedge policy.
+
+    Returns:
+        Shared HedgePolicy configured from the environment
+    """
+    global _hedge_policy
+    if _hedge_policy is None:
+        with _policy_lock:
+            if _hedge_policy is None:
+                _hedge_policy = HedgePolicy.from_env()
+    return _hedge_policy
+
+
+def reset_policies():
+    """Forget process-wide policies so the next lookup re-reads configuration."""
+    global _retry_policy, _hedge_policy
+    with _policy_lock:
+        _retry_policy = None
+        _hedge_policy = None
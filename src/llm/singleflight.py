@@ -0,0 +1,153 @@
+"""Coalesce identical in-flight calls so only one reaches the upstream API."""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class _LeaderAbandoned(Exception):
+    """Published when the leader is cancelled; waiters retry the call themselves."""
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls that share a key.
+
+    The first caller for a key (the leader) runs the call; callers arriving
+    while it is in flight wait for the leader's result instead of issuing
+    their own. Results are shared through a concurrent.futures.Future, so
+    sync threads and asyncio tasks (on any loop) can wait on the same call.
+    Nothing is retained once the call finishes; this is not a cache.
+
+    A waiter that is cancelled stops waiting without affecting the shared
+    call. A leader that is cancelled (or interrupted) does not pass its
+    cancellation on: the key is released and the waiters retry, the
+    first of them becoming the new leader.
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+        self.handoffs = 0
+
+    def _join(self, key: str) -> "tuple[Future, bool]":
+        """Get the in-flight future for key, registering a new one if absent."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self.leaders += 1
+            return future, True
+
+    def _finish(self, key: str, future: Future, result: Any = None, error: Optional[BaseException] = None):
+        """Publish the leader's outcome and retire the key."""
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+            if isinstance(error, _LeaderAbandoned):
+                self.handoffs += 1
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once per key among concurrent callers.
+
+        Args:
+            key: Request identity
+            fn: Zero-argument callable performing the call
+
+        Returns:
+            The leader's result (exceptions propagate to every waiter)
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            try:
+                return future.result()
+            except _LeaderAbandoned:
+                continue
+
+        try:
+            result = fn()
+        except Exception as e:
+            self._finish(key, future, error=e)
+            raise
+        except BaseException:
+            self._finish(key, future, error=_LeaderAbandoned())
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async variant of do.
+
+        Args:
+            key: Request identity
+            fn: Zero-argument coroutine function performing the call
+
+        Returns:
+            The leader's result (exceptions propagate to every waiter)
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            try:
+                # Shielded: cancelling this waiter must not cancel the shared future
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except _LeaderAbandoned:
+                continue
+
+        try:
+            result = await fn()
+        except Exception as e:
+            self._finish(key, future, error=e)
+            raise
+        except BaseException:
+            self._finish(key, future, error=_LeaderAbandoned())
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing statistics.
+
+        Returns:
+            Dictionary with upstream calls made, calls coalesced, leader
+            handoffs and calls in flight
+        """
+        with self._lock:
+            return {
+                "enabled": True,
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "handoffs": self.handoffs,
+                "in_flight": len(self._calls)
+            }
+
+
+_singleflight = SingleFlight()
+
+
+def get_singleflight() -> SingleFlight:
+    """
+    Get the process-wide SingleFlight.
+
+    Returns:
+        Shared SingleFlight instance
+    """
+    return _singleflight
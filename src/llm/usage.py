@@ -0,0 +1,71 @@
+"""Process-wide token usage accounting."""
+import threading
+from typing import Any, Dict
+
+
+class UsageCounter:
+    """
+    Thread-safe running totals of LLM requests and tokens.
+
+    Real calls record the usage reported by the API; mock responses record
+    a characters / 4 estimate so throughput figures stay meaningful in demos.
+    """
+
+    def __init__(self):
+        """Initialize counters at zero."""
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def record(self, prompt_tokens: int, completion_tokens: int):
+        """
+        Add one request's token usage.
+
+        Args:
+            prompt_tokens: Tokens in the prompt
+            completion_tokens: Tokens in the completion
+        """
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+    def record_usage(self, usage: Any):
+        """
+        Add usage from an OpenAI response usage object (ignored if missing).
+
+        Args:
+            usage: CompletionUsage or None
+        """
+        if usage is None:
+            return
+        self.record(usage.prompt_tokens or 0, usage.completion_tokens or 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get current totals.
+
+        Returns:
+            Dictionary with request and token counts
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "total_tokens": self.prompt_tokens + self.completion_tokens
+            }
+
+
+_usage = UsageCounter()
+
+
+def get_usage_counter() -> UsageCounter:
+    """
+    Get the process-wide usage counter.
+
+    Returns:
+        Shared UsageCounter instance
+    """
+    return _usage
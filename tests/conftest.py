@@ -5,11 +5,28 @@ import os
 from pathlib import Path
 
 
+@pytest.fixture(autouse=True)
+def isolated_db(tmp_path, monkeypatch):
+    """Point shared memory managers, connection pools and the job queue at a per-test database."""
+    from src.core.db import close_connection_pools
+    from src.core.jobs import reset_job_queue
+    from src.core.memory import reset_memory_managers
+
+    monkeypatch.setenv("EXECUTION_DB_PATH", str(tmp_path / "execution_history.db"))
+    yield
+    reset_job_queue(wait=True)
+    reset_memory_managers()
+    close_connection_pools()
+
+
 @pytest.fixture
 def mock_env(monkeypatch):
     """Set environment to mock mode."""
     monkeypatch.setenv("MOCK", "1")
     monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    # Shared agents capture LLM configuration on creation
+    from src.agents.registry import reset_agents
+    reset_agents()
 
 
 @pytest.fixture
@@ -106,6 +106,31 @@ def test_get_stats_new_workflow():
     assert data["total_executions"] == 0
 
 
+def test_get_stats_window():
+    """Test windowed percentile fields and window validation."""
+    response = client.get("/stats/new_workflow", params={"window": "day"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["window"] == "day"
+    assert data["window_executions"] == 0
+    assert data["retry_histogram"] == {}
+
+    assert client.get("/stats/new_workflow", params={"window": "month"}).status_code == 400
+
+
+def test_stats_served_from_memory_cache():
+    """Test repeated stats lookups hit the shared memory manager cache."""
+    client.get("/stats/cached_workflow")
+    hits_before = client.get("/metrics").json()["memory"]["cache_hits"]
+
+    response = client.get("/stats/cached_workflow")
+
+    assert response.status_code == 200
+    # Aggregates and distribution are both cached
+    assert client.get("/metrics").json()["memory"]["cache_hits"] == hits_before + 2
+
+
 def test_get_learning_context():
     """Test getting learning context."""
     response = client.get("/learning/test_workflow")
@@ -175,3 +200,292 @@ def test_run_workflow_end_to_end(mock_env):
     # 3. Get learning context
     learning_response = client.get("/learning/test_e2e")
     assert learning_response.status_code == 200
+
+
+def test_get_graph_diagram():
+    """Test rendering a workflow graph diagram on demand."""
+    response = client.get("/graph/customer_due_diligence")
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["workflow_name"] == "customer_due_diligence"
+    assert "manager" in data["mermaid"]
+    assert "qa" in data["mermaid"]
+
+
+def test_graph_diagram_renders_off_event_loop(monkeypatch):
+    """Test /graph parses and renders from the threadpool."""
+    import api.main
+
+    monkeypatch.setattr(api.main, "render_mermaid", _off_loop(api.main.render_mermaid))
+
+    assert client.get("/graph/customer_due_diligence").status_code == 200
+
+
+def test_metrics_endpoint():
+    """Test process-wide metrics are exposed."""
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert "graph_cache" in data
+    assert "cache" in data["llm"]
+
+
+def _parse_sse(body: str):
+    """Parse a Server-Sent Events body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_run_workflow_stream(mock_env):
+    """Test SSE streaming of node progress, writer tokens and the result."""
+    blueprint = {
+        "workflow_name": "customer_due_diligence",
+        "input": {"company_name": "ACME Corp"}
+    }
+
+    response = client.post(
+        "/run/stream",
+        json={"blueprint": json.dumps(blueprint), "scenario": "due_diligence"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = _parse_sse(response.text)
+    names = [name for name, _ in events]
+
+    assert names[0] == "node_start"
+    assert "token" in names
+    assert names[-1] == "result"
+
+    qa_ends = [data for name, data in events if name == "node_end" and data["node"] == "qa"]
+    assert qa_ends and "validation_passed" in qa_ends[0]
+    assert all(data["duration_seconds"] >= 0 for name, data in events if name == "node_end")
+
+    result = events[-1][1]
+    assert result["status"] in ["completed", "failed"]
+    assert "run_id" in result
+
+
+def test_run_workflow_stream_invalid_blueprint():
+    """Test SSE endpoint rejects invalid blueprints before streaming."""
+    response = client.post("/run/stream", json={"blueprint": "{}", "scenario": "test"})
+
+    assert response.status_code == 400
+    assert "Invalid blueprint" in response.json()["detail"]
+
+
+def test_run_workflow_websocket(mock_env):
+    """Test WebSocket run streams events and closes after the result."""
+    blueprint = {
+        "workflow_name": "customer_due_diligence",
+        "input": {"company_name": "ACME Corp"}
+    }
+
+    with client.websocket_connect("/ws/run") as ws:
+        ws.send_json({"blueprint": json.dumps(blueprint), "scenario": "due_diligence"})
+        events = []
+        while True:
+            event = ws.receive_json()
+            events.append(event)
+            if event["type"] == "result":
+                break
+
+    assert events[0]["type"] == "node_start"
+    assert any(e["type"] == "token" for e in events)
+    assert events[-1]["status"] in ["completed", "failed"]
+
+
+def test_run_workflow_websocket_cancel(mock_env):
+    """Test a cancel message stops the run."""
+    blueprint = {
+        "workflow_name": "customer_due_diligence",
+        "input": {"company_name": "ACME Corp"}
+    }
+
+    with client.websocket_connect("/ws/run") as ws:
+        ws.send_json({"blueprint": json.dumps(blueprint), "scenario": "due_diligence"})
+        ws.send_json({"type": "cancel"})
+        events = []
+        while True:
+            event = ws.receive_json()
+            events.append(event)
+            if event["type"] in ("cancelled", "result"):
+                break
+
+    assert events[-1]["type"] in ("cancelled", "result")
+
+
+def test_submit_run_and_poll(mock_env):
+    """Test POST /runs returns 202 and the run can be polled to completion."""
+    import time
+
+    blueprint = {
+        "workflow_name": "customer_due_diligence",
+        "input": {"company_name": "ACME Corp"}
+    }
+
+    response = client.post(
+        "/runs",
+        json={"blueprint": json.dumps(blueprint), "scenario": "due_diligence", "priority": 1}
+    )
+
+    assert response.status_code == 202
+    run_id = response.json()["run_id"]
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        run = client.get(f"/runs/{run_id}").json()
+        if run["status"] not in ("queued", "running"):
+            break
+        time.sleep(0.05)
+
+    assert run["status"] in ["completed", "failed"]
+    assert run["priority"] == 1
+    assert run["result"]["execution_time"] is not None
+
+
+def test_submit_run_queue_full(mock_env, monkeypatch):
+    """Test a full queue answers 429."""
+    from src.core import jobs
+
+    class FullQueue:
+        def submit(self, *args, **kwargs):
+            raise jobs.QueueFullError("Job queue is full")
+
+    monkeypatch.setattr("api.main.get_job_queue", lambda: FullQueue())
+
+    response = client.post(
+        "/runs",
+        json={"blueprint": json.dumps({"workflow_name": "customer_due_diligence"}), "scenario": "due_diligence"}
+    )
+
+    assert response.status_code == 429
+
+
+def test_get_unknown_run():
+    """Test polling an unknown run returns 404."""
+    response = client.get("/runs/does-not-exist")
+
+    assert response.status_code == 404
+
+
+def test_list_runs_paginates_and_exports():
+    """Test run history pages with a cursor and exports as NDJSON."""
+    from datetime import datetime, timedelta
+    from src.core.memory import get_memory_manager
+    from src.core.schemas import ExecutionRecord
+
+    memory = get_memory_manager()
+    memory.clear_history("history_workflow")
+    start = datetime(2024, 1, 1)
+    for i in range(5):
+        memory.record_execution(ExecutionRecord(
+            id=f"history-{i}", workflow_name="history_workflow", blueprint="{}",
+            success=i != 2, retry_count=0, duration_seconds=1.0, timestamp=start + timedelta(minutes=i)
+        ))
+    memory.flush()
+
+    first = client.get("/runs", params={"workflow": "history_workflow", "limit": 3}).json()
+    second = client.get(
+        "/runs", params={"workflow": "history_workflow", "limit": 3, "cursor": first["next_cursor"]}
+    ).json()
+    assert [item["id"] for item in first["items"] + second["items"]] == [f"history-{i}" for i in range(4, -1, -1)]
+    assert second["next_cursor"] is None
+
+    response = client.get("/runs/export", params={"workflow": "history_workflow", "success": "false"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == ["history-2"]
+
+    assert client.get("/runs", params={"cursor": "garbage"}).status_code == 400
+    assert client.get("/runs/export", params={"since": "yesterday"}).status_code == 400
+    memory.clear_history("history_workflow")
+
+
+def _off_loop(method):
+    """Wrap a method to fail if it runs on the event loop thread."""
+    import asyncio
+
+    def wrapper(*args, **kwargs):
+        with pytest.raises(RuntimeError):
+            asyncio.get_running_loop()
+        return method(*args, **kwargs)
+
+    return wrapper
+
+
+def test_history_endpoints_run_off_event_loop(monkeypatch):
+    """Test /runs and /runs/export query SQLite from the threadpool."""
+    from src.core.memory import MemoryManager
+
+    monkeypatch.setattr(MemoryManager, "list_executions", _off_loop(MemoryManager.list_executions))
+    monkeypatch.setattr(MemoryManager, "iter_executions", _off_loop(MemoryManager.iter_executions))
+
+    assert client.get("/runs").status_code == 200
+    assert client.get("/runs/export").status_code == 200
+
+
+def test_search_endpoint():
+    """Test full-text search over recorded failures."""
+    from datetime import datetime
+    from src.core.memory import get_memory_manager
+    from src.core.schemas import ExecutionRecord
+
+    memory = get_memory_manager()
+    memory.clear_history("search_workflow")
+    memory.record_execution(ExecutionRecord(
+        id="search-1", workflow_name="search_workflow", blueprint="{}", success=False,
+        error_type="validation_failed", error_message="Missing required keyword: 市場",
+        duration_seconds=1.0, timestamp=datetime.now()
+    ))
+    memory.flush()
+
+    response = client.get("/search", params={"q": "市場", "workflow": "search_workflow"})
+
+    assert response.status_code == 200
+    assert [hit["id"] for hit in response.json()["results"]] == ["search-1"]
+    assert client.get("/search", params={"q": "::"}).status_code == 400
+    memory.clear_history("search_workflow")
+
+
+def test_search_runs_off_event_loop(monkeypatch):
+    """Test /search queries FTS from the threadpool."""
+    from src.core.memory import MemoryManager
+
+    monkeypatch.setattr(MemoryManager, "search_executions", _off_loop(MemoryManager.search_executions))
+
+    assert client.get("/search", params={"q": "timeout"}).status_code == 200
+
+
+def test_run_workflow_batch(mock_env):
+    """Test batch endpoint executes items and reports per-item results."""
+    blueprint = json.dumps({"workflow_name": "customer_due_diligence", "input": {"company_name": "ACME Corp"}})
+
+    response = client.post("/run/batch", json={
+        "items": [
+            {"id": "a", "blueprint": blueprint, "scenario": "due_diligence"},
+            {"id": "b", "blueprint": "{}"}
+        ],
+        "concurrency": 2
+    })
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [r["id"] for r in data["results"]] == ["a", "b"]
+    assert data["results"][1]["status"] == "invalid"
+    assert data["runs"] == 2
+
+
+def test_run_workflow_batch_rejects_empty_items():
+    """Test a batch needs at least one item."""
+    response = client.post("/run/batch", json={"items": []})
+
+    assert response.status_code == 422
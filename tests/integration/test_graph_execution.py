@@ -179,3 +179,198 @@ def test_concurrent_workflows(mock_env):
     assert len(results) == 3
     for result in results:
         assert "execution_id" in result
+
+
+def test_compiled_graph_cache_reuse(mock_env):
+    """Test that workflows of the same shape share one compiled graph."""
+    from src.core.schemas import Step, AgentRole
+    from src.graph.builder import get_compiled_graph, get_graph_cache_stats, clear_graph_cache
+
+    def make_workflow(name, roles):
+        return Workflow(
+            name=name,
+            description="Cache test",
+            steps=[
+                Step(name=f"step_{i}", agent_role=role, output_key="out", prompt_template="Test")
+                for i, role in enumerate(roles)
+            ]
+        )
+
+    clear_graph_cache()
+
+    first = get_compiled_graph(make_workflow("cache_a", [AgentRole.RESEARCHER, AgentRole.WRITER]))
+    second = get_compiled_graph(make_workflow("cache_b", [AgentRole.RESEARCHER, AgentRole.WRITER]))
+    other = get_compiled_graph(make_workflow("cache_c", [AgentRole.WRITER]))
+
+    assert first is second
+    assert other is not first
+
+    stats = get_graph_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["size"] == 2
+
+
+def test_cached_graph_releases_checkpoints(mock_env):
+    """Test that finished runs do not accumulate checkpoints in a cached graph."""
+    from src.graph.builder import get_compiled_graph
+
+    workflow = Workflow(
+        name="checkpoint_release",
+        description="Checkpoint test",
+        steps=[{"name": "s", "agent_role": "researcher", "output_key": "o", "prompt_template": "T"}]
+    )
+
+    result = execute_workflow(workflow, "checkpoint_release")
+
+    app = get_compiled_graph(workflow)
+    config = {"configurable": {"thread_id": result["execution_id"]}}
+    assert app.checkpointer.get_tuple(config) is None
+
+
+def test_execute_workflow_writes_no_diagram(mock_env, tmp_path, monkeypatch):
+    """Test that the run path does not render diagrams to disk."""
+    from src.graph.builder import clear_graph_cache
+
+    monkeypatch.chdir(tmp_path)
+    clear_graph_cache()
+
+    workflow = Workflow(
+        name="no_diagram",
+        description="Diagram test",
+        steps=[{"name": "s", "agent_role": "writer", "output_key": "o", "prompt_template": "T"}]
+    )
+    execute_workflow(workflow, "no_diagram")
+
+    assert not (tmp_path / "docs").exists()
+
+
+def test_write_mermaid(mock_env, tmp_path):
+    """Test explicit diagram generation for documentation."""
+    from src.graph.builder import write_mermaid, render_mermaid
+
+    workflow = Workflow(
+        name="diagram",
+        description="Diagram test",
+        steps=[{"name": "s", "agent_role": "writer", "output_key": "o", "prompt_template": "T"}]
+    )
+    path = write_mermaid(workflow, str(tmp_path / "docs" / "graph.mmd"))
+
+    with open(path) as f:
+        assert f.read() == render_mermaid(workflow)
+
+
+def test_execute_workflow_async(mock_env, due_diligence_blueprint):
+    """Test end-to-end execution through the async path."""
+    import asyncio
+    import json
+    from src.graph.builder import execute_workflow_async
+
+    parser = BlueprintParser()
+    blueprint_str = json.dumps(due_diligence_blueprint)
+    workflow = parser.parse(blueprint_str, "due_diligence")
+
+    result = asyncio.run(execute_workflow_async(workflow, blueprint_str))
+
+    assert result["status"] in ["completed", "failed"]
+    assert "manager" in result["agent_outputs"]
+    assert "qa" in result["agent_outputs"]
+
+
+def test_execute_workflow_async_concurrent(mock_env):
+    """Test several async runs sharing one event loop."""
+    import asyncio
+    from src.graph.builder import execute_workflow_async
+
+    workflow = Workflow(
+        name="async_concurrent",
+        description="Concurrent async runs",
+        steps=[{"name": "s", "agent_role": "researcher", "output_key": "o", "prompt_template": "T"}]
+    )
+
+    async def run_all():
+        return await asyncio.gather(*[
+            execute_workflow_async(workflow, f"async_{i}") for i in range(5)
+        ])
+
+    results = asyncio.run(run_all())
+
+    assert len({r["execution_id"] for r in results}) == 5
+
+
+def test_execute_workflow_async_history_off_loop(mock_env, monkeypatch):
+    """Test the async path reads and records history outside the event loop thread."""
+    import asyncio
+    import threading
+    from src.core.memory import MemoryManager
+    from src.graph.builder import execute_workflow_async
+
+    threads = {}
+    record_execution = MemoryManager.record_execution
+    get_learning_context = MemoryManager.get_learning_context
+
+    def tracking_record(self, record):
+        threads["record"] = threading.get_ident()
+        return record_execution(self, record)
+
+    def tracking_learning(self, workflow_name):
+        threads["learning"] = threading.get_ident()
+        return get_learning_context(self, workflow_name)
+
+    monkeypatch.setattr(MemoryManager, "record_execution", tracking_record)
+    monkeypatch.setattr(MemoryManager, "get_learning_context", tracking_learning)
+
+    workflow = Workflow(
+        name="async_off_loop",
+        description="History I/O off the loop",
+        steps=[{"name": "s", "agent_role": "researcher", "output_key": "o", "prompt_template": "T"}]
+    )
+
+    async def run():
+        result = await execute_workflow_async(workflow, "off_loop")
+        return result, threading.get_ident()
+
+    result, loop_thread = asyncio.run(run())
+
+    assert result["execution_id"]
+    assert set(threads) == {"record", "learning"}
+    assert loop_thread not in threads.values()
+
+
+def test_stream_workflow_emits_writer_tokens(mock_env, due_diligence_blueprint):
+    """Test writer chunks are streamed before the final result."""
+    import json
+    from src.graph.builder import stream_workflow
+
+    parser = BlueprintParser()
+    blueprint_str = json.dumps(due_diligence_blueprint)
+    workflow = parser.parse(blueprint_str, "due_diligence")
+
+    events = list(stream_workflow(workflow, blueprint_str))
+    tokens = [e for e in events if e["type"] == "token"]
+
+    assert len(tokens) > 1
+    assert events[-1]["type"] == "result"
+    result = events[-1]["result"]
+    assert result["agent_outputs"]["writer"]["draft"] == "".join(
+        t["text"] for t in tokens if t["retry_count"] == result["retry_count"]
+    )
+
+
+def test_astream_workflow(mock_env, due_diligence_blueprint):
+    """Test the async stream yields tokens and a final result."""
+    import asyncio
+    import json
+    from src.graph.builder import astream_workflow
+
+    parser = BlueprintParser()
+    blueprint_str = json.dumps(due_diligence_blueprint)
+    workflow = parser.parse(blueprint_str, "due_diligence")
+
+    async def collect():
+        return [event async for event in astream_workflow(workflow, blueprint_str)]
+
+    events = asyncio.run(collect())
+
+    assert any(e["type"] == "token" for e in events)
+    assert events[-1]["result"]["status"] in ["completed", "failed"]
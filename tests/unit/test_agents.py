@@ -153,3 +153,127 @@ def test_agent_error_handling(mock_env):
     result = agent.process({})
 
     assert "error" in result or "manager_decision" in result
+
+
+def test_llm_errors_propagate_without_mock_fallback(mock_env, mock_state, sample_report, monkeypatch):
+    """Test agents only substitute mock output with LLM_MOCK_FALLBACK=1, and QA never passes on it."""
+    mock_state["agent_outputs"] = {"writer": {"draft": sample_report}}
+
+    def failing_response(*args, **kwargs):
+        raise RuntimeError("upstream unavailable")
+
+    for agent in (ResearcherAgent(), WriterAgent(), QAAgent()):
+        monkeypatch.setattr(agent, "_generate_response", failing_response)
+        with pytest.raises(RuntimeError, match="upstream unavailable"):
+            agent.process(mock_state)
+
+        monkeypatch.setattr(agent.llm, "mock_fallback", True)
+        result = agent.process(mock_state)
+        if isinstance(agent, QAAgent):
+            assert result["passed"] is False
+            assert "qualitative_validation_unavailable" in result["failed_checks"]
+        else:
+            assert result["status"] == "completed_with_mock"
+            assert result["error"] == "upstream unavailable"
+
+
+def test_qa_unparseable_review_fails(mock_env, mock_state, sample_report, monkeypatch):
+    """Test a quality review that is not JSON fails validation."""
+    mock_state["agent_outputs"] = {"writer": {"draft": sample_report}}
+    agent = QAAgent()
+    monkeypatch.setattr(agent, "_generate_response", lambda *args, **kwargs: "looks fine to me")
+
+    result = agent.process(mock_state)
+
+    assert result["passed"] is False
+    assert "qualitative_validation_unparseable" in result["failed_checks"]
+
+
+def test_registry_returns_shared_agents(mock_env):
+    """Test that the registry hands out one agent per role."""
+    from src.agents import get_agent
+
+    manager = get_agent("manager")
+
+    assert get_agent("manager") is manager
+    assert isinstance(manager, ManagerAgent)
+    # All registry agents share one LLM client
+    assert get_agent("writer").llm is manager.llm
+
+
+def test_registry_thread_safety(mock_env):
+    """Test concurrent first lookups create a single agent."""
+    from concurrent.futures import ThreadPoolExecutor
+    from src.agents import get_agent
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        agents = list(pool.map(lambda _: get_agent("qa"), range(32)))
+
+    assert all(agent is agents[0] for agent in agents)
+
+
+def test_registry_unknown_role(mock_env):
+    """Test unknown roles are rejected."""
+    from src.agents import get_agent
+
+    with pytest.raises(ValueError):
+        get_agent("unknown")
+
+
+def test_agents_aprocess(mock_env, mock_state, sample_report):
+    """Test async processing matches the sync result shape."""
+    import asyncio
+
+    manager = asyncio.run(ManagerAgent().aprocess(mock_state))
+    assert "manager_decision" in manager
+
+    research = asyncio.run(ResearcherAgent().aprocess(mock_state))
+    assert isinstance(research["findings"], str)
+
+    mock_state["researcher_findings"] = research["findings"]
+    draft = asyncio.run(WriterAgent().aprocess(mock_state))
+    assert isinstance(draft["draft"], str)
+
+    mock_state["agent_outputs"] = {"writer": {"draft": sample_report}}
+    qa = asyncio.run(QAAgent().aprocess(mock_state))
+    assert isinstance(qa["passed"], bool)
+    assert "failed_checks" in qa
+
+
+def test_writer_process_stream(mock_env, mock_state):
+    """Test the streaming writer reports chunks that form the draft."""
+    mock_state["agent_outputs"] = {"researcher": {"findings": "Revenue up"}}
+    chunks = []
+
+    result = WriterAgent().process_stream(mock_state, chunks.append)
+
+    assert len(chunks) > 1
+    assert result["draft"] == "".join(chunks)
+    assert result["status"] == "completed"
+
+
+def test_writer_stream_error_after_chunks_propagates(mock_env, mock_state, monkeypatch):
+    """Test a stream failing mid-draft raises rather than ending in a mock draft."""
+    import asyncio
+
+    mock_state["agent_outputs"] = {"researcher": {"findings": "Revenue up"}}
+    agent = WriterAgent()
+    monkeypatch.setattr(agent.llm, "mock_fallback", True)
+
+    def broken_stream(*args, **kwargs):
+        yield "# Due Diligence"
+        raise RuntimeError("connection reset")
+
+    async def abroken_stream(*args, **kwargs):
+        yield "# Due Diligence"
+        raise RuntimeError("connection reset")
+
+    monkeypatch.setattr(agent, "_stream_response", broken_stream)
+    monkeypatch.setattr(agent, "_astream_response", abroken_stream)
+
+    chunks = []
+    with pytest.raises(RuntimeError, match="connection reset"):
+        agent.process_stream(mock_state, chunks.append)
+    with pytest.raises(RuntimeError, match="connection reset"):
+        asyncio.run(agent.aprocess_stream(mock_state, chunks.append))
+    assert chunks == ["# Due Diligence", "# Due Diligence"]
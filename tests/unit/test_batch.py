@@ -0,0 +1,113 @@
+"""Unit tests for batch execution."""
+import asyncio
+import json
+
+from src.core.blueprint_parser import BlueprintParser
+from src.batch import (
+    aexecute_workflows_batch,
+    completed_ids,
+    execute_workflows_batch,
+    main,
+    normalize_item,
+    run_batch_file,
+)
+
+BLUEPRINT = {"workflow_name": "customer_due_diligence", "input": {"company_name": "ACME Corp"}}
+
+
+def test_normalize_item():
+    """Test bare blueprints and wrappers normalize the same way."""
+    bare = normalize_item(BLUEPRINT, 3)
+    wrapped = normalize_item({"id": "a", "blueprint": BLUEPRINT, "scenario": "due_diligence"}, 0)
+
+    assert bare["id"] == "item-3"
+    assert json.loads(bare["blueprint"]) == BLUEPRINT
+    assert wrapped["id"] == "a"
+    assert wrapped["scenario"] == "due_diligence"
+
+
+def test_execute_workflows_batch_preserves_order(mock_env):
+    """Test results come back in input order with invalid items reported."""
+    blueprints = [
+        {"id": "first", "blueprint": BLUEPRINT},
+        {"id": "bad", "blueprint": "{}"},
+        {"id": "third", "blueprint": BLUEPRINT},
+    ]
+
+    results = execute_workflows_batch(blueprints, concurrency=3)
+
+    assert [r["id"] for r in results] == ["first", "bad", "third"]
+    assert results[1]["status"] == "invalid"
+    assert results[0]["execution_id"] != results[2]["execution_id"]
+
+
+def test_aexecute_workflows_batch(mock_env):
+    """Test the async batch path."""
+    results = asyncio.run(aexecute_workflows_batch([BLUEPRINT, BLUEPRINT], concurrency=2))
+
+    assert [r["id"] for r in results] == ["item-0", "item-1"]
+    assert all(r["status"] in ["completed", "failed"] for r in results)
+
+
+def test_item_errors_do_not_abort_batch(mock_env, monkeypatch):
+    """Test a non-ValueError from one item becomes its error record, sync and async."""
+    parse, aparse = BlueprintParser.parse, BlueprintParser.aparse
+
+    def failing_parse(self, blueprint, scenario=None):
+        if scenario == "outage":
+            raise RuntimeError("upstream unavailable")
+        return parse(self, blueprint, scenario)
+
+    async def failing_aparse(self, blueprint, scenario=None):
+        if scenario == "outage":
+            raise RuntimeError("upstream unavailable")
+        return await aparse(self, blueprint, scenario)
+
+    monkeypatch.setattr(BlueprintParser, "parse", failing_parse)
+    monkeypatch.setattr(BlueprintParser, "aparse", failing_aparse)
+    blueprints = [
+        {"id": "first", "blueprint": BLUEPRINT},
+        {"id": "down", "blueprint": BLUEPRINT, "scenario": "outage"},
+        {"id": "third", "blueprint": BLUEPRINT},
+    ]
+
+    for results in (
+        execute_workflows_batch(blueprints, concurrency=2),
+        asyncio.run(aexecute_workflows_batch(blueprints, concurrency=2)),
+    ):
+        assert [r["id"] for r in results] == ["first", "down", "third"]
+        assert results[1]["status"] == "error"
+        assert results[1]["error"] == "RuntimeError: upstream unavailable"
+        assert results[0]["execution_id"] and results[2]["execution_id"]
+
+
+def test_run_batch_file_resumes(mock_env, tmp_path):
+    """Test a rerun skips finished ids and retries a torn last line."""
+    input_path = tmp_path / "in.jsonl"
+    output_path = tmp_path / "out.jsonl"
+    input_path.write_text("\n".join(
+        json.dumps({"id": f"run-{i}", "blueprint": BLUEPRINT}) for i in range(3)
+    ) + "\n")
+    # Simulate a crash: run-0 finished, run-1 was being written
+    output_path.write_text(json.dumps({"id": "run-0", "success": True}) + '\n{"id": "run-1", "succ')
+
+    report = run_batch_file(str(input_path), str(output_path), concurrency=2)
+
+    assert report["skipped"] == 1
+    assert report["runs"] == 2
+    assert report["runs_per_second"] > 0
+    assert report["tokens"] > 0
+    assert completed_ids(str(output_path)) == {"run-0", "run-1", "run-2"}
+
+
+def test_cli(mock_env, tmp_path, capsys):
+    """Test the CLI writes results and reports throughput."""
+    input_path = tmp_path / "in.jsonl"
+    output_path = tmp_path / "out.jsonl"
+    input_path.write_text(json.dumps(BLUEPRINT) + "\n\n")
+
+    main([str(input_path), "-o", str(output_path), "-c", "1"])
+
+    lines = output_path.read_text().splitlines()
+    assert len(lines) == 1
+    assert "runs/s" in capsys.readouterr().err
@@ -0,0 +1,37 @@
+"""Unit tests for blueprint storage encoding."""
+import pytest
+from src.core.blueprint_store import (
+    ZSTD_AVAILABLE, blueprint_hash, decode_blueprint, default_codec, encode_blueprint
+)
+
+BLUEPRINT = '{"name": "due_diligence", "description": "' + "Check the vendor thoroughly. " * 40 + '"}'
+
+
+@pytest.mark.parametrize("codec", ["zlib", "none"] + (["zstd"] if ZSTD_AVAILABLE else []))
+def test_roundtrip(codec):
+    """Test every codec decodes back to the original text."""
+    encoding, content = encode_blueprint(BLUEPRINT, codec)
+
+    assert encoding == codec
+    assert decode_blueprint(encoding, content) == BLUEPRINT
+    if codec != "none":
+        assert len(content) < len(BLUEPRINT) / 4
+
+
+def test_small_blueprints_stored_raw():
+    """Test short texts skip compression."""
+    assert encode_blueprint("{}", "zlib") == ("none", b"{}")
+
+
+def test_hash_and_codec_config(monkeypatch):
+    """Test hashing is content-based and the codec is validated."""
+    assert blueprint_hash(BLUEPRINT) == blueprint_hash(str(BLUEPRINT))
+    assert blueprint_hash(BLUEPRINT) != blueprint_hash(BLUEPRINT + " ")
+
+    monkeypatch.setenv("MEMORY_BLUEPRINT_CODEC", "zlib")
+    assert default_codec() == "zlib"
+    monkeypatch.setenv("MEMORY_BLUEPRINT_CODEC", "lz4")
+    with pytest.raises(ValueError):
+        default_codec()
+    with pytest.raises(ValueError):
+        decode_blueprint("lz4", b"")
@@ -0,0 +1,77 @@
+"""Unit tests for the SQLite connection pool."""
+import threading
+
+import pytest
+from src.core.db import ConnectionPool, get_connection_pool
+
+
+def test_connection_reused_per_thread(temp_db):
+    """Test a thread gets the same configured connection each time."""
+    pool = ConnectionPool(temp_db)
+
+    conn = pool.connection()
+
+    assert pool.connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+
+def test_threads_get_own_connections(temp_db):
+    """Test each thread has its own connection."""
+    pool = ConnectionPool(temp_db)
+    seen = []
+
+    def worker():
+        seen.append(id(pool.connection()))
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(seen)) == 3
+    assert pool.stats()["opened"] == 3
+
+
+def test_transaction_rolls_back(temp_db):
+    """Test a failed transaction leaves no partial writes."""
+    pool = ConnectionPool(temp_db)
+    pool.connection().execute("CREATE TABLE t (x INTEGER)")
+
+    with pytest.raises(RuntimeError):
+        with pool.transaction() as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+            raise RuntimeError("abort")
+
+    assert pool.connection().execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+
+def test_concurrent_writers(temp_db):
+    """Test concurrent writers queue on the lock instead of failing."""
+    pool = ConnectionPool(temp_db)
+    pool.connection().execute("CREATE TABLE t (x INTEGER)")
+    errors = []
+
+    def writer(n):
+        try:
+            for i in range(50):
+                with pool.transaction() as conn:
+                    conn.execute("INSERT INTO t VALUES (?)", (n * 100 + i,))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert pool.connection().execute("SELECT COUNT(*) FROM t").fetchone()[0] == 400
+
+
+def test_shared_pool_per_path(temp_db):
+    """Test the process-wide pool is shared per database file."""
+    assert get_connection_pool(temp_db) is get_connection_pool(temp_db)
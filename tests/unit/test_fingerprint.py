@@ -0,0 +1,54 @@
+"""Unit tests for failure fingerprinting."""
+from src.core.fingerprint import (
+    SIMILARITY_THRESHOLD, band_keys, check_ids, fingerprint_failure, minhash,
+    normalize, pack_signature, similarity, unpack_signature
+)
+
+
+def test_volatile_tokens_replaced():
+    """Test ids, timestamps, quotes and numbers do not affect the key."""
+    a = 'Run 1b2c3d4e-1111-2222-3333-444455556666 at 2024-01-01T10:00:00 lacks "risk matrix", 3 of 5 sources'
+    b = 'Run 9f8e7d6c-aaaa-bbbb-cccc-ddddeeeeffff at 2024-02-03T11:30:12 lacks "summary", 1 of 4 sources'
+
+    assert normalize(a) == normalize(b) == "run <id> at <time> lacks <str>, <n> of <n> sources"
+    assert normalize(normalize(a)) == normalize(a)
+
+
+def test_check_ids_preferred_and_deduplicated():
+    """Test failed checks define the label, independent of order and numbers."""
+    first = fingerprint_failure(
+        "Validation failed. Issues: ...",
+        "validation_failed",
+        ["Output too short (min 500 chars)", "Missing required keyword: risk"]
+    )
+    second = fingerprint_failure(
+        "Completely different feedback text",
+        "validation_failed",
+        ["Missing required keyword: risk", "Output too short (min 800 chars)", "output too short (min 800 chars)"]
+    )
+
+    assert first.key == second.key
+    assert first.label == "Missing required keyword: risk; Output too short (min <n> chars)"
+    assert check_ids(["", "Need at least 3 sections, found 1"]) == ["Need at least <n> sections, found <n>"]
+
+
+def test_near_duplicates_share_a_band():
+    """Test one-word edits stay similar and collide in the LSH index."""
+    base = "the report lacks a clear risk assessment section and does not cite regulatory sources"
+    edited = "the report lacks a clear risk assessment section and does not cite primary sources"
+    unrelated = "the introduction is too informal and repeats the executive summary verbatim"
+
+    a, b, c = minhash(base), minhash(edited), minhash(unrelated)
+
+    assert similarity(a, b) >= SIMILARITY_THRESHOLD
+    assert similarity(a, c) < SIMILARITY_THRESHOLD
+    assert set(band_keys(a)) & set(band_keys(b))
+
+
+def test_signature_roundtrip_and_exception_label():
+    """Test signatures pack losslessly and exception types prefix the label."""
+    fingerprint = fingerprint_failure("Request timed out after 30.5s", "TimeoutError")
+
+    assert fingerprint.label == "TimeoutError: Request timed out after <n>s"
+    assert unpack_signature(pack_signature(fingerprint.signature)) == fingerprint.signature
+    assert fingerprint_failure().label == "Unknown failure"
@@ -0,0 +1,182 @@
+"""Unit tests for pooled OpenAI HTTP clients against a local stand-in server."""
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.llm.client import LLMClient
+from src.llm.http_client import get_connection_stats, get_openai_client, reset_openai_clients
+
+
+class _ChatCompletionsHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible /v1/chat/completions endpoint with keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length))
+        if request.get("stream"):
+            return self._stream(request)
+        body = json.dumps({
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": request["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": f"echo: {request['messages'][-1]['content']}"},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 5, "completion_tokens": 5, "total_tokens": 10}
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, request):
+        words = f"echo: {request['messages'][-1]['content']}".split(" ")
+        events = []
+        for i, word in enumerate(words):
+            chunk = {
+                "id": "chatcmpl-test",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": request["model"],
+                "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word}, "finish_reason": None}]
+            }
+            events.append(f"data: {json.dumps(chunk)}\n\n")
+        events.append("data: [DONE]\n\n")
+        body = "".join(events).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def openai_stand_in(monkeypatch):
+    """Run a local OpenAI-compatible server and point clients at it."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatCompletionsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setenv("MOCK", "0")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-stand-in")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}/v1")
+    reset_openai_clients()
+
+    yield server
+
+    reset_openai_clients()
+    server.shutdown()
+    server.server_close()
+
+
+def test_clients_share_one_pool(openai_stand_in):
+    """Test every LLMClient uses the same underlying OpenAI client."""
+    first = LLMClient()
+    second = LLMClient()
+
+    assert first.client is second.client
+    assert first.client is get_openai_client("sk-stand-in")
+
+
+def test_connection_reuse(openai_stand_in):
+    """Test sequential requests reuse one keep-alive connection."""
+    before = get_connection_stats()
+
+    first, second = LLMClient(), LLMClient()
+    assert first.generate("one") == "echo: one"
+    assert second.generate("two") == "echo: two"
+    assert first.generate("three") == "echo: three"
+
+    after = get_connection_stats()
+    assert after["requests"] - before["requests"] == 3
+    assert after["connections_opened"] - before["connections_opened"] == 1
+
+
+def test_async_connection_reuse(openai_stand_in):
+    """Test the async client pool reuses connections within a loop."""
+    before = get_connection_stats()
+
+    async def run():
+        client = LLMClient()
+        return [await client.agenerate(p) for p in ("a", "b", "c")]
+
+    assert asyncio.run(run()) == ["echo: a", "echo: b", "echo: c"]
+
+    after = get_connection_stats()
+    assert after["requests"] - before["requests"] == 3
+    assert after["connections_opened"] - before["connections_opened"] == 1
+
+
+def test_pool_settings_from_env(openai_stand_in, monkeypatch):
+    """Test pool limits are read from the environment."""
+    from src.llm.http_client import http_settings
+
+    monkeypatch.setenv("LLM_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("LLM_HTTP2", "1")
+
+    settings = http_settings()
+
+    assert settings["max_connections"] == 7
+    assert settings["base_url"].startswith("http://127.0.0.1")
+
+
+def test_generate_stream(openai_stand_in):
+    """Test streamed chunks reassemble into the full completion."""
+    client = LLMClient()
+
+    chunks = list(client.generate_stream("stream me please"))
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == "echo: stream me please"
+
+
+def test_agenerate_stream(openai_stand_in):
+    """Test the async stream over the pooled async client."""
+    client = LLMClient()
+
+    async def collect():
+        return [chunk async for chunk in client.agenerate_stream("async stream")]
+
+    assert "".join(asyncio.run(collect())) == "echo: async stream"
+
+
+def test_streams_closed_when_consumer_stops(openai_stand_in):
+    """Test closing a stream generator early closes the upstream response."""
+    client = LLMClient()
+    opened = []
+    open_stream, aopen_stream = client._open_stream, client._aopen_stream
+
+    def tracking_open(kwargs):
+        opened.append(open_stream(kwargs))
+        return opened[-1]
+
+    async def tracking_aopen(kwargs):
+        opened.append(await aopen_stream(kwargs))
+        return opened[-1]
+
+    client._open_stream, client._aopen_stream = tracking_open, tracking_aopen
+
+    stream = client.generate_stream("stop after the first word")
+    next(stream)
+    stream.close()
+
+    async def stop_early():
+        stream = client.agenerate_stream("stop after the first word")
+        await stream.__anext__()
+        await stream.aclose()
+
+    asyncio.run(stop_early())
+
+    assert len(opened) == 2
+    assert all(upstream.response.is_closed for upstream in opened)
@@ -0,0 +1,209 @@
+"""Unit tests for the background job queue."""
+import sqlite3
+import threading
+import time
+import uuid
+
+import pytest
+from src.core.jobs import JobQueue, QueueFullError
+from src.core.memory import MemoryManager
+from src.core.schemas import Workflow, Step, AgentRole
+
+
+@pytest.fixture
+def workflow():
+    """Minimal workflow for queue tests."""
+    return Workflow(
+        name="job_test",
+        description="Job queue test",
+        steps=[Step(name="s", agent_role=AgentRole.RESEARCHER, output_key="o", prompt_template="T")]
+    )
+
+
+def _result(execution_id, success=True):
+    return {
+        "success": success,
+        "status": "completed" if success else "failed",
+        "execution_id": execution_id,
+        "final_output": "done"
+    }
+
+
+def test_submit_and_complete(temp_db, workflow):
+    """Test a run is executed and its result persisted."""
+    jobs = JobQueue(runner=lambda wf, raw, execution_id: _result(execution_id), workers=1, db_path=temp_db)
+
+    run_id = jobs.submit(workflow, "raw")
+    jobs.shutdown(wait=True)
+
+    run = jobs.get(run_id)
+    assert run["status"] == "completed"
+    assert run["result"]["execution_id"] == run_id
+    assert run["started_at"] and run["finished_at"]
+
+
+def test_priority_order(temp_db, workflow):
+    """Test higher priority runs are executed first."""
+    gate = threading.Event()
+    order = []
+
+    def runner(wf, raw, execution_id):
+        gate.wait()
+        order.append(raw)
+        return _result(execution_id)
+
+    jobs = JobQueue(runner=runner, workers=1, db_path=temp_db)
+    jobs.submit(workflow, "blocker")
+    # Let the single worker take the blocker before queueing the rest
+    while jobs.stats()["running"] == 0:
+        time.sleep(0.01)
+    jobs.submit(workflow, "low", priority=0)
+    jobs.submit(workflow, "high", priority=5)
+    jobs.submit(workflow, "low2", priority=0)
+
+    gate.set()
+    jobs.shutdown(wait=True)
+
+    assert order == ["blocker", "high", "low", "low2"]
+
+
+def test_queue_full_rejects(temp_db, workflow):
+    """Test submissions beyond max_depth are rejected."""
+    gate = threading.Event()
+
+    def runner(wf, raw, execution_id):
+        gate.wait()
+        return _result(execution_id)
+
+    jobs = JobQueue(runner=runner, workers=1, max_depth=2, db_path=temp_db)
+    jobs.submit(workflow, "running")
+    while jobs.stats()["running"] == 0:
+        time.sleep(0.01)
+    jobs.submit(workflow, "q1")
+    jobs.submit(workflow, "q2")
+
+    with pytest.raises(QueueFullError):
+        jobs.submit(workflow, "q3")
+
+    assert jobs.stats()["rejected"] == 1
+    gate.set()
+    jobs.shutdown(wait=True)
+
+
+def test_runner_error_is_recorded(temp_db, workflow):
+    """Test a raising runner marks the run as error without killing the worker."""
+    def runner(wf, raw, execution_id):
+        if raw == "boom":
+            raise RuntimeError("boom")
+        return _result(execution_id)
+
+    jobs = JobQueue(runner=runner, workers=1, db_path=temp_db)
+    bad = jobs.submit(workflow, "boom")
+    good = jobs.submit(workflow, "ok")
+    jobs.shutdown(wait=True)
+
+    assert jobs.get(bad)["status"] == "error"
+    assert jobs.get(bad)["error"] == "boom"
+    assert jobs.get(good)["status"] == "completed"
+
+
+def test_start_run_error_does_not_kill_worker(temp_db, workflow, monkeypatch):
+    """Test a failure to mark a run as running is recorded and shutdown still drains."""
+    jobs = JobQueue(runner=lambda wf, raw, execution_id: _result(execution_id), workers=1, db_path=temp_db)
+    start_run = jobs.memory.start_run
+    calls = []
+
+    def flaky_start_run(run_id):
+        calls.append(run_id)
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        start_run(run_id)
+
+    monkeypatch.setattr(jobs.memory, "start_run", flaky_start_run)
+    bad = jobs.submit(workflow, "first")
+    good = jobs.submit(workflow, "second")
+
+    stopper = threading.Thread(target=jobs.shutdown)
+    stopper.start()
+    stopper.join(timeout=5)
+
+    assert not stopper.is_alive()
+    assert jobs.get(bad)["status"] == "error"
+    assert jobs.get(good)["status"] == "completed"
+    assert jobs.stats()["running"] == 0
+    assert jobs.stats()["failed"] == 1
+
+
+def test_only_runs_of_stopped_queues_are_failed(temp_db, workflow):
+    """Test unfinished runs of silent or unknown owners are failed, live owners' runs are kept."""
+    memory = MemoryManager(temp_db)
+    memory.heartbeat_owner("live")
+    memory.heartbeat_owner("dead")
+    sqlite3.connect(temp_db, isolation_level=None).execute(
+        "UPDATE job_owners SET heartbeat_at = '2000-01-01T00:00:00' WHERE owner = 'dead'"
+    )
+    runs = {name: str(uuid.uuid4()) for name in ("live", "dead_queued", "dead_running", "legacy")}
+    memory.create_run(runs["live"], workflow.name, owner="live")
+    memory.start_run(runs["live"])
+    memory.create_run(runs["dead_queued"], workflow.name, owner="dead")
+    memory.create_run(runs["dead_running"], workflow.name, owner="dead")
+    memory.start_run(runs["dead_running"])
+    memory.create_run(runs["legacy"], workflow.name)
+
+    # Creating a queue and polling does not sweep
+    jobs = JobQueue(runner=lambda wf, raw, execution_id: _result(execution_id), db_path=temp_db)
+    assert jobs.get(runs["dead_queued"])["status"] == "queued"
+
+    finished = jobs.submit(workflow, "raw")
+    jobs.shutdown(wait=True)
+
+    assert jobs.stats()["interrupted"] == 3
+    for name in ("dead_queued", "dead_running", "legacy"):
+        run = jobs.get(runs[name])
+        assert run["status"] == "error"
+        assert run["error"].startswith("Interrupted")
+        assert run["finished_at"]
+    assert jobs.get(runs["live"])["status"] == "running"
+    assert jobs.get(finished)["status"] == "completed"
+    owners = {row[0] for row in sqlite3.connect(temp_db).execute("SELECT owner FROM job_owners")}
+    assert owners == {"live"}
+
+
+def test_heartbeat_fails_runs_of_queue_that_stops(temp_db, workflow):
+    """Test a running queue fails another queue's runs once it stops heartbeating, never its own."""
+    release = threading.Event()
+
+    def runner(wf, raw, execution_id):
+        release.wait(5)
+        return _result(execution_id)
+
+    jobs = JobQueue(runner=runner, workers=1, db_path=temp_db, heartbeat_seconds=0.02)
+    own = jobs.submit(workflow, "slow")
+    jobs.memory.heartbeat_owner("crashed")
+    orphan = str(uuid.uuid4())
+    jobs.memory.create_run(orphan, workflow.name, owner="crashed")
+
+    deadline = time.monotonic() + 5
+    while jobs.get(orphan)["status"] != "error":
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    assert jobs.get(own)["status"] in ("queued", "running")
+    release.set()
+    jobs.shutdown(wait=True)
+    assert jobs.get(own)["status"] == "completed"
+    assert jobs.stats()["interrupted"] == 1
+
+
+def test_shutdown_rejects_new_runs(temp_db, workflow):
+    """Test submissions after shutdown are rejected."""
+    jobs = JobQueue(runner=lambda wf, raw, execution_id: _result(execution_id), db_path=temp_db)
+    jobs.shutdown()
+
+    with pytest.raises(QueueFullError):
+        jobs.submit(workflow, "late")
+
+
+def test_unknown_run(temp_db):
+    """Test unknown IDs return None."""
+    assert JobQueue(db_path=temp_db).get("missing") is None
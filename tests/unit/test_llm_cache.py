@@ -0,0 +1,140 @@
+"""Unit tests for the LLM response cache."""
+import pytest
+from src.llm.cache import ResponseCache, make_cache_key, reset_response_cache
+from src.llm.client import LLMClient
+
+
+@pytest.fixture
+def cache_env(mock_env, monkeypatch):
+    """Enable the response cache for manager and researcher."""
+    monkeypatch.setenv("LLM_CACHE", "1")
+    monkeypatch.setenv("LLM_CACHE_AGENTS", "manager,researcher")
+    reset_response_cache()
+    yield
+    reset_response_cache()
+
+
+def test_cache_key_covers_parameters():
+    """Test that every request parameter changes the key."""
+    base = make_cache_key("gpt-4o-mini", "sys", "prompt", 0.5, False, 2000)
+
+    assert base == make_cache_key("gpt-4o-mini", "sys", "prompt", 0.5, False, 2000)
+    assert base != make_cache_key("gpt-4o", "sys", "prompt", 0.5, False, 2000)
+    assert base != make_cache_key("gpt-4o-mini", "other", "prompt", 0.5, False, 2000)
+    assert base != make_cache_key("gpt-4o-mini", "sys", "prompt", 0.7, False, 2000)
+    assert base != make_cache_key("gpt-4o-mini", "sys", "prompt", 0.5, True, 2000)
+    assert base != make_cache_key("gpt-4o-mini", "sys", "prompt", 0.5, False, 100)
+    assert base != make_cache_key("gpt-4o-mini", "sys", "prompt", 0.5, False, 2000, mock=True)
+
+
+def test_memory_lru_eviction():
+    """Test the memory tier stays within its bound."""
+    cache = ResponseCache(maxsize=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert cache.stats()["size"] == 2
+
+
+def test_ttl_expiry():
+    """Test expired entries are not served."""
+    cache = ResponseCache(ttl_seconds=-1)
+    cache.set("a", "1")
+
+    assert cache.get("a") is None
+
+
+def test_persistent_tier(tmp_path):
+    """Test entries survive in SQLite across cache instances."""
+    db_path = str(tmp_path / "llm_cache.db")
+    ResponseCache(db_path=db_path).set("a", "persisted")
+
+    fresh = ResponseCache(db_path=db_path)
+
+    assert fresh.get("a") == "persisted"
+    assert fresh.stats()["disk_hits"] == 1
+    # Promoted into memory
+    assert fresh.get("a") == "persisted"
+    assert fresh.stats()["memory_hits"] == 1
+
+
+def test_async_persistent_tier_runs_off_loop(tmp_path):
+    """Test aget/aset read and write SQLite in a worker thread."""
+    import asyncio
+    import threading
+
+    cache = ResponseCache(db_path=str(tmp_path / "llm_cache.db"))
+    threads = []
+    get_disk, set_disk = cache._get_disk, cache._set_disk
+
+    def tracking_get(*args):
+        threads.append(threading.get_ident())
+        return get_disk(*args)
+
+    def tracking_set(*args):
+        threads.append(threading.get_ident())
+        return set_disk(*args)
+
+    cache._get_disk, cache._set_disk = tracking_get, tracking_set
+
+    async def run():
+        await cache.aset("a", "persisted")
+        cache._memory.clear()
+        return await cache.aget("a"), await cache.aget("missing"), threading.get_ident()
+
+    hit, miss, loop_thread = asyncio.run(run())
+
+    assert (hit, miss) == ("persisted", None)
+    assert len(threads) == 3 and loop_thread not in threads
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_mock_responses_never_served_as_real(cache_env, monkeypatch):
+    """Test a response cached in mock mode is not returned to a client calling the API."""
+    mock_client = LLMClient()
+    mock_text = mock_client.generate("Research ACME", use_cache=True)
+
+    live_client = LLMClient()
+    live_client.mock = False
+    monkeypatch.setattr(live_client, "_request", lambda kwargs: "real completion")
+
+    assert live_client.generate("Research ACME", use_cache=True) == "real completion"
+    assert mock_client.generate("Research ACME", use_cache=True) == mock_text
+
+
+def test_client_uses_cache_when_requested(cache_env):
+    """Test LLMClient only consults the cache for opted-in calls."""
+    client = LLMClient()
+
+    client.generate("Research ACME", use_cache=True)
+    client.generate("Research ACME", use_cache=True)
+    client.generate("Research ACME")
+
+    stats = client.cache.stats()
+    assert stats["misses"] == 1
+    assert stats["memory_hits"] == 1
+
+
+def test_agent_cache_flags(cache_env):
+    """Test per-agent cache opt-in and writer retry bypass."""
+    from src.agents import ResearcherAgent, WriterAgent
+
+    assert ResearcherAgent().cache_responses is True
+
+    writer = WriterAgent()
+    assert writer.cache_responses is False
+    assert writer._may_cache(0) is False
+
+
+def test_cache_disabled_by_default(mock_env):
+    """Test caching is off unless LLM_CACHE=1."""
+    reset_response_cache()
+    client = LLMClient()
+
+    assert client.cache is None
+    assert client.generate("Research ACME", use_cache=True)
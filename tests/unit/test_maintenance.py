@@ -0,0 +1,108 @@
+"""Unit tests for execution history maintenance."""
+import sqlite3
+from datetime import datetime
+
+from src.core.maintenance import (
+    check_aggregates, check_sketches, main, rebuild_aggregates, rebuild_sketches
+)
+from src.core.memory import MemoryManager
+from src.core.schemas import ExecutionRecord
+
+
+def _populate(memory):
+    """Record a mix of executions across two workflows."""
+    for i in range(6):
+        memory.record_execution(ExecutionRecord(
+            id=f"run-{i}",
+            workflow_name="wf_a" if i % 2 else "wf_b",
+            blueprint="{}",
+            success=i % 3 != 0,
+            error_message=None if i % 3 else "missing section",
+            retry_count=i % 3,
+            duration_seconds=float(i + 1),
+            timestamp=datetime.now()
+        ))
+
+
+def test_aggregates_match_history(temp_db):
+    """Test stats from aggregates equal a full recomputation."""
+    memory = MemoryManager(temp_db)
+    _populate(memory)
+
+    stats = memory.get_execution_stats("wf_a")  # runs 1, 3, 5
+
+    assert stats["total_executions"] == 3
+    assert stats["successful"] == 2
+    assert stats["avg_duration"] == 4.0
+    assert abs(stats["duration_stddev"] - (8 / 3) ** 0.5) < 1e-9
+    assert stats["avg_retries"] == 1.0
+
+    conn = sqlite3.connect(temp_db, isolation_level=None)
+    assert check_aggregates(conn) == []
+
+
+def test_aggregates_follow_deletes(temp_db):
+    """Test clearing history removes the workflow's aggregates."""
+    memory = MemoryManager(temp_db)
+    _populate(memory)
+
+    memory.clear_history("wf_a")
+
+    assert memory.get_execution_stats("wf_a")["total_executions"] == 0
+    assert memory.get_execution_stats("wf_b")["total_executions"] == 3
+    conn = sqlite3.connect(temp_db, isolation_level=None)
+    assert conn.execute("SELECT workflow_name FROM workflow_aggregates").fetchall() == [("wf_b",)]
+    assert check_aggregates(conn) == []
+
+
+def test_check_detects_drift_and_rebuild_repairs(temp_db):
+    """Test a corrupted aggregate is reported and fixed by a rebuild."""
+    memory = MemoryManager(temp_db)
+    _populate(memory)
+    conn = sqlite3.connect(temp_db, isolation_level=None)
+    conn.execute("UPDATE workflow_aggregates SET successful = 99 WHERE workflow_name = 'wf_b'")
+    conn.execute("DELETE FROM workflow_aggregates WHERE workflow_name = 'wf_a'")
+
+    mismatches = check_aggregates(conn)
+
+    assert {(m["workflow_name"], m["column"]) for m in mismatches} >= {("wf_b", "successful"), ("wf_a", "total_executions")}
+    assert rebuild_aggregates(conn) == 2
+    assert check_aggregates(conn) == []
+
+
+def test_cli(temp_db, capsys):
+    """Test the CLI exit codes for check and rebuild."""
+    memory = MemoryManager(temp_db)
+    _populate(memory)
+    conn = sqlite3.connect(temp_db, isolation_level=None)
+    conn.execute("UPDATE workflow_aggregates SET retry_sum = 0")
+
+    assert main(["check", "--db", temp_db]) == 1
+    assert main(["rebuild", "--db", temp_db]) == 0
+    assert main(["check", "--db", temp_db]) == 0
+    assert "aggregates consistent" in capsys.readouterr().out
+
+
+def test_cli_defaults_to_configured_database(capsys):
+    """Test the CLI uses EXECUTION_DB_PATH when --db is omitted."""
+    import os
+
+    _populate(MemoryManager())
+
+    assert main(["check"]) == 0
+    assert capsys.readouterr().out.startswith(os.environ["EXECUTION_DB_PATH"])
+
+
+def test_sketch_check_and_rebuild(temp_db):
+    """Test sketch drift is detected and repaired."""
+    memory = MemoryManager(temp_db)
+    _populate(memory)
+    conn = sqlite3.connect(temp_db, isolation_level=None)
+    assert check_sketches(conn) == []
+
+    conn.execute("DELETE FROM workflow_retry_histogram WHERE workflow_name = 'wf_a'")
+
+    assert [m["column"] for m in check_sketches(conn)] == ["workflow_retry_histogram"]
+    rebuild_sketches(conn)
+    assert check_sketches(conn) == []
+    assert memory._load_distribution("wf_a", None)["executions"] == 3
@@ -1,7 +1,8 @@
 """Unit tests for memory manager."""
 import pytest
-from datetime import datetime
-from src.core.memory import MemoryManager
+import time
+from datetime import datetime, timedelta, timezone
+from src.core.memory import MemoryManager, encode_cursor, get_memory_manager, reset_memory_managers
 from src.core.schemas import ExecutionRecord
 
 
@@ -182,3 +183,393 @@ def test_clear_all_history(temp_db):
     # Check that all cleared
     stats = memory.get_execution_stats("test_workflow")
     assert stats["total_executions"] == 0
+
+
+def _record(i, success=True):
+    """Build a minimal execution record."""
+    return ExecutionRecord(
+        id=f"wb-{i}",
+        workflow_name="test_workflow",
+        blueprint="test",
+        success=success,
+        error_message=None if success else "Output too short",
+        retry_count=0,
+        duration_seconds=1.0,
+        timestamp=datetime.now()
+    )
+
+
+def test_write_behind_batches_records(temp_db):
+    """Test buffered records are committed in batches on flush."""
+    memory = MemoryManager(temp_db, write_behind=True, batch_size=10, flush_interval_ms=1000)
+
+    for i in range(25):
+        memory.record_execution(_record(i, success=i % 5 != 0))
+    memory.flush()
+
+    stats = memory.get_execution_stats("test_workflow")
+    assert stats["total_executions"] == 25
+    assert "occurred 5 times" in memory.get_learning_context("test_workflow")
+
+    write_stats = memory.stats()
+    assert write_stats["flushed"] == 25
+    assert write_stats["queued"] == 0
+    assert write_stats["batches"] < 25
+    memory.close()
+
+
+def test_write_behind_flushes_on_interval(temp_db):
+    """Test a lone record is committed without an explicit flush."""
+    memory = MemoryManager(temp_db, write_behind=True, batch_size=100, flush_interval_ms=10)
+
+    memory.record_execution(_record(0))
+
+    deadline = time.monotonic() + 5
+    while memory.get_execution_stats("test_workflow")["total_executions"] == 0:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    memory.close()
+
+
+def test_write_behind_falls_back_when_full(temp_db, monkeypatch):
+    """Test a full buffer writes synchronously and close drains the rest."""
+    memory = MemoryManager(temp_db, write_behind=True, queue_size=1)
+    monkeypatch.setattr(memory, "_ensure_flusher", lambda: None)
+
+    memory.record_execution(_record(0))
+    memory.record_execution(_record(1))
+
+    assert memory.get_execution_stats("test_workflow")["total_executions"] == 1
+    assert memory.stats()["sync_fallbacks"] == 1
+
+    memory.close()
+
+    assert memory.get_execution_stats("test_workflow")["total_executions"] == 2
+
+
+def test_write_behind_isolates_bad_record(temp_db):
+    """Test a failing record in a batch does not lose the others."""
+    memory = MemoryManager(temp_db, write_behind=True, batch_size=10, flush_interval_ms=1000)
+    memory.record_execution(_record(0))
+    memory.flush()
+
+    for i in range(3):
+        memory.record_execution(_record(i))  # wb-0 duplicates the primary key
+    memory.flush()
+
+    assert memory.get_execution_stats("test_workflow")["total_executions"] == 3
+    assert memory.stats()["write_errors"] == 1
+    memory.close()
+
+
+def test_reads_cached_until_write(temp_db):
+    """Test stats and learning context are cached and invalidated by writes."""
+    memory = MemoryManager(temp_db, cache_ttl_seconds=60)
+
+    assert memory.get_execution_stats("test_workflow")["total_executions"] == 0
+    memory.get_execution_stats("test_workflow")
+    memory.get_learning_context("test_workflow")
+    assert (memory.stats()["cache_hits"], memory.stats()["cache_misses"]) == (1, 2)
+
+    memory.record_execution(_record(0, success=False))
+
+    assert memory.get_execution_stats("test_workflow")["total_executions"] == 1
+    assert "Output too short" in memory.get_learning_context("test_workflow")
+
+    memory.clear_history()
+
+    assert memory.get_execution_stats("test_workflow")["total_executions"] == 0
+
+
+def test_cache_ttl_bounds_cross_process_staleness(temp_db):
+    """Test writes by another manager show up once the TTL expires."""
+    reader = MemoryManager(temp_db, cache_ttl_seconds=0.05)
+    writer = MemoryManager(temp_db)
+    reader.get_execution_stats("test_workflow")
+
+    writer.record_execution(_record(0))
+
+    assert reader.get_execution_stats("test_workflow")["total_executions"] == 0
+    time.sleep(0.06)
+    assert reader.get_execution_stats("test_workflow")["total_executions"] == 1
+
+
+def test_cache_drops_value_loaded_during_write(temp_db, monkeypatch):
+    """Test a read racing a write is not cached under the old version."""
+    memory = MemoryManager(temp_db, cache_ttl_seconds=60)
+    load = memory._load_execution_stats
+
+    def racing_load(workflow_name):
+        stats = load(workflow_name)
+        memory.record_execution(_record(0))
+        return stats
+
+    monkeypatch.setattr(memory, "_load_execution_stats", racing_load)
+    assert memory.get_execution_stats("test_workflow")["total_executions"] == 0
+    monkeypatch.setattr(memory, "_load_execution_stats", load)
+
+    assert memory.get_execution_stats("test_workflow")["total_executions"] == 1
+
+
+def test_distribution_by_window(temp_db):
+    """Test percentiles and retry histogram for all time and a recent window."""
+    memory = MemoryManager(temp_db)
+    for i in range(100):
+        memory.record_execution(ExecutionRecord(
+            id=f"old-{i}",
+            workflow_name="test_workflow",
+            blueprint="test",
+            success=True,
+            retry_count=2,
+            duration_seconds=100.0,
+            timestamp=datetime(2020, 1, 1, 12)
+        ))
+    for i in range(100):
+        memory.record_execution(ExecutionRecord(
+            id=f"new-{i}",
+            workflow_name="test_workflow",
+            blueprint="test",
+            success=True,
+            retry_count=i % 2,
+            duration_seconds=float(i + 1),
+            timestamp=datetime.now()
+        ))
+
+    overall = memory.get_distribution("test_workflow")
+    recent = memory.get_distribution("test_workflow", "hour")
+
+    assert overall["executions"] == 200
+    assert overall["retry_histogram"] == {"0": 50, "1": 50, "2": 100}
+    assert overall["p90_duration"] == pytest.approx(100.0, rel=0.01)
+    assert recent["executions"] == 100
+    assert recent["retry_histogram"] == {"0": 50, "1": 50}
+    assert recent["p50_duration"] == pytest.approx(50.0, rel=0.02)
+    assert recent["p99_duration"] == pytest.approx(99.0, rel=0.02)
+
+    memory.clear_history("test_workflow")
+    assert memory.get_distribution("test_workflow")["executions"] == 0
+
+
+def test_similar_failures_aggregate_into_one_pattern(temp_db):
+    """Test volatile QA feedback collapses into frequency-ranked patterns."""
+    memory = MemoryManager(temp_db)
+    for i in range(12):
+        memory.record_execution(ExecutionRecord(
+            id=f"qa-{i}",
+            workflow_name="test_workflow",
+            blueprint="test",
+            success=False,
+            error_type="validation_failed",
+            error_message=f"Quality review:\nThe report cites {i} sources but lacks a \"section {i}\" risk matrix",
+            duration_seconds=1.0,
+            timestamp=datetime.now()
+        ))
+    for i in range(3):
+        memory.record_execution(ExecutionRecord(
+            id=f"checks-{i}",
+            workflow_name="test_workflow",
+            blueprint="test",
+            success=False,
+            error_type="validation_failed",
+            error_message=f"Feedback variant {i}",
+            failed_checks=[f"Output too short (min {500 + i} chars)"],
+            duration_seconds=1.0,
+            timestamp=datetime.now()
+        ))
+
+    import sqlite3
+    conn = sqlite3.connect(temp_db)
+    rows = conn.execute(
+        "SELECT failure_reason, frequency FROM failure_patterns ORDER BY frequency DESC"
+    ).fetchall()
+
+    assert rows == [
+        ("Quality review: The report cites <n> sources but lacks a <str> risk matrix", 12),
+        ("Output too short (min <n> chars)", 3),
+    ]
+    context = memory.get_learning_context("test_workflow")
+    assert context.index("occurred 12 times") < context.index("occurred 3 times")
+
+
+def test_near_duplicate_failures_matched_through_index(temp_db):
+    """Test a reworded failure joins the existing pattern, an unrelated one does not."""
+    memory = MemoryManager(temp_db)
+    messages = [
+        "the report lacks a clear risk assessment section and does not cite regulatory sources",
+        "the report lacks a clear risk assessment section and does not cite primary sources",
+        "the introduction is too informal and repeats the executive summary verbatim",
+    ]
+    for i, message in enumerate(messages):
+        memory.record_execution(ExecutionRecord(
+            id=f"reworded-{i}",
+            workflow_name="test_workflow",
+            blueprint="test",
+            success=False,
+            error_message=message,
+            duration_seconds=1.0,
+            timestamp=datetime.now()
+        ))
+
+    import sqlite3
+    conn = sqlite3.connect(temp_db)
+    assert [row[0] for row in conn.execute(
+        "SELECT frequency FROM failure_patterns ORDER BY id"
+    )] == [2, 1]
+
+
+def test_repeat_blueprints_stored_once(temp_db):
+    """Test history references one stored copy of a repeated blueprint."""
+    memory = MemoryManager(temp_db)
+    blueprint = '{"name": "test_workflow", "notes": "' + "x" * 1000 + '"}'
+    for i in range(5):
+        memory.record_execution(ExecutionRecord(
+            id=f"bp-{i}",
+            workflow_name="test_workflow",
+            blueprint=blueprint if i < 4 else "",
+            success=True,
+            duration_seconds=1.0,
+            timestamp=datetime.now()
+        ))
+
+    import sqlite3
+    conn = sqlite3.connect(temp_db)
+    assert conn.execute("SELECT COUNT(*), MAX(size) FROM blueprints").fetchone() == (1, len(blueprint))
+    assert conn.execute("SELECT COUNT(*) FROM execution_history WHERE blueprint IS NOT NULL").fetchone()[0] == 0
+
+    assert memory.get_execution_blueprint("bp-3") == blueprint
+    assert memory.get_execution_blueprint("bp-4") is None
+    assert memory.get_execution_blueprint("missing") is None
+
+    memory.clear_history("test_workflow")
+    assert conn.execute("SELECT COUNT(*) FROM blueprints").fetchone()[0] == 0
+
+
+def _history(memory, count=7):
+    """Record executions one minute apart, with two sharing a timestamp."""
+    start = datetime(2024, 1, 1, 12, 0, 0)
+    for i in range(count):
+        memory.record_execution(ExecutionRecord(
+            id=f"run-{i}",
+            workflow_name="wf_a" if i % 2 else "wf_b",
+            blueprint="test",
+            success=i % 3 != 0,
+            retry_count=0,
+            duration_seconds=1.0,
+            timestamp=start + timedelta(minutes=min(i, 5))
+        ))
+
+
+def test_list_executions_pages_newest_first(temp_db):
+    """Test keyset pages cover every execution once, ties broken by id."""
+    memory = MemoryManager(temp_db)
+    _history(memory)
+
+    seen, cursor = [], None
+    while True:
+        page = memory.list_executions(cursor=cursor, limit=3)
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == ["run-6", "run-5", "run-4", "run-3", "run-2", "run-1", "run-0"]
+    assert len(page["items"]) == 1
+
+
+def test_list_executions_filters(temp_db):
+    """Test workflow, success and time range filters."""
+    memory = MemoryManager(temp_db)
+    _history(memory)
+
+    page = memory.list_executions(workflow_name="wf_a", success=True)
+    assert [item["id"] for item in page["items"]] == ["run-5", "run-1"]
+    assert page["next_cursor"] is None
+    assert page["items"][0]["success"] is True
+
+    page = memory.list_executions(since="2024-01-01T12:01:00", until="2024-01-01T12:03:00")
+    assert [item["id"] for item in page["items"]] == ["run-2", "run-1"]
+
+    # Offsets are converted to the stored local time
+    local = datetime(2024, 1, 1, 12, 4, 0).astimezone()
+    page = memory.list_executions(since=local.astimezone(timezone.utc).isoformat())
+    assert [item["id"] for item in page["items"]] == ["run-6", "run-5", "run-4"]
+
+
+def test_list_executions_rejects_bad_input(temp_db):
+    """Test malformed cursors and timestamps raise ValueError."""
+    memory = MemoryManager(temp_db)
+
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        memory.list_executions(cursor="not-a-cursor")
+    with pytest.raises(ValueError):
+        memory.list_executions(since="yesterday")
+
+    assert memory.list_executions(cursor=encode_cursor("2024-01-01T00:00:00", "x"))["items"] == []
+
+
+def test_iter_executions_streams_all_pages(temp_db):
+    """Test iteration reads every matching execution."""
+    memory = MemoryManager(temp_db)
+    _history(memory)
+
+    assert [item["id"] for item in memory.iter_executions(page_size=2, success=False)] == ["run-6", "run-3", "run-0"]
+
+
+def test_search_finds_feedback_and_outputs(temp_db):
+    """Test search covers error messages, feedback and outputs, including CJK substrings."""
+    memory = MemoryManager(temp_db)
+    memory.record_execution(ExecutionRecord(
+        id="fail-1", workflow_name="due_diligence", blueprint="test", success=False,
+        error_type="validation_failed", error_message="Missing required keyword: 市場",
+        validation_feedback="Missing required keyword: 市場", duration_seconds=1.0, timestamp=datetime.now()
+    ))
+    memory.record_execution(ExecutionRecord(
+        id="ok-1", workflow_name="due_diligence", blueprint="test", success=True,
+        final_output="本報告涵蓋財務、法律與市場分析。", duration_seconds=1.0, timestamp=datetime.now()
+    ))
+    memory.record_execution(ExecutionRecord(
+        id="ok-2", workflow_name="recruiting", blueprint="test", success=True,
+        final_output="Candidate shortlist", duration_seconds=1.0, timestamp=datetime.now()
+    ))
+
+    assert [hit["id"] for hit in memory.search_executions("市場")] == ["ok-1", "fail-1"]
+    assert [hit["id"] for hit in memory.search_executions("市場分析")] == ["ok-1"]
+    assert [hit["id"] for hit in memory.search_executions("keyword 市場", success=False)] == ["fail-1"]
+    assert memory.search_executions("candidate", workflow_name="due_diligence") == []
+
+    hit = memory.search_executions("Missing required keyword: 市場", order="relevance")[0]
+    assert hit["id"] == "fail-1"
+    assert "市場" in hit["snippet"]
+
+    with pytest.raises(ValueError, match="Unknown order"):
+        memory.search_executions("x", order="oldest")
+
+
+def test_search_index_follows_deletes(temp_db):
+    """Test deleted executions disappear from the search index."""
+    memory = MemoryManager(temp_db)
+    memory.record_execution(ExecutionRecord(
+        id="fail-1", workflow_name="wf", blueprint="test", success=False,
+        error_message="Output too short", duration_seconds=1.0, timestamp=datetime.now()
+    ))
+
+    memory.clear_history("wf")
+
+    assert memory.search_executions("short") == []
+    import sqlite3
+    assert sqlite3.connect(temp_db).execute("SELECT COUNT(*) FROM execution_search").fetchone()[0] == 0
+
+
+def test_shared_manager_uses_configured_path(tmp_path, monkeypatch):
+    """Test the shared manager follows EXECUTION_DB_PATH after a reset."""
+    first = tmp_path / "first.db"
+    second = tmp_path / "second.db"
+    monkeypatch.setenv("EXECUTION_DB_PATH", str(first))
+    assert get_memory_manager().db_path == str(first)
+    assert get_memory_manager() is get_memory_manager(str(first))
+
+    monkeypatch.setenv("EXECUTION_DB_PATH", str(second))
+    reset_memory_managers()
+
+    assert get_memory_manager().db_path == str(second)
+    assert second.exists()
@@ -0,0 +1,234 @@
+"""Unit tests for schema migrations."""
+import sqlite3
+import threading
+from datetime import datetime
+
+from src.core.fingerprint import similarity
+from src.core.memory import MemoryManager
+from src.core.migrations import LATEST_VERSION, get_version, main, migrate
+from src.core.schemas import ExecutionRecord
+
+
+def _legacy_db(path):
+    """Create an unversioned database with the original schema and duplicate patterns."""
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE execution_history (
+            id TEXT PRIMARY KEY, workflow_name TEXT, blueprint TEXT, success BOOLEAN,
+            error_type TEXT, error_message TEXT, retry_count INTEGER,
+            duration_seconds REAL, timestamp DATETIME, learned_adjustments TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE failure_patterns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, workflow_name TEXT, failure_reason TEXT,
+            frequency INTEGER DEFAULT 1, last_seen DATETIME, recommended_fix TEXT
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO failure_patterns (workflow_name, failure_reason, frequency, last_seen, recommended_fix) "
+        "VALUES (?, ?, ?, ?, 'fix')",
+        [
+            ("wf", "missing section", 2, "2024-01-01"),
+            ("wf", "missing section", 3, "2024-02-01"),
+            ("wf", None, 1, "2024-01-05"),
+            ("wf", None, 1, "2024-01-06"),
+            ("other", "missing section", 1, "2024-01-01"),
+        ]
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_fresh_database_is_latest(temp_db):
+    """Test a new database is created at the latest version."""
+    MemoryManager(temp_db)
+
+    conn = sqlite3.connect(temp_db)
+    assert get_version(conn) == LATEST_VERSION
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "idx_execution_history_workflow_timestamp" in indexes
+    assert "idx_failure_patterns_workflow_reason" in indexes
+
+
+def test_legacy_database_upgraded_in_place(temp_db):
+    """Test duplicates are merged and the unique constraint applied."""
+    _legacy_db(temp_db)
+    conn = sqlite3.connect(temp_db, isolation_level=None)
+
+    assert get_version(conn) == 0
+    assert migrate(conn) == LATEST_VERSION
+
+    rows = conn.execute(
+        "SELECT workflow_name, failure_reason, frequency, last_seen FROM failure_patterns ORDER BY id"
+    ).fetchall()
+    assert rows == [
+        ("wf", "missing section", 5, "2024-02-01"),
+        ("wf", "Unknown failure", 2, "2024-01-06"),
+        ("other", "missing section", 1, "2024-01-01"),
+    ]
+
+
+def test_migrate_is_idempotent(temp_db):
+    """Test re-running migrations changes nothing."""
+    conn = sqlite3.connect(temp_db, isolation_level=None)
+    migrate(conn)
+
+    assert migrate(conn) == LATEST_VERSION
+
+
+def test_stats_query_uses_index(temp_db):
+    """Test workflow filters no longer scan the whole table."""
+    MemoryManager(temp_db)
+    conn = sqlite3.connect(temp_db)
+
+    plan = " ".join(row[-1] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM execution_history WHERE workflow_name = ?", ("wf",)
+    ))
+
+    assert "USING" in plan and "INDEX" in plan
+
+
+def test_concurrent_failures_upsert_one_pattern(temp_db):
+    """Test concurrent failures of the same kind share one pattern row."""
+    memory = MemoryManager(temp_db)
+
+    def fail(n):
+        memory.record_execution(ExecutionRecord(
+            id=f"fail-{n}",
+            workflow_name="wf",
+            blueprint="{}",
+            success=False,
+            error_type="validation_failed",
+            error_message="missing section",
+            duration_seconds=1.0,
+            timestamp=datetime.now()
+        ))
+
+    threads = [threading.Thread(target=fail, args=(n,)) for n in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    conn = sqlite3.connect(temp_db)
+    rows = conn.execute("SELECT frequency FROM failure_patterns WHERE workflow_name = 'wf'").fetchall()
+    assert rows == [(10,)]
+
+
+def test_cli(temp_db, capsys):
+    """Test the CLI upgrades a file and reports versions."""
+    _legacy_db(temp_db)
+
+    main([temp_db])
+
+    assert f"0 -> {LATEST_VERSION}" in capsys.readouterr().out
+
+
+def test_aggregates_backfilled_from_history(temp_db):
+    """Test upgrading to v3 computes aggregates for existing history."""
+    conn = sqlite3.connect(temp_db, isolation_level=None)
+    migrate(conn, target=2)
+    conn.executemany(
+        "INSERT INTO execution_history (id, workflow_name, success, retry_count, duration_seconds) "
+        "VALUES (?, 'wf', ?, ?, ?)",
+        [("a", True, 0, 2.0), ("b", False, 2, 4.0)]
+    )
+
+    migrate(conn)
+
+    assert conn.execute("SELECT * FROM workflow_aggregates").fetchall() == [("wf", 2, 1, 6.0, 20.0, 2)]
+    # No timestamps, so only the all-time sketch rows are backfilled
+    assert conn.execute(
+        "SELECT retry_count, count FROM workflow_retry_histogram WHERE hour = '*' ORDER BY retry_count"
+    ).fetchall() == [(0, 1), (2, 1)]
+
+
+def test_exploded_patterns_merged_by_fingerprint(temp_db):
+    """Test upgrading to v5 collapses per-message rows into fingerprinted patterns."""
+    conn = sqlite3.connect(temp_db, isolation_level=None)
+    migrate(conn, target=4)
+    conn.executemany(
+        "INSERT INTO failure_patterns (workflow_name, failure_reason, frequency, last_seen, recommended_fix) "
+        "VALUES ('wf', ?, ?, ?, 'fix')",
+        [
+            ("Output has 120 words, needs 500", 2, "2024-01-01"),
+            ("Output has 95 words, needs 500", 1, "2024-03-01"),
+            ("Missing the \"Sources\" section", 1, "2024-02-01"),
+        ]
+    )
+
+    migrate(conn)
+
+    assert conn.execute(
+        "SELECT failure_reason, frequency, last_seen FROM failure_patterns ORDER BY id"
+    ).fetchall() == [
+        ("Output has <n> words, needs <n>", 3, "2024-03-01"),
+        ("Missing the <str> section", 1, "2024-02-01"),
+    ]
+    assert conn.execute("SELECT COUNT(DISTINCT pattern_id) FROM failure_pattern_bands").fetchone()[0] == 2
+
+
+def test_fingerprint_backfill_probes_band_index(temp_db, monkeypatch):
+    """Test the v5 backfill compares each row only with band-index candidates."""
+    import itertools
+    import string
+    import src.core.migrations as migrations
+
+    conn = sqlite3.connect(temp_db, isolation_level=None)
+    migrate(conn, target=4)
+    words = ["".join(letters) for letters in itertools.product(string.ascii_lowercase, repeat=3)]
+    conn.executemany(
+        "INSERT INTO failure_patterns (workflow_name, failure_reason, frequency, last_seen, recommended_fix) "
+        "VALUES ('wf', ?, 1, '2024-01-01', 'fix')",
+        [(" ".join(words[i * 4:(i + 1) * 4]),) for i in range(200)]
+    )
+    comparisons = []
+    monkeypatch.setattr(
+        migrations, "similarity", lambda a, b: comparisons.append(1) or similarity(a, b)
+    )
+
+    migrate(conn)
+
+    assert conn.execute("SELECT COUNT(*) FROM failure_patterns").fetchone()[0] == 200
+    # A full scan would compare every pair (19,900 comparisons)
+    assert len(comparisons) < 200
+
+
+def test_inline_blueprints_moved_to_store(temp_db):
+    """Test upgrading to v6 deduplicates inline blueprint text."""
+    conn = sqlite3.connect(temp_db, isolation_level=None)
+    migrate(conn, target=5)
+    blueprint = '{"name": "wf", "notes": "' + "y" * 500 + '"}'
+    conn.executemany(
+        "INSERT INTO execution_history (id, workflow_name, blueprint, success, duration_seconds) "
+        "VALUES (?, 'wf', ?, 1, 1.0)",
+        [("a", blueprint), ("b", blueprint), ("c", "")]
+    )
+
+    migrate(conn)
+
+    assert conn.execute("SELECT COUNT(*) FROM blueprints").fetchone()[0] == 1
+    assert conn.execute(
+        "SELECT id, blueprint, blueprint_hash IS NOT NULL FROM execution_history ORDER BY id"
+    ).fetchall() == [("a", None, 1), ("b", None, 1), ("c", None, 0)]
+    conn.close()
+
+    assert MemoryManager(temp_db).get_execution_blueprint("b") == blueprint
+
+
+def test_error_messages_indexed_for_search(temp_db):
+    """Test upgrading to v9 indexes existing error messages."""
+    conn = sqlite3.connect(temp_db, isolation_level=None)
+    migrate(conn, target=8)
+    conn.executemany(
+        "INSERT INTO execution_history (id, workflow_name, success, error_message, timestamp) "
+        "VALUES (?, 'wf', ?, ?, '2024-01-01T00:00:00')",
+        [("a", 0, "Missing required keyword: 法律"), ("b", 1, None)]
+    )
+
+    migrate(conn)
+
+    assert conn.execute("SELECT COUNT(*) FROM execution_search").fetchone()[0] == 1
+    conn.close()
+    assert [hit["id"] for hit in MemoryManager(temp_db).search_executions("法律")] == ["a"]
@@ -0,0 +1,89 @@
+"""Unit tests for the token-bucket rate limiter."""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.llm.rate_limit import RateLimiter, TokenBucket, estimate_tokens, get_rate_limiter, reset_rate_limiter
+
+
+def test_bucket_allows_burst_then_waits():
+    """Test a bucket serves its capacity immediately, then queues."""
+    bucket = TokenBucket(per_minute=60, capacity=2)
+    now = time.monotonic()
+
+    assert bucket.reserve(1, now) == 0.0
+    assert bucket.reserve(1, now) == 0.0
+    assert bucket.reserve(1, now) == pytest.approx(1.0)
+    # Reservations queue behind each other
+    assert bucket.reserve(1, now) == pytest.approx(2.0)
+
+
+def test_bucket_refills_over_time():
+    """Test capacity refills at the configured rate."""
+    bucket = TokenBucket(per_minute=60, capacity=1)
+    now = time.monotonic()
+
+    bucket.reserve(1, now)
+
+    assert bucket.reserve(1, now + 1.0) == pytest.approx(0.0)
+
+
+def test_token_bucket_limits_large_requests():
+    """Test the TPM bucket throttles on token volume."""
+    limiter = RateLimiter(tpm=6000)
+
+    limiter._reserve(6000)
+    wait = limiter._reserve(100)
+
+    assert wait == pytest.approx(1.0, rel=0.05)
+    assert limiter.stats()["throttled"] == 1
+
+
+def test_threads_queue_instead_of_failing():
+    """Test concurrent threads are spaced out by the request bucket."""
+    limiter = RateLimiter(rpm=600)  # 10/s
+    limiter.requests._tokens = 0
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        waits = list(pool.map(lambda _: limiter.acquire(), range(3)))
+    elapsed = time.monotonic() - start
+
+    assert sorted(waits) == pytest.approx([0.1, 0.2, 0.3], abs=0.05)
+    assert elapsed >= 0.25
+    assert limiter.stats()["throttled"] == 3
+
+
+def test_async_tasks_share_limiter():
+    """Test asyncio tasks queue on the same buckets."""
+    limiter = RateLimiter(rpm=600)
+    limiter.requests._tokens = 0
+
+    async def run():
+        return await asyncio.gather(*[limiter.aacquire() for _ in range(2)])
+
+    waits = asyncio.run(run())
+
+    assert sorted(waits) == pytest.approx([0.1, 0.2], abs=0.05)
+
+
+def test_estimate_tokens():
+    """Test token estimate includes prompt and completion budget."""
+    messages = [{"role": "user", "content": "x" * 400}]
+
+    assert estimate_tokens(messages, 100) == 200
+
+
+def test_limiter_configured_from_env(monkeypatch):
+    """Test the shared limiter is only created when limits are set."""
+    reset_rate_limiter()
+    monkeypatch.delenv("LLM_RPM", raising=False)
+    monkeypatch.delenv("LLM_TPM", raising=False)
+    assert get_rate_limiter() is None
+
+    monkeypatch.setenv("LLM_RPM", "500")
+    limiter = get_rate_limiter()
+    assert limiter is get_rate_limiter()
+    assert limiter.stats()["rpm"] == pytest.approx(500)
+    reset_rate_limiter()
@@ -0,0 +1,176 @@
+"""Unit tests for execution history retention."""
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.maintenance import check_aggregates, check_sketches, rebuild_aggregates, rebuild_sketches
+from src.core.memory import MemoryManager
+from src.core.retention import (
+    RetentionPolicy, RetentionScheduler, apply_retention, incremental_vacuum, main, read_archive
+)
+from src.core.schemas import ExecutionRecord
+
+NOW = datetime(2024, 6, 30, 12, 0, 0)
+
+
+def _populate(memory, days=(40, 35, 35, 1), workflow_name="wf_a", now=NOW):
+    """Record one execution per entry in days, that many days before now."""
+    for i, age in enumerate(days):
+        memory.record_execution(ExecutionRecord(
+            id=f"{workflow_name}-{i}",
+            workflow_name=workflow_name,
+            blueprint=f"workflow: {workflow_name}\n" + "step: x\n" * 50,
+            success=i % 2 == 0,
+            error_message=None if i % 2 == 0 else "missing section",
+            retry_count=i % 3,
+            duration_seconds=float(i + 1),
+            timestamp=now - timedelta(days=age)
+        ))
+
+
+def _policy(tmp_path, **kwargs):
+    """Small-chunk policy archiving under tmp_path."""
+    options = {"keep_days": 30, "archive_dir": str(tmp_path / "archive"), "chunk_size": 2, "chunk_pause_ms": 0}
+    options.update(kwargs)
+    return RetentionPolicy(**options)
+
+
+def test_retention_archives_and_deletes_old_rows(temp_db, tmp_path):
+    """Test rows past the window are archived per day and deleted in chunks."""
+    memory = MemoryManager(temp_db, cache_ttl_seconds=0)
+    _populate(memory)
+
+    report = apply_retention(temp_db, _policy(tmp_path), now=NOW)
+
+    assert report.executions_deleted == 3
+    assert report.chunks == 2
+    conn = sqlite3.connect(temp_db)
+    assert [row[0] for row in conn.execute("SELECT id FROM execution_history")] == ["wf_a-3"]
+
+    archived = sorted(
+        (row for path in report.archive_files for row in read_archive(path)), key=lambda row: row["id"]
+    )
+    assert [row["id"] for row in archived] == ["wf_a-0", "wf_a-1", "wf_a-2"]
+    assert archived[0]["blueprint"].startswith("workflow: wf_a")
+    assert archived[1]["success"] is False
+    assert {os.path.basename(os.path.dirname(path)) for path in report.archive_files} == {
+        f"day={(NOW - timedelta(days=40)).date()}", f"day={(NOW - timedelta(days=35)).date()}"
+    }
+
+
+def test_retention_keeps_lifetime_stats(temp_db, tmp_path):
+    """Test aggregates and all-time percentiles are unchanged by pruning."""
+    memory = MemoryManager(temp_db, cache_ttl_seconds=0)
+    _populate(memory)
+    stats = memory.get_execution_stats("wf_a")
+    distribution = memory.get_distribution("wf_a")
+
+    apply_retention(temp_db, _policy(tmp_path), now=NOW)
+
+    assert memory.get_execution_stats("wf_a") == stats
+    assert memory.get_distribution("wf_a") == distribution
+    conn = sqlite3.connect(temp_db, isolation_level=None)
+    assert conn.execute(
+        "SELECT SUM(total_executions) FROM workflow_daily_rollups WHERE workflow_name = 'wf_a'"
+    ).fetchone()[0] == 3
+    assert check_aggregates(conn) == []
+    assert check_sketches(conn) == []
+
+    rebuild_aggregates(conn)
+    rebuild_sketches(conn)
+    assert memory.get_execution_stats("wf_a") == stats
+    assert memory.get_distribution("wf_a") == distribution
+
+
+def test_retention_drops_orphaned_blueprints_and_runs(temp_db, tmp_path):
+    """Test blueprints only referenced by pruned rows and old finished runs are removed."""
+    memory = MemoryManager(temp_db)
+    _populate(memory, days=(40,), workflow_name="wf_old")
+    _populate(memory, days=(40, 1), workflow_name="wf_new")
+    memory.create_run("run-1", "wf_old")
+    conn = sqlite3.connect(temp_db, isolation_level=None)
+    conn.execute("UPDATE runs SET finished_at = ?", ((NOW - timedelta(days=40)).isoformat(),))
+
+    report = apply_retention(temp_db, _policy(tmp_path, archive_dir=None), now=NOW)
+
+    assert report.executions_deleted == 2
+    assert report.runs_deleted == 1
+    assert report.blueprints_deleted == 1
+    assert report.archive_files == []
+    assert memory.get_execution_blueprint("wf_new-1").startswith("workflow: wf_new")
+
+
+def test_retention_dry_run_changes_nothing(temp_db, tmp_path):
+    """Test a dry run only counts."""
+    memory = MemoryManager(temp_db)
+    _populate(memory)
+
+    report = apply_retention(temp_db, _policy(tmp_path), now=NOW, dry_run=True)
+
+    assert report.dry_run
+    assert report.executions_deleted == 3
+    assert not (tmp_path / "archive").exists()
+    assert sqlite3.connect(temp_db).execute("SELECT COUNT(*) FROM execution_history").fetchone()[0] == 4
+
+
+def test_incremental_vacuum_frees_pages(temp_db, tmp_path):
+    """Test freed pages are returned after a large prune."""
+    memory = MemoryManager(temp_db)
+    _populate(memory, days=[40] * 200)
+
+    report = apply_retention(temp_db, _policy(tmp_path, archive_dir=None, chunk_size=500), now=NOW)
+
+    assert report.pages_vacuumed > 0
+    conn = sqlite3.connect(temp_db, isolation_level=None)
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    assert incremental_vacuum(conn) == 0
+
+
+def test_policy_rejects_unknown_format():
+    """Test archive formats are validated."""
+    with pytest.raises(ValueError, match="Unknown archive format"):
+        RetentionPolicy(archive_format="csv")
+
+
+def test_scheduler_counts_passes(temp_db, tmp_path):
+    """Test a scheduler pass is recorded in its stats."""
+    memory = MemoryManager(temp_db)
+    _populate(memory, days=(40,), now=datetime.now())
+    scheduler = RetentionScheduler(temp_db, _policy(tmp_path), interval_seconds=3600)
+
+    report = scheduler.run_once()
+
+    assert report.executions_deleted == 1
+    assert scheduler.stats()["runs"] == 1
+    assert scheduler.stats()["executions_deleted"] == 1
+
+
+def test_cli(temp_db, tmp_path, capsys):
+    """Test the CLI prunes and reports."""
+    memory = MemoryManager(temp_db)
+    _populate(memory, days=(40, 0), now=datetime.now())
+
+    assert main(["--db", temp_db, "--archive-dir", str(tmp_path / "archive")]) == 0
+
+    out = capsys.readouterr().out
+    assert "deleted 1 executions" in out
+    assert "1 archive files" in out
+
+
+def test_defaults_to_configured_database(tmp_path, monkeypatch, capsys):
+    """Test the CLI and scheduler use EXECUTION_DB_PATH when no path is given."""
+    from src.core.retention import shutdown_retention_scheduler, start_retention_scheduler
+
+    memory = MemoryManager()
+    _populate(memory, days=(40, 0), now=datetime.now())
+
+    assert main(["--archive-dir", str(tmp_path / "archive")]) == 0
+    assert "deleted 1 executions" in capsys.readouterr().out
+
+    monkeypatch.setenv("RETENTION_INTERVAL_HOURS", "24")
+    try:
+        assert start_retention_scheduler().db_path == os.environ["EXECUTION_DB_PATH"]
+    finally:
+        shutdown_retention_scheduler(timeout=5)
@@ -0,0 +1,158 @@
+"""Unit tests for LLM retry and hedging policies."""
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+from src.llm.retry import HedgePolicy, RetryPolicy, is_retryable
+
+_REQUEST = httpx.Request("POST", "http://stand-in/v1/chat/completions")
+
+
+def _server_error():
+    return openai.InternalServerError("boom", response=httpx.Response(500, request=_REQUEST), body=None)
+
+
+def _bad_request():
+    return openai.BadRequestError("bad", response=httpx.Response(400, request=_REQUEST), body=None)
+
+
+def test_is_retryable():
+    """Test transient errors are classified correctly."""
+    assert is_retryable(openai.APIConnectionError(request=_REQUEST))
+    assert is_retryable(_server_error())
+    assert not is_retryable(_bad_request())
+    assert not is_retryable(ValueError("parse"))
+
+
+def test_retry_recovers_from_transient_errors():
+    """Test transient failures are retried until success."""
+    policy = RetryPolicy(max_attempts=3, base_delay=0.01)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise _server_error()
+        return "ok"
+
+    assert policy.call(flaky) == "ok"
+    assert policy.stats()["retries"] == 2
+
+
+def test_retry_gives_up_after_max_attempts():
+    """Test errors propagate once attempts are exhausted."""
+    policy = RetryPolicy(max_attempts=2, base_delay=0.01)
+
+    with pytest.raises(openai.InternalServerError):
+        policy.call(lambda: (_ for _ in ()).throw(_server_error()))
+
+    assert policy.stats()["exhausted"] == 1
+
+
+def test_retry_skips_non_retryable_errors():
+    """Test permanent errors are not retried."""
+    policy = RetryPolicy(max_attempts=5, base_delay=0.01)
+    attempts = []
+
+    def bad():
+        attempts.append(1)
+        raise _bad_request()
+
+    with pytest.raises(openai.BadRequestError):
+        policy.call(bad)
+    assert len(attempts) == 1
+
+
+def test_retry_respects_deadline():
+    """Test no retry is scheduled past the deadline."""
+    policy = RetryPolicy(max_attempts=10, base_delay=1.0, max_delay=1.0, deadline=0.0)
+
+    with pytest.raises(openai.APIConnectionError):
+        policy.call(lambda: (_ for _ in ()).throw(openai.APIConnectionError(request=_REQUEST)))
+
+
+def test_async_retry():
+    """Test async retries."""
+    policy = RetryPolicy(max_attempts=3, base_delay=0.01)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise openai.APIConnectionError(request=_REQUEST)
+        return "ok"
+
+    assert asyncio.run(policy.acall(flaky)) == "ok"
+
+
+def test_hedge_delay_uses_p95():
+    """Test the hedge delay tracks recent latency."""
+    policy = HedgePolicy(enabled=True, initial_delay=5.0, min_samples=10)
+    assert policy.delay() == 5.0
+
+    for i in range(100):
+        policy.record(i / 100)
+
+    assert policy.delay() == pytest.approx(0.95)
+
+
+def test_sync_hedge_takes_faster_response():
+    """Test a slow primary is hedged and the backup wins."""
+    policy = HedgePolicy(enabled=True, initial_delay=0.05)
+    calls = []
+
+    def call():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.5)
+            return "slow"
+        return "fast"
+
+    assert policy.call(call) == "fast"
+    assert policy.stats()["hedged"] == 1
+    assert policy.stats()["hedge_wins"] == 1
+
+
+def test_async_hedge_takes_faster_response():
+    """Test async hedging cancels the slower request."""
+    policy = HedgePolicy(enabled=True, initial_delay=0.05)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        if len(calls) == 1:
+            await asyncio.sleep(1)
+            return "slow"
+        return "fast"
+
+    start = time.monotonic()
+    assert asyncio.run(policy.acall(call)) == "fast"
+    assert time.monotonic() - start < 0.5
+
+
+def test_hedge_disabled_is_passthrough():
+    """Test disabled hedging calls once."""
+    policy = HedgePolicy(enabled=False)
+
+    assert policy.call(lambda: "ok") == "ok"
+    assert policy.stats()["hedged"] == 0
+
+
+def test_client_mock_fallback_is_opt_in(mock_env, monkeypatch):
+    """Test API errors propagate unless LLM_MOCK_FALLBACK=1."""
+    from src.llm.client import LLMClient
+
+    def failing_request(kwargs):
+        raise openai.APIConnectionError(request=_REQUEST)
+
+    client = LLMClient()
+    monkeypatch.setattr(client, "_request", failing_request)
+    with pytest.raises(openai.APIConnectionError):
+        client.generate("Research ACME")
+
+    monkeypatch.setenv("LLM_MOCK_FALLBACK", "1")
+    client = LLMClient()
+    monkeypatch.setattr(client, "_request", failing_request)
+    assert "ACME" in client.generate("Research ACME")
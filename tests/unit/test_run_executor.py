@@ -0,0 +1,75 @@
+"""Unit tests for the API run executor."""
+import asyncio
+import json
+import time
+
+import pytest
+from api.executor import RunExecutor
+
+BLUEPRINT = json.dumps({"workflow_name": "customer_due_diligence", "input": {"company_name": "ACME Corp"}})
+
+
+def test_async_mode(mock_env):
+    """Test async mode executes on the loop and records metrics."""
+    executor = RunExecutor(mode="async", max_concurrency=2)
+
+    result = asyncio.run(executor.run(BLUEPRINT, "due_diligence"))
+
+    assert result["status"] in ["completed", "failed"]
+    assert executor.stats()["completed"] == 1
+    assert executor.stats()["in_flight"] == 0
+
+
+def test_thread_mode_limits_concurrency(mock_env, monkeypatch):
+    """Test runs beyond the limit wait for a worker and the wait is measured."""
+    def slow_execute(workflow, blueprint):
+        time.sleep(0.2)
+        return {"status": "completed", "success": True}
+
+    monkeypatch.setattr("api.executor.execute_workflow", slow_execute)
+    executor = RunExecutor(mode="thread", max_concurrency=1)
+
+    async def run_two():
+        return await asyncio.gather(executor.run(BLUEPRINT), executor.run(BLUEPRINT))
+
+    asyncio.run(run_two())
+    stats = executor.stats()
+
+    assert stats["completed"] == 2
+    assert stats["max_queue_wait_seconds"] >= 0.15
+    assert stats["max_execution_seconds"] >= 0.15
+    asyncio.run(executor.drain())
+
+
+def test_thread_mode_invalid_blueprint(mock_env):
+    """Test parse errors surface as ValueError."""
+    executor = RunExecutor(mode="thread", max_concurrency=1)
+
+    with pytest.raises(ValueError):
+        asyncio.run(executor.run("{}", "test"))
+    asyncio.run(executor.drain())
+
+
+def test_process_mode(mock_env):
+    """Test process mode executes in a worker process."""
+    executor = RunExecutor(mode="process", max_concurrency=1)
+
+    result = asyncio.run(executor.run(BLUEPRINT, "due_diligence"))
+
+    assert result["status"] in ["completed", "failed"]
+    assert asyncio.run(executor.drain())
+
+
+def test_drain_rejects_new_runs(mock_env):
+    """Test a drained executor refuses work."""
+    executor = RunExecutor(mode="async")
+    assert asyncio.run(executor.drain())
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(executor.run(BLUEPRINT))
+
+
+def test_unknown_mode():
+    """Test invalid modes are rejected."""
+    with pytest.raises(ValueError):
+        RunExecutor(mode="fiber")
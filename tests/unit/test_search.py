@@ -0,0 +1,35 @@
+"""Unit tests for full-text search text preparation."""
+import pytest
+
+from src.core.search import build_match_query, make_snippet, segment
+
+
+def test_cjk_runs_become_bigrams():
+    """Test CJK runs are split into overlapping bigrams and other text is kept."""
+    assert segment("Missing required keyword: 市場分析").split() == [
+        "Missing", "required", "keyword:", "市場", "場分", "分析"
+    ]
+    assert segment("法 and カタカナ").split() == ["法", "and", "カタ", "タカ", "カナ"]
+    assert segment(None) == ""
+
+
+def test_match_query_quotes_terms():
+    """Test every term becomes a quoted phrase and operators are literal."""
+    assert build_match_query("keyword: 市場") == '"keyword:" "市場"'
+    assert build_match_query("市場分析") == '"市場 場分 分析"'
+    assert build_match_query('NOT "risk') == '"NOT" """risk"'
+    assert build_match_query("市") == '"市"*'
+
+    with pytest.raises(ValueError, match="no searchable terms"):
+        build_match_query("  ::  ")
+
+
+def test_snippet_centres_on_first_match():
+    """Test snippets come from the first text containing a term."""
+    feedback = "x " * 100 + "Missing required keyword: 市場"
+
+    snippet = make_snippet([None, feedback, "final"], "市場", width=40)
+
+    assert snippet.startswith("…")
+    assert snippet.endswith("市場")
+    assert make_snippet(["no match here"], "absent") == "no match here"
@@ -0,0 +1,154 @@
+"""Unit tests for in-flight request coalescing."""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.llm.singleflight import SingleFlight
+
+
+def test_threads_share_one_call():
+    """Test concurrent threads with the same key trigger one call."""
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def slow_call():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        leader = pool.submit(flight.do, "key", slow_call)
+        started.wait()
+        waiters = [pool.submit(flight.do, "key", slow_call) for _ in range(4)]
+        results = [leader.result()] + [w.result() for w in waiters]
+
+    assert results == ["result"] * 5
+    assert len(calls) == 1
+    assert flight.stats()["coalesced"] == 4
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_async_tasks_share_one_call():
+    """Test concurrent asyncio tasks with the same key trigger one call."""
+    flight = SingleFlight()
+    calls = []
+
+    async def slow_call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run_all():
+        return await asyncio.gather(*[flight.ado("key", slow_call) for _ in range(5)])
+
+    assert asyncio.run(run_all()) == ["result"] * 5
+    assert len(calls) == 1
+    assert flight.stats()["coalesced"] == 4
+
+
+def test_errors_propagate_to_waiters():
+    """Test waiters see the leader's exception and the key is released."""
+    flight = SingleFlight()
+
+    async def failing_call():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("upstream down")
+
+    async def run_all():
+        return await asyncio.gather(
+            *[flight.ado("key", failing_call) for _ in range(3)],
+            return_exceptions=True
+        )
+
+    results = asyncio.run(run_all())
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flight.do("key", lambda: "recovered") == "recovered"
+
+
+def test_sequential_calls_are_not_cached():
+    """Test completed calls are not reused."""
+    flight = SingleFlight()
+
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    assert flight.stats()["coalesced"] == 0
+
+
+def test_llm_client_coalesces_identical_requests(mock_env, monkeypatch):
+    """Test LLMClient sends one upstream call for identical concurrent prompts."""
+    from src.llm.client import LLMClient
+
+    client = LLMClient()
+    client.singleflight = SingleFlight()
+    calls = []
+
+    def slow_request(kwargs):
+        calls.append(1)
+        time.sleep(0.2)
+        return "findings"
+
+    monkeypatch.setattr(client, "_request", slow_request)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: client.generate("Research ACME"), range(4)))
+
+    assert results == ["findings"] * 4
+    assert len(calls) == 1
+
+
+def test_cancelled_waiter_does_not_affect_others():
+    """Test cancelling one waiter leaves the shared call and other waiters intact."""
+    flight = SingleFlight()
+    calls = []
+
+    async def slow_call():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "result"
+
+    async def run_all():
+        leader = asyncio.create_task(flight.ado("key", slow_call))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(flight.ado("key", slow_call)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        waiters[0].cancel()
+        return await asyncio.gather(leader, *waiters, return_exceptions=True)
+
+    results = asyncio.run(run_all())
+
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert results[0] == "result"
+    assert results[2:] == ["result", "result"]
+    assert len(calls) == 1
+
+
+def test_cancelled_leader_hands_call_to_waiter():
+    """Test a cancelled leader's waiters retry instead of seeing its cancellation."""
+    flight = SingleFlight()
+    calls = []
+
+    async def slow_call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run_all():
+        leader = asyncio.create_task(flight.ado("key", slow_call))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(flight.ado("key", slow_call)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await asyncio.gather(leader, *waiters, return_exceptions=True)
+
+    results = asyncio.run(run_all())
+
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1:] == ["result", "result"]
+    assert len(calls) == 2
+    assert flight.stats()["handoffs"] == 1
+    assert flight.stats()["in_flight"] == 0
@@ -0,0 +1,68 @@
+"""Unit tests for the duration sketch."""
+import random
+from datetime import datetime
+
+import pytest
+from src.core.sketch import (
+    ALL_TIME, RELATIVE_ACCURACY, DurationSketch, bucket_value, duration_bucket,
+    hour_key, sketch_counts, window_start
+)
+
+
+def test_quantiles_within_relative_accuracy():
+    """Test sketch quantiles stay within the advertised error."""
+    rng = random.Random(7)
+    values = sorted(rng.lognormvariate(2, 1) for _ in range(5000))
+    sketch = DurationSketch()
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.5, 0.9, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert abs(sketch.quantile(q) - exact) <= exact * RELATIVE_ACCURACY * 1.01
+
+
+def test_merge_equals_combined():
+    """Test merging two sketches matches one sketch of all samples."""
+    left, right, both = DurationSketch(), DurationSketch(), DurationSketch()
+    for i in range(1, 200):
+        (left if i % 2 else right).add(i / 10)
+        both.add(i / 10)
+
+    left.merge(right)
+
+    assert left.counts == both.counts
+    assert left.quantile(0.9) == both.quantile(0.9)
+
+
+def test_bucket_edges():
+    """Test tiny and empty inputs."""
+    assert duration_bucket(0.0) == 0
+    assert duration_bucket(None) == 0
+    assert bucket_value(duration_bucket(12.5)) == pytest.approx(12.5, rel=RELATIVE_ACCURACY)
+    assert DurationSketch().quantile(0.5) == 0.0
+
+
+def test_hourly_keys_and_windows():
+    """Test hour truncation and window bounds."""
+    now = datetime(2024, 3, 10, 15, 42, 7)
+
+    assert hour_key(now) == "2024-03-10T15:00:00"
+    assert hour_key("2024-03-10T15:42:07.123456") == "2024-03-10T15:00:00"
+    assert window_start("day", now) == "2024-03-09T15:00:00"
+    assert ALL_TIME < window_start("week", now)
+    with pytest.raises(ValueError):
+        window_start("month", now)
+
+
+def test_sketch_counts_include_all_time():
+    """Test each execution lands in its hour and the all-time row."""
+    durations, retries = sketch_counts([
+        ("wf", "2024-03-10T15:01:00", 1.0, 0),
+        ("wf", "2024-03-10T16:01:00", 1.0, 2),
+    ])
+
+    bucket = duration_bucket(1.0)
+    assert durations[("wf", ALL_TIME, bucket)] == 2
+    assert durations[("wf", "2024-03-10T15:00:00", bucket)] == 1
+    assert retries[("wf", ALL_TIME, 2)] == 1